@@ -1,13 +1,54 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from backend.database.connector.async_connector import AsyncDatabaseConnector
+from backend.database.connector.engine_registry import engine_registry
+from backend.common.cache.factory import cache_from_env
+from backend.common.search.inverted_index import InvertedIndex, index_partitions, search_enabled
+from backend.common.search.suggest import SuggestIndex, suggest_partitions
+from backend.album_service.repos.async_album_alchemy_repo import AsyncAlbumAlchemyRepository
+from backend.album_service.services.async_album_alchemy_service import ALBUM_SEARCH_FIELDS, album_suggestions
 from backend.album_service.routers.album_router import router
+from backend.common.auth.auth_helper import auth_helper
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the shared database connector, read cache and token key set once per process and close them on shutdown.
+    The search and suggest indexes are built from the ALBUMS table here and kept current by the album service's writes.
+    """
+    app.state.db_connector = AsyncDatabaseConnector()
+    app.state.search_index = None
+    app.state.suggest_index = None
+    if search_enabled():
+        repository = AsyncAlbumAlchemyRepository(db_connector=app.state.db_connector)
+        app.state.search_index = await index_partitions(InvertedIndex(ALBUM_SEARCH_FIELDS), repository.stream_albums())
+        app.state.suggest_index = await suggest_partitions(SuggestIndex(), repository.stream_albums(), album_suggestions)
+    app.state.cache = cache_from_env()
+    if app.state.cache is not None:
+        await app.state.cache.start()
+    await auth_helper.verifier.start()
+    yield
+    await auth_helper.verifier.close()
+    if app.state.cache is not None:
+        await app.state.cache.close()
+    await engine_registry.dispose_all_async()
+
 app = FastAPI(
     title="Album Service",
     description="Service for managing music albums",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.include_router(router)
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    search_index = getattr(app.state, "search_index", None)
+    suggest_index = getattr(app.state, "suggest_index", None)
+    return {
+        "status": "healthy",
+        "token_cache": auth_helper.verifier.cache.stats(),
+        "search_index": search_index.stats() if search_index is not None else None,
+        "suggest_index": suggest_index.stats() if suggest_index is not None else None
+    }
@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+from typing import List
+from backend.album_service.models.album import Album
+
+class AlbumBatch(BaseModel):
+    items: List[Album]
+    missing: List[int] = Field(default_factory=list, description="Requested IDs that matched no album")
@@ -0,0 +1,13 @@
+from pydantic import field_validator
+from backend.album_service.models.album_update_input import AlbumUpdateInput
+
+class AlbumBulkUpdateInput(AlbumUpdateInput):
+    id: int
+
+    @field_validator("title", "artist", "genre", "created_at")
+    @classmethod
+    def not_null(cls, value):
+        # NOT NULL in ALBUMS: an explicit null is reported for its item instead of failing the whole batch
+        if value is None:
+            raise ValueError("may not be null")
+        return value
@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class AlbumFilter(BaseModel):
+    artist: Optional[str] = Field(None, description="Exact artist name")
+    genre: Optional[str] = Field(None, description="Exact genre")
@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from backend.album_service.models.album import Album
+
+class AlbumPage(BaseModel):
+    items: List[Album]
+    next_cursor: Optional[int] = Field(None, description="Pass as `after` to fetch the next page; null on the last page")
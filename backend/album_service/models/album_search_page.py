@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from backend.album_service.models.album import Album
+
+class AlbumSearchPage(BaseModel):
+    items: List[Album]
+    total: int = Field(..., description="Number of albums matching the query")
+    next_offset: Optional[int] = Field(None, description="Pass as `offset` to fetch the next page; null on the last page")
+    truncated: bool = Field(False, description="The last word begins more indexed words than SEARCH_MAX_PREFIX_TERMS, so albums matching only the later ones are missing; type more of it")
@@ -0,0 +1,6 @@
+from backend.album_service.models.album import Album
+from backend.album_service.models.song import Song
+from typing import List
+
+class AlbumWithSongs(Album):
+    songs: List[Song] = []
@@ -0,0 +1,67 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, List, Optional
+from backend.database.models.album_model import Album
+from backend.album_service.models.album_update_input import AlbumUpdateInput
+from backend.album_service.models.album_filter import AlbumFilter
+from backend.album_service.models.song import Song
+
+class AbstractAsyncAlbumAlchemyRepository(ABC):
+    @abstractmethod
+    async def create_album(self, album: Album) -> Album:
+        """Create a new album."""
+        pass
+
+    @abstractmethod
+    async def get_album_by_id(self, album_id: int) -> Optional[Album]:
+        """Retrieve an album by its ID."""
+        pass
+
+    @abstractmethod
+    async def get_albums_by_ids(self, album_ids: List[int]) -> List[Album]:
+        """Retrieve the albums matching any of the given IDs, in no particular order."""
+        pass
+
+    @abstractmethod
+    async def get_album_with_songs(self, album_id: int) -> Optional[Album]:
+        """Retrieve an album with its songs eagerly loaded in the same query."""
+        pass
+
+    @abstractmethod
+    async def update_album(self, album_id: int, album: AlbumUpdateInput) -> Optional[Album]:
+        """Update an existing album."""
+        pass
+
+    @abstractmethod
+    async def delete_album(self, album_id: int) -> bool:
+        """Delete an album by its ID."""
+        pass
+
+    @abstractmethod
+    async def create_albums(self, rows: List[dict]) -> List[Album]:
+        """Insert many albums in one transaction, returning them in input order."""
+        pass
+
+    @abstractmethod
+    async def update_albums(self, rows: List[dict]) -> List[Album]:
+        """Apply many partial updates keyed by id in one transaction, returning the albums that exist."""
+        pass
+
+    @abstractmethod
+    async def delete_albums(self, album_ids: List[int]) -> List[int]:
+        """Delete many albums in one transaction, returning the IDs that existed."""
+        pass
+
+    @abstractmethod
+    async def list_albums(self, limit: int, after: Optional[int] = None, filters: Optional[AlbumFilter] = None) -> List[Album]:
+        """List up to limit + 1 albums matching filters with an ID greater than after, ordered by ID."""
+        pass
+
+    @abstractmethod
+    def stream_albums(self) -> AsyncIterator[List[Album]]:
+        """Stream every album ordered by ID, one batch at a time."""
+        pass
+
+    @abstractmethod
+    async def get_songs_by_album_id(self, album_id: int) -> Optional[List[Song]]:
+        """Retrieve all songs associated with a specific album."""
+        pass
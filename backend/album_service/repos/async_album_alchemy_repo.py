@@ -0,0 +1,151 @@
+from backend.album_service.repos.abstract_async_album_alchemy_repo import AbstractAsyncAlbumAlchemyRepository
+from backend.database.models.album_model import Album
+from backend.database.models.song_model import Song as SongModel
+from backend.database.models.album_songs_model import album_songs
+from backend.album_service.models.song import Song
+from backend.album_service.models.album_update_input import AlbumUpdateInput
+from backend.album_service.models.album_filter import AlbumFilter
+from backend.database.connector.async_connector import AsyncDatabaseConnector
+from backend.database.pagination import keyset_window
+from backend.database.filters import equals
+from backend.database.export import stream_partitions
+from backend.database.statements import update_returning, delete_by_key
+from backend.album_service.utils.model_to_model_functions import ModelConverter
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.orm import joinedload
+from typing import List, Optional
+from datetime import datetime
+from contextlib import asynccontextmanager
+
+class AsyncAlbumAlchemyRepository(AbstractAsyncAlbumAlchemyRepository):
+    def __init__(self, db_connector=None):
+        super().__init__()
+        self.model_converter = ModelConverter()
+        self.db_connector = db_connector if db_connector else AsyncDatabaseConnector()
+
+    @asynccontextmanager
+    async def db_session(self):
+        """Async context manager for database session."""
+        db = self.db_connector.get_session()
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    async def create_album(self, album: Album) -> Album:
+        """Create a new album."""
+        async with self.db_session() as db:
+            db.add(album)
+            await db.commit()
+            await db.refresh(album)
+        return album
+
+    async def get_album_by_id(self, album_id: int) -> Optional[Album]:
+        """Retrieve an album by its ID."""
+        async with self.db_session() as db:
+            return await db.get(Album, album_id)
+
+    async def get_albums_by_ids(self, album_ids: List[int]) -> List[Album]:
+        """Retrieve the albums matching any of the given IDs, in no particular order."""
+        async with self.db_session() as db:
+            result = await db.execute(select(Album).where(Album.id.in_(album_ids)))
+            return list(result.scalars().all())
+
+    async def get_album_with_songs(self, album_id: int) -> Optional[Album]:
+        """Retrieve an album with its songs eagerly loaded in the same query."""
+        async with self.db_session() as db:
+            result = await db.execute(
+                select(Album).options(joinedload(Album.songs)).where(Album.id == album_id)
+            )
+            return result.unique().scalars().first()
+
+    async def update_album(self, album_id: int, album_input: AlbumUpdateInput) -> Optional[Album]:
+        """Update an existing album."""
+        # Only non-empty fields are applied, as before
+        values = {
+            key: value for key, value in album_input.model_dump(
+                include={"title", "artist", "genre", "description", "cover_image_url"}
+            ).items() if value
+        }
+        if values:
+            # updated_at is the row version behind ETag / Last-Modified
+            values["updated_at"] = datetime.utcnow()
+        async with self.db_session() as db:
+            album = await update_returning(db, Album, album_id, values)
+            await db.commit()
+        return album
+
+    async def delete_album(self, album_id: int) -> bool:
+        """Delete an album by its ID."""
+        async with self.db_session() as db:
+            await db.execute(delete(album_songs).where(album_songs.c.album_id == album_id))
+            deleted = await delete_by_key(db, Album, album_id)
+            await db.commit()
+        return deleted
+
+    async def create_albums(self, rows: List[dict]) -> List[Album]:
+        """Insert many albums in one transaction, returning them in input order."""
+        async with self.db_session() as db:
+            # executemany INSERT ... RETURNING, batched by the dialect
+            result = await db.scalars(insert(Album).returning(Album, sort_by_parameter_order=True), rows)
+            albums = list(result.all())
+            await db.commit()
+        return albums
+
+    async def update_albums(self, rows: List[dict]) -> List[Album]:
+        """Apply many partial updates keyed by id in one transaction, returning the albums that exist."""
+        album_ids = [row["id"] for row in rows]
+        async with self.db_session() as db:
+            existing = set((await db.scalars(select(Album.id).where(Album.id.in_(album_ids)))).all())
+            now = datetime.utcnow()
+            changes = [{**row, "updated_at": now} for row in rows if row["id"] in existing and len(row) > 1]
+            if changes:
+                # ORM bulk UPDATE by primary key: one executemany per distinct set of columns
+                await db.execute(update(Album), changes)
+            result = await db.scalars(select(Album).where(Album.id.in_(existing)))
+            albums = list(result.all())
+            await db.commit()
+        return albums
+
+    async def delete_albums(self, album_ids: List[int]) -> List[int]:
+        """Delete many albums in one transaction, returning the IDs that existed."""
+        async with self.db_session() as db:
+            existing = list((await db.scalars(select(Album.id).where(Album.id.in_(album_ids)))).all())
+            if existing:
+                await db.execute(delete(album_songs).where(album_songs.c.album_id.in_(existing)))
+                await db.execute(delete(Album).where(Album.id.in_(existing)))
+            await db.commit()
+        return existing
+
+    async def list_albums(self, limit: int, after: Optional[int] = None, filters: Optional[AlbumFilter] = None) -> List[Album]:
+        """List up to limit + 1 albums matching filters with an ID greater than after, ordered by ID."""
+        statement = select(Album)
+        if filters is not None:
+            statement = statement.where(*equals(Album.artist, filters.artist), *equals(Album.genre, filters.genre))
+        async with self.db_session() as db:
+            result = await db.execute(keyset_window(statement, Album.id, limit, after))
+            return list(result.scalars().all())
+
+    async def stream_albums(self):
+        """Stream every album ordered by ID, one batch at a time."""
+        async with self.db_session() as db:
+            async for batch in stream_partitions(db, select(Album).order_by(Album.id)):
+                yield batch
+
+    async def get_songs_by_album_id(self, album_id: int) -> Optional[List[Song]]:
+        """Retrieve all songs associated with a specific album."""
+        async with self.db_session() as db:
+            # One round trip: outer join from the album so an unknown album (no rows)
+            # can be told apart from an album without songs (a single row with no song)
+            result = await db.execute(
+                select(Album.id, SongModel)
+                .select_from(Album)
+                .outerjoin(album_songs, album_songs.c.album_id == Album.id)
+                .outerjoin(SongModel, SongModel.id == album_songs.c.song_id)
+                .where(Album.id == album_id)
+                .order_by(SongModel.id)
+            )
+            rows = result.all()
+        if not rows:
+            return None
+        return [self.model_converter.db_song_to_model(song) for _, song in rows if song is not None]
@@ -1,36 +1,206 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, Query, Body
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Union
 from backend.album_service.models.album import Album
+from backend.album_service.models.album_page import AlbumPage
+from backend.album_service.models.album_batch import AlbumBatch
+from backend.album_service.models.album_search_page import AlbumSearchPage
+from backend.album_service.models.album_filter import AlbumFilter
+from backend.album_service.models.suggestion import Suggestion
+from backend.album_service.models.album_bulk_update_input import AlbumBulkUpdateInput
+from backend.album_service.models.bulk_delete_result import BulkDeleteResult
+from backend.album_service.models.album_with_songs import AlbumWithSongs
 from backend.album_service.models.album_input import AlbumInput
 from backend.album_service.models.album_update_input import AlbumUpdateInput
-from backend.album_service.repos.album_alchemy_repo import AlbumAlchemyRepository
-from backend.album_service.services.album_alchemy_service import AlbumAlchemyService
-from backend.album_service.utils.auth_helper import auth_helper
+from backend.album_service.repos.async_album_alchemy_repo import AsyncAlbumAlchemyRepository
+from backend.album_service.services.async_album_alchemy_service import AsyncAlbumAlchemyService
+from backend.album_service.utils.model_to_model_functions import ModelConverter
+from backend.common.auth.auth_helper import auth_helper
+from backend.album_service.errors_exceptions.exceptions import AlbumNotFoundError
 from backend.album_service.models.song import Song
+from backend.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from backend.database.export import NDJSON_MEDIA_TYPE
+from backend.database.batch import parse_id_list, validate_items, MAX_BULK_ITEMS
+from backend.common.web.conditional import (
+    conditional_response, entity_validators, collection_validators,
+    ITEM_CACHE_CONTROL, LIST_CACHE_CONTROL, PUBLIC_LIST_CACHE_CONTROL
+)
 
 router = APIRouter()
-def get_album_service():
-    return AlbumAlchemyService(album_repository=AlbumAlchemyRepository())
+def get_album_service(request: Request):
+    db_connector = getattr(request.app.state, "db_connector", None)
+    return AsyncAlbumAlchemyService(
+        album_repository=AsyncAlbumAlchemyRepository(db_connector=db_connector),
+        cache=getattr(request.app.state, "cache", None),
+        search_index=getattr(request.app.state, "search_index", None),
+        suggest_index=getattr(request.app.state, "suggest_index", None)
+    )
 
-@router.get("/albums", response_model=List[Album])
-async def get_all_albums(album_service = Depends(get_album_service)):
+@router.get("/albums", response_model=Union[AlbumBatch, AlbumPage])
+async def get_all_albums(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[int] = Query(None, ge=0, description="next_cursor from the previous page"),
+    ids: Optional[str] = Query(None, description="Comma-separated album IDs to fetch in one request"),
+    artist: Optional[str] = Query(None, min_length=1),
+    genre: Optional[str] = Query(None, min_length=1),
+    album_service = Depends(get_album_service)
+):
     """
-    Get all albums.
-    :return: A list of all album objects.
+    Get albums one keyset page at a time, ordered by ID, or a batch of albums by ID.
+    :param limit: Maximum number of albums to return.
+    :param after: Return albums with an ID greater than this cursor.
+    :param ids: Comma-separated album IDs; when given, limit, after and the filters are ignored.
+    :param artist: Only albums by exactly this artist.
+    :param genre: Only albums of exactly this genre.
+    :return: The page of albums and the cursor of the next page, or the requested
+        albums in request order and the IDs that were not found. A 304 with no body
+        when the client's If-None-Match still matches.
     """
-    return album_service.get_all_albums()
+    if ids is not None:
+        try:
+            album_ids = parse_id_list(ids)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        batch = await album_service.get_albums_by_ids(album_ids)
+        validators = collection_validators(batch.items, batch.missing)
+        return conditional_response(request, response, *validators, PUBLIC_LIST_CACHE_CONTROL) or batch
+    page = await album_service.get_albums_page(limit, after, AlbumFilter(artist=artist, genre=genre))
+    validators = collection_validators(page.items, page.next_cursor)
+    return conditional_response(request, response, *validators, PUBLIC_LIST_CACHE_CONTROL) or page
 
-@router.get("/albums/{album_id}", response_model=Album)
-async def get_album_by_id(album_id: int, current_user=auth_helper.require_auth(), album_service = Depends(get_album_service)):
+@router.get("/albums/search", response_model=AlbumSearchPage)
+async def search_albums(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, description="Words to find in the title, artist or genre"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    current_user=auth_helper.require_auth(),
+    album_service = Depends(get_album_service)
+):
+    """
+    Full-text search over albums, best matches first.
+    Case and accents are ignored and the last word also matches words it begins.
+    Declared before /albums/{album_id} so "search" is not parsed as an ID.
+    :param q: The query; every word must match.
+    :param limit: Maximum number of albums to return.
+    :param offset: Number of ranked results to skip.
+    :return: One page of ranked albums, the number of matches and the offset of the next page.
+    """
+    if album_service.search_index is None:
+        raise HTTPException(status_code=503, detail="Search index is not available")
+    page = await album_service.search_albums(q, limit, offset)
+    validators = collection_validators(page.items, page.total, page.next_offset)
+    return conditional_response(request, response, *validators, LIST_CACHE_CONTROL) or page
+
+@router.get("/albums/suggest", response_model=List[Suggestion])
+async def suggest_albums(
+    prefix: str = Query(..., min_length=1, description="What the user has typed so far"),
+    limit: int = Query(10, ge=1, le=50),
+    current_user=auth_helper.require_auth(),
+    album_service = Depends(get_album_service)
+):
+    """
+    Autocomplete album titles and artists as the user types, most popular first.
+    Prefixes of three or more characters that match too little also match with a typo.
+    Declared before /albums/{album_id} so "suggest" is not parsed as an ID.
+    :param prefix: The start of a title or artist name.
+    :param limit: Maximum number of suggestions to return.
+    :return: The suggested texts with their kind and score.
+    """
+    if album_service.suggest_index is None:
+        raise HTTPException(status_code=503, detail="Suggest index is not available")
+    return await album_service.suggest(prefix, limit)
+
+@router.post("/albums:batch", response_model=List[Album])
+async def create_albums(items: List[dict] = Body(...), current_user=auth_helper.require_role("admin"), album_service = Depends(get_album_service)):
+    """
+    Create many albums in one transaction.
+    :param items: The album input objects to create.
+    :return: The created albums in input order. If any item is invalid nothing is
+        written and the errors are reported per item index.
+    """
+    album_inputs, errors = validate_items(items, AlbumInput, check=ModelConverter.album_input_to_row)
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    try:
+        return await album_service.create_albums(album_inputs)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.patch("/albums:batch", response_model=AlbumBatch)
+async def update_albums(items: List[dict] = Body(...), current_user=auth_helper.require_role("admin"), album_service = Depends(get_album_service)):
+    """
+    Partially update many albums in one transaction.
+    :param items: Objects holding an album id and the fields to change.
+    :return: The updated albums in input order and the IDs that were not found.
+    """
+    album_inputs, errors = validate_items(items, AlbumBulkUpdateInput, unique_key="id")
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    try:
+        return await album_service.update_albums(album_inputs)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/albums:batch", response_model=BulkDeleteResult)
+async def delete_albums(
+    ids: str = Query(..., description="Comma-separated album IDs to delete"),
+    current_user=auth_helper.require_role("admin"),
+    album_service = Depends(get_album_service)
+):
+    """
+    Delete many albums in one transaction.
+    :param ids: Comma-separated album IDs.
+    :return: The deleted IDs and the IDs that were not found.
+    """
+    try:
+        album_ids = parse_id_list(ids, MAX_BULK_ITEMS)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return await album_service.delete_albums(album_ids)
+
+@router.get("/albums/export")
+async def export_albums(current_user=auth_helper.require_auth(), album_service = Depends(get_album_service)):
+    """
+    Stream every album as newline-delimited JSON, ordered by ID.
+    Declared before /albums/{album_id} so "export" is not parsed as an ID.
+    :return: A streaming NDJSON response with one album per line.
+    """
+    return StreamingResponse(album_service.export_albums(), media_type=NDJSON_MEDIA_TYPE)
+
+@router.get("/albums/{album_id}", response_model=Union[AlbumWithSongs, Album])
+async def get_album_by_id(
+    album_id: int,
+    request: Request,
+    response: Response,
+    include: Optional[str] = Query(None, pattern="^songs$", description="Set to 'songs' to embed the tracklist"),
+    current_user=auth_helper.require_auth(),
+    album_service = Depends(get_album_service)
+):
     """
     Get an album by its ID.
     :param album_id: The ID of the album to retrieve.
-    :return: The album object if found, raises HTTPException otherwise.
+    :param include: 'songs' to return the album and its tracklist in one round trip.
+    :return: The album object if found, a 304 with no body when the client's
+        If-None-Match or If-Modified-Since shows its copy is current,
+        raises HTTPException otherwise.
     """
     try:
-        return album_service.get_album_by_id(album_id)
+        if include == "songs":
+            album = await album_service.get_album_with_songs(album_id)
+        else:
+            album = await album_service.get_album_by_id(album_id)
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
+    if include == "songs":
+        # The embedded tracklist changes independently of the album row
+        validators = collection_validators([album, *album.songs])
+    else:
+        validators = entity_validators(album)
+    return conditional_response(request, response, *validators, ITEM_CACHE_CONTROL) or album
     
 @router.post("/albums", response_model=Album)
 async def create_album(album_input: AlbumInput, current_user=auth_helper.require_role("admin"), album_service = Depends(get_album_service)):
@@ -40,7 +210,7 @@ async def create_album(album_input: AlbumInput, current_user=auth_helper.require
     :return: The created album object.
     """
     try:
-        return album_service.create_new_album(album_input)
+        return await album_service.create_new_album(album_input)
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
@@ -55,9 +225,11 @@ async def update_album(album_id: int, album_input: AlbumUpdateInput, current_use
     :return: The updated album object if successful, raises HTTPException otherwise.
     """
     try:
-        return album_service.update_album(album_id, album_input)
+        return await album_service.update_album(album_id, album_input)
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
+    except AlbumNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
     
@@ -69,19 +241,27 @@ async def delete_album(album_id: int, current_user=auth_helper.require_role("adm
     :return: A success message if deletion is successful, raises HTTPException otherwise.
     """
     try:
-        album_service.delete_album(album_id)
+        await album_service.delete_album(album_id)
         return {"detail": "Album deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 @router.get("/albums/{album_id}/songs", response_model=List[Song])
-async def get_album_songs(album_id: int, current_user=auth_helper.require_auth(), album_service = Depends(get_album_service)):
+async def get_album_songs(
+    album_id: int,
+    request: Request,
+    response: Response,
+    current_user=auth_helper.require_auth(),
+    album_service = Depends(get_album_service)
+):
     """
     Get all songs in an album.
     :param album_id: The ID of the album to retrieve songs from.
-    :return: A list of song titles in the album.
+    :return: A list of song titles in the album, or a 304 with no body when the
+        client's If-None-Match still matches.
     """
     try:
-        return album_service.get_album_songs(album_id)
+        songs = await album_service.get_album_songs(album_id)
     except Exception as e:
-        raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=404, detail=str(e))
+    return conditional_response(request, response, *collection_validators(songs), LIST_CACHE_CONTROL) or songs
\ No newline at end of file
@@ -0,0 +1,89 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, List, Optional
+from backend.album_service.models.album import Album
+from backend.album_service.models.album_page import AlbumPage
+from backend.album_service.models.album_batch import AlbumBatch
+from backend.album_service.models.album_search_page import AlbumSearchPage
+from backend.album_service.models.album_filter import AlbumFilter
+from backend.album_service.models.suggestion import Suggestion
+from backend.album_service.models.album_bulk_update_input import AlbumBulkUpdateInput
+from backend.album_service.models.bulk_delete_result import BulkDeleteResult
+from backend.album_service.models.album_with_songs import AlbumWithSongs
+from backend.album_service.models.album_input import AlbumInput
+from backend.album_service.models.album_update_input import AlbumUpdateInput
+from backend.album_service.models.song import Song
+from backend.album_service.repos.abstract_async_album_alchemy_repo import AbstractAsyncAlbumAlchemyRepository
+
+class AbstractAsyncAlbumAlchemyService(ABC):
+    def __init__(self, album_repository: AbstractAsyncAlbumAlchemyRepository):
+        self.album_repository = album_repository
+
+    @abstractmethod
+    async def get_albums_page(self, limit: int, after: Optional[int] = None, filters: Optional[AlbumFilter] = None) -> AlbumPage:
+        """Get one keyset page of the albums matching filters, ordered by ID."""
+        pass
+
+    @abstractmethod
+    def export_albums(self) -> AsyncIterator[str]:
+        """Export every album as NDJSON chunks."""
+        pass
+
+    @abstractmethod
+    async def get_album_by_id(self, id: int) -> Optional[Album]:
+        """Get an album by its ID."""
+        pass
+
+    @abstractmethod
+    async def search_albums(self, query: str, limit: int, offset: int = 0) -> AlbumSearchPage:
+        """Rank albums matching a full-text query."""
+        pass
+
+    @abstractmethod
+    async def suggest(self, prefix: str, limit: int) -> List[Suggestion]:
+        """Complete a prefix to album titles and artists."""
+        pass
+
+    @abstractmethod
+    async def get_albums_by_ids(self, ids: List[int]) -> AlbumBatch:
+        """Get several albums in request order, reporting IDs that were not found."""
+        pass
+
+    @abstractmethod
+    async def get_album_with_songs(self, id: int) -> AlbumWithSongs:
+        """Get an album together with its tracklist."""
+        pass
+
+    @abstractmethod
+    async def create_new_album(self, input: AlbumInput) -> Optional[Album]:
+        """Create a new album."""
+        pass
+
+    @abstractmethod
+    async def create_albums(self, inputs: List[AlbumInput]) -> List[Album]:
+        """Create many albums in one transaction."""
+        pass
+
+    @abstractmethod
+    async def update_albums(self, inputs: List[AlbumBulkUpdateInput]) -> AlbumBatch:
+        """Update many albums in one transaction, reporting IDs that were not found."""
+        pass
+
+    @abstractmethod
+    async def delete_albums(self, ids: List[int]) -> BulkDeleteResult:
+        """Delete many albums in one transaction, reporting IDs that were not found."""
+        pass
+
+    @abstractmethod
+    async def update_album(self, id: int, album_input: AlbumUpdateInput) -> Optional[Album]:
+        """Update an existing album."""
+        pass
+
+    @abstractmethod
+    async def delete_album(self, id: int) -> bool:
+        """Delete an album by its ID."""
+        pass
+
+    @abstractmethod
+    async def get_album_songs(self, album_id: int) -> List[Song]:
+        """Get all songs in an album."""
+        pass
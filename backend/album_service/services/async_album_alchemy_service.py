@@ -0,0 +1,169 @@
+from backend.album_service.services.abstract_async_album_alchemy_service import AbstractAsyncAlbumAlchemyService
+from typing import List, Optional
+from backend.album_service.models.album import Album
+from backend.album_service.models.album_page import AlbumPage
+from backend.album_service.models.album_batch import AlbumBatch
+from backend.album_service.models.album_search_page import AlbumSearchPage
+from backend.album_service.models.album_filter import AlbumFilter
+from backend.album_service.models.suggestion import Suggestion
+from backend.album_service.models.album_bulk_update_input import AlbumBulkUpdateInput
+from backend.album_service.models.bulk_delete_result import BulkDeleteResult
+from backend.album_service.models.album_with_songs import AlbumWithSongs
+from backend.album_service.models.album_input import AlbumInput
+from backend.album_service.models.album_update_input import AlbumUpdateInput
+from backend.album_service.models.song import Song
+from backend.album_service.errors_exceptions.exceptions import AlbumNotFoundError
+from backend.album_service.utils.model_to_model_functions import ModelConverter
+from backend.database.pagination import split_page
+from backend.database.export import ndjson_chunks
+from backend.database.batch import order_by_request
+from backend.common.cache.cache_backend import CacheBackend
+from backend.common.cache.read_through import cached
+from backend.common.cache.keys import album_key, album_with_songs_key, album_songs_key, album_keys
+from backend.common.search.inverted_index import InvertedIndex
+from backend.common.search.suggest import SuggestIndex
+from pydantic import TypeAdapter
+
+ALBUM_ADAPTER = TypeAdapter(Album)
+ALBUM_WITH_SONGS_ADAPTER = TypeAdapter(AlbumWithSongs)
+SONG_LIST_ADAPTER = TypeAdapter(List[Song])
+# Indexed fields and how much a word found in each counts towards an album's rank
+ALBUM_SEARCH_FIELDS = {"title": 3.0, "artist": 2.0, "genre": 1.0}
+
+def album_suggestions(album) -> list:
+    """Autocomplete entries of an album; an artist's weight adds up over their albums."""
+    return [("album", album.title, 1.0), ("artist", album.artist, 1.0)]
+
+class AsyncAlbumAlchemyService(AbstractAsyncAlbumAlchemyService):
+    def __init__(
+        self,
+        album_repository,
+        cache: Optional[CacheBackend] = None,
+        search_index: Optional[InvertedIndex] = None,
+        suggest_index: Optional[SuggestIndex] = None
+    ):
+        super().__init__(album_repository)
+        self.model_converter = ModelConverter()
+        self.cache = cache
+        self.search_index = search_index
+        self.suggest_index = suggest_index
+
+    async def _invalidate(self, album_ids: List[int]) -> None:
+        if self.cache is not None and album_ids:
+            await self.cache.delete(*album_keys(album_ids))
+
+    def _index(self, albums) -> None:
+        if self.search_index is not None:
+            for album in albums:
+                self.search_index.add(album.id, album)
+        if self.suggest_index is not None:
+            for album in albums:
+                self.suggest_index.index(album.id, album_suggestions(album))
+
+    def _unindex(self, album_ids: List[int]) -> None:
+        if self.search_index is not None:
+            for album_id in album_ids:
+                self.search_index.remove(album_id)
+        if self.suggest_index is not None:
+            for album_id in album_ids:
+                self.suggest_index.remove(album_id)
+
+    async def get_albums_page(self, limit: int, after: Optional[int] = None, filters: Optional[AlbumFilter] = None) -> AlbumPage:
+        albums, next_cursor = split_page(await self.album_repository.list_albums(limit, after, filters), limit)
+        return AlbumPage(
+            items=[self.model_converter.db_album_to_model(album) for album in albums],
+            next_cursor=next_cursor
+        )
+
+    def export_albums(self):
+        return ndjson_chunks(self.album_repository.stream_albums(), self.model_converter.db_album_to_model)
+
+    async def get_album_by_id(self, id: int) -> Optional[Album]:
+        async def load():
+            album = await self.album_repository.get_album_by_id(id)
+            return self.model_converter.db_album_to_model(album) if album else None
+
+        album = await cached(self.cache, album_key(id), ALBUM_ADAPTER, load)
+        if not album:
+            raise AlbumNotFoundError(f"Album with id {id} not found.")
+        return album
+
+    async def search_albums(self, query: str, limit: int, offset: int = 0) -> AlbumSearchPage:
+        ids, total = self.search_index.search(query, limit, offset)
+        # Rows deleted by another replica are still indexed here; they are dropped on load
+        albums, _ = order_by_request(await self.album_repository.get_albums_by_ids(ids), ids) if ids else ([], [])
+        return AlbumSearchPage(
+            items=[self.model_converter.db_album_to_model(album) for album in albums],
+            total=total,
+            next_offset=offset + limit if offset + limit < total else None,
+            truncated=self.search_index.prefix_truncated(query)
+        )
+
+    async def suggest(self, prefix: str, limit: int) -> List[Suggestion]:
+        return [Suggestion(**suggestion) for suggestion in self.suggest_index.suggest(prefix, limit)]
+
+    async def get_albums_by_ids(self, ids: List[int]) -> AlbumBatch:
+        albums, missing = order_by_request(await self.album_repository.get_albums_by_ids(ids), ids)
+        return AlbumBatch(items=[self.model_converter.db_album_to_model(album) for album in albums], missing=missing)
+
+    async def get_album_with_songs(self, id: int) -> AlbumWithSongs:
+        async def load():
+            album = await self.album_repository.get_album_with_songs(id)
+            return self.model_converter.db_album_with_songs_to_model(album) if album else None
+
+        album = await cached(self.cache, album_with_songs_key(id), ALBUM_WITH_SONGS_ADAPTER, load)
+        if not album:
+            raise AlbumNotFoundError(f"Album with id {id} not found.")
+        return album
+
+    async def create_new_album(self, input: AlbumInput) -> Optional[Album]:
+        created_album = await self.album_repository.create_album(self.model_converter.album_input_to_db_model(input))
+        if created_album:
+            self._index([created_album])
+        return self.model_converter.db_album_to_model(created_album) if created_album else None
+
+    async def create_albums(self, inputs: List[AlbumInput]) -> List[Album]:
+        created = await self.album_repository.create_albums([self.model_converter.album_input_to_row(i) for i in inputs])
+        self._index(created)
+        return [self.model_converter.db_album_to_model(album) for album in created]
+
+    async def update_albums(self, inputs: List[AlbumBulkUpdateInput]) -> AlbumBatch:
+        rows = [{**i.model_dump(exclude_unset=True), "id": i.id} for i in inputs]
+        albums, missing = order_by_request(await self.album_repository.update_albums(rows), [i.id for i in inputs])
+        await self._invalidate([album.id for album in albums])
+        self._index(albums)
+        return AlbumBatch(items=[self.model_converter.db_album_to_model(album) for album in albums], missing=missing)
+
+    async def delete_albums(self, ids: List[int]) -> BulkDeleteResult:
+        deleted = set(await self.album_repository.delete_albums(ids))
+        await self._invalidate(list(deleted))
+        self._unindex(list(deleted))
+        return BulkDeleteResult(
+            deleted=[i for i in ids if i in deleted],
+            missing=[i for i in ids if i not in deleted]
+        )
+
+    async def update_album(self, id: int, album_input: AlbumUpdateInput) -> Optional[Album]:
+        updated_album = await self.album_repository.update_album(id, album_input)
+        await self._invalidate([id])
+        if not updated_album:
+            raise AlbumNotFoundError(f"Album with id {id} not found.")
+        self._index([updated_album])
+        return self.model_converter.db_album_to_model(updated_album)
+
+    async def delete_album(self, id: int) -> bool:
+        deleted = await self.album_repository.delete_album(id)
+        await self._invalidate([id])
+        if not deleted:
+            raise AlbumNotFoundError(f"Album with id {id} not found.")
+        self._unindex([id])
+        return True
+
+    async def get_album_songs(self, album_id: int) -> List[Song]:
+        songs = await cached(
+            self.cache, album_songs_key(album_id), SONG_LIST_ADAPTER,
+            lambda: self.album_repository.get_songs_by_album_id(album_id)
+        )
+        if songs is None:
+            raise AlbumNotFoundError(f"Album with id {album_id} not found.")
+        return songs
@@ -383,20 +383,27 @@ def get_album_by_id(album_id: int) -> AlbumModel:
     """Get a mock album by ID for testing."""
     return next((album for album in MOCK_ALBUMS if album.id == album_id), None)
 
+SONG_ALBUM_MAPPING = {
+    1: [1, 2, 3],      # The Dark Side of the Moon
+    2: [4, 5, 6],      # Thriller  
+    3: [7, 8],         # good kid, m.A.A.d city
+    4: [9, 10],        # Kind of Blue
+    5: [11, 12],       # Random Access Memories
+    6: [13, 14],       # OK Computer
+    7: [15, 16],       # Songs in the Key of Life
+    8: [17, 18]        # For Emma, Forever Ago
+}
+
+# ALBUM_SONGS rows linking each mock album to its songs
+MOCK_ALBUM_SONGS = [
+    {"album_id": album_id, "song_id": song_id}
+    for album_id, song_ids in SONG_ALBUM_MAPPING.items()
+    for song_id in song_ids
+]
+
 def get_songs_by_album_id(album_id: int) -> list[SongModel]:
     """Get all mock songs for a specific album (based on realistic groupings)."""
-    song_album_mapping = {
-        1: [1, 2, 3],      # The Dark Side of the Moon
-        2: [4, 5, 6],      # Thriller  
-        3: [7, 8],         # good kid, m.A.A.d city
-        4: [9, 10],        # Kind of Blue
-        5: [11, 12],       # Random Access Memories
-        6: [13, 14],       # OK Computer
-        7: [15, 16],       # Songs in the Key of Life
-        8: [17, 18]        # For Emma, Forever Ago
-    }
-    
-    song_ids = song_album_mapping.get(album_id, [])
+    song_ids = SONG_ALBUM_MAPPING.get(album_id, [])
     return [song for song in MOCK_SONGS if song.id in song_ids]
 
 def get_albums_by_genre(genre: str) -> list[AlbumModel]:
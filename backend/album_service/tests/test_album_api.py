@@ -2,19 +2,23 @@
 Simple Album API Test with In-Memory Database
 """
 
+import asyncio
 import pytest
 import time
+import json
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 
 # Import FastAPI app and dependencies
 from backend.album_service.app import app
 from backend.album_service.routers.album_router import get_album_service
 
 # Import your existing classes
-from backend.album_service.services.album_alchemy_service import AlbumAlchemyService
-from backend.album_service.repos.album_alchemy_repo import AlbumAlchemyRepository
+from backend.album_service.services.async_album_alchemy_service import AsyncAlbumAlchemyService
+from backend.album_service.repos.async_album_alchemy_repo import AsyncAlbumAlchemyRepository
 
 # Import database models
 from backend.database.models.base import Base
@@ -22,6 +26,12 @@ from backend.database.models.album_model import Album as AlbumModel
 from backend.database.models.song_model import Song as SongModel
 from backend.database.models.album_songs_model import album_songs
 from backend.database.connector.test_connector import TestConnector
+from backend.database import export
+from backend.common.cache.memory_cache import InMemoryCache
+from backend.database import batch as batch_module
+from backend.common.search.inverted_index import InvertedIndex, index_partitions
+from backend.common.search.suggest import SuggestIndex, suggest_partitions
+from backend.album_service.services.async_album_alchemy_service import ALBUM_SEARCH_FIELDS, album_suggestions
 
 # Import mock data
 from backend.album_service.tests.mock_test_data import *
@@ -63,19 +73,33 @@ def test_client():
     Base.metadata.create_all(bind=engine)
     
     # Create session factory
-    TestSessionLocal = sessionmaker(bind=engine)
+    TestSessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
     
     # Populate with mock data
     session = TestSessionLocal()
     session.add_all(MOCK_ALBUMS)
     session.add_all(MOCK_SONGS)
     session.commit()
+    if session.execute(select(album_songs)).first() is None:
+        session.execute(album_songs.insert(), MOCK_ALBUM_SONGS)
+        session.commit()
+    # Detach the mock objects so the next test's session can add them again
+    session.close()
     
+    # The app talks to the same in-memory database through an async engine.
+    # NullPool because each TestClient request runs on its own event loop.
+    async_engine = create_async_engine(
+        "sqlite+aiosqlite:///file:memdb1?mode=memory&cache=shared&uri=true",
+        poolclass=NullPool,
+        echo=False
+    )
+    AsyncTestSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
     # Create test components
-    test_connector = TestConnector(session_factory=TestSessionLocal)
+    test_connector = TestConnector(session_factory=AsyncTestSessionLocal)
 
-    test_repository = AlbumAlchemyRepository(db_connector=test_connector)
-    test_service = AlbumAlchemyService(album_repository=test_repository)
+    test_repository = AsyncAlbumAlchemyRepository(db_connector=test_connector)
+    test_service = AsyncAlbumAlchemyService(album_repository=test_repository)
     
     # Override FastAPI dependency
     app.dependency_overrides[get_album_service] = lambda: test_service
@@ -96,11 +120,163 @@ def test_get_all_albums(test_client):
     response = test_client.get("/albums")
     
     assert response.status_code == 200
-    albums = response.json()
+    albums = response.json()["items"]
     
     assert len(albums) == 8
     assert albums[0]["title"] == "The Dark Side of the Moon"
     assert albums[0]["artist"] == "Pink Floyd"
+    assert response.json()["next_cursor"] is None
+
+def test_get_albums_pages_by_cursor(test_client):
+    """
+    Test GET /albums follows next_cursor through every album exactly once.
+    """
+    all_ids = [album["id"] for album in test_client.get("/albums").json()["items"]]
+    paged_ids, after = [], None
+    while True:
+        params = {"limit": 3} if after is None else {"limit": 3, "after": after}
+        page = test_client.get("/albums", params=params).json()
+        assert len(page["items"]) <= 3
+        paged_ids.extend(album["id"] for album in page["items"])
+        after = page["next_cursor"]
+        if after is None:
+            break
+    assert paged_ids == sorted(paged_ids)
+    assert paged_ids == all_ids
+    assert test_client.get("/albums", params={"limit": 0}).status_code == 422
+
+def test_filter_albums(test_client):
+    """
+    Test GET /albums filters by exact artist and genre, and pages filtered results by cursor.
+    """
+    def ids(params):
+        response = test_client.get("/albums", params=params)
+        assert response.status_code == 200
+        return [album["id"] for album in response.json()["items"]]
+
+    assert ids({"artist": "Radiohead"}) == [6]
+    assert ids({"genre": "Jazz"}) == [4]
+    assert ids({"artist": "Miles Davis", "genre": "Pop"}) == []
+
+    created = test_client.post("/albums:batch", json=[
+        {"title": f"Filter Album {i}", "artist": "Filter Artist", "genre": "Filter Genre"} for i in range(3)
+    ], headers=get_auth_headers("admin")).json()
+    first = test_client.get("/albums", params={"artist": "Filter Artist", "limit": 2}).json()
+    second = test_client.get("/albums", params={"artist": "Filter Artist", "limit": 2, "after": first["next_cursor"]}).json()
+    assert [album["id"] for album in first["items"] + second["items"]] == [album["id"] for album in created]
+    assert second["next_cursor"] is None
+    assert test_client.delete("/albums:batch", params={"ids": ",".join(str(album["id"]) for album in created)}, headers=get_auth_headers("admin")).status_code == 200
+
+def test_get_albums_by_ids(test_client):
+    """
+    Test GET /albums?ids= returns albums in request order and reports missing IDs.
+    """
+    response = test_client.get("/albums", params={"ids": "5,2,404"})
+    assert response.status_code == 200
+    batch = response.json()
+    assert [album["id"] for album in batch["items"]] == [5, 2]
+    assert batch["items"][1]["title"] == "Thriller"
+    assert batch["missing"] == [404]
+    too_many = ",".join(str(i) for i in range(1, batch_module.MAX_BATCH_IDS + 2))
+    assert test_client.get("/albums", params={"ids": too_many}).status_code == 422
+
+def test_bulk_create_update_delete_albums(test_client):
+    """
+    Test POST, PATCH and DELETE /albums:batch apply whole batches and report per item.
+    """
+    admin = get_auth_headers("admin")
+    new_albums = [{"title": f"Bulk Album {i}", "artist": "Bulk Artist", "genre": "Test"} for i in range(3)]
+    response = test_client.post("/albums:batch", json=new_albums, headers=admin)
+    assert response.status_code == 200
+    ids = [album["id"] for album in response.json()]
+    assert len(ids) == 3
+
+    invalid = test_client.patch("/albums:batch", json=[{"id": ids[0]}, {"id": ids[0], "title": ""}], headers=admin)
+    assert invalid.status_code == 422
+    assert [error["index"] for error in invalid.json()["detail"]] == [1]
+    nulls = test_client.patch("/albums:batch", json=[{"id": ids[0], "genre": "Kept?"}, {"id": ids[1], "title": None}], headers=admin)
+    assert nulls.status_code == 422
+    assert [error["index"] for error in nulls.json()["detail"]] == [1]
+    assert test_client.get(f"/albums/{ids[0]}", headers=admin).json()["genre"] == "Test"
+
+    response = test_client.patch("/albums:batch", json=[{"id": ids[2], "genre": "Updated"}, {"id": 4242}], headers=admin)
+    assert response.status_code == 200
+    assert response.json()["items"][0]["genre"] == "Updated"
+    assert response.json()["missing"] == [4242]
+
+    response = test_client.delete("/albums:batch", params={"ids": ",".join(map(str, ids))}, headers=admin)
+    assert response.json() == {"deleted": ids, "missing": []}
+
+def test_album_reads_are_cached_until_written(test_client):
+    """
+    Test album lookups are served from the cache and invalidated by updates.
+    """
+    service = app.dependency_overrides[get_album_service]()
+    service.cache = InMemoryCache()
+    headers = get_auth_headers()
+
+    first = test_client.get("/albums/4", headers=headers).json()
+    assert test_client.get("/albums/4", headers=headers).json() == first
+    test_client.get("/albums/4/songs", headers=headers)
+    test_client.get("/albums/4/songs", headers=headers)
+    assert (service.cache.stats()["hits"], service.cache.stats()["misses"]) == (2, 2)
+
+    response = test_client.put("/albums/4", json={"title": "Kind of Blue (Remastered)"}, headers=get_auth_headers("admin"))
+    assert response.status_code == 200
+    assert test_client.get("/albums/4", headers=headers).json()["title"] == "Kind of Blue (Remastered)"
+    assert service.cache.stats()["misses"] == 3
+
+def test_export_albums_streams_ndjson(test_client, monkeypatch):
+    """
+    Test GET /albums/export streams every album as one JSON object per line.
+    """
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 3)
+    listed = test_client.get("/albums", params={"limit": 500}).json()["items"]
+    response = test_client.get("/albums/export", headers=get_auth_headers())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert exported == listed
+    assert test_client.get("/albums/export").status_code in (401, 403)
+
+def test_search_albums(test_client):
+    """
+    Test GET /albums/search requires a login like /songs/search, ranks indexed albums and follows updates.
+    """
+    admin, user = get_auth_headers("admin"), get_auth_headers()
+    service = app.dependency_overrides[get_album_service]()
+    service.search_index = asyncio.run(index_partitions(InvertedIndex(ALBUM_SEARCH_FIELDS), service.album_repository.stream_albums()))
+
+    assert test_client.get("/albums/search", params={"q": "miles jazz"}).status_code in (401, 403)
+    response = test_client.get("/albums/search", params={"q": "miles jazz"}, headers=user)
+    assert response.status_code == 200
+    assert response.json()["truncated"] is False
+    assert [album["id"] for album in response.json()["items"]] == [4]
+    title = response.json()["items"][0]["title"]
+
+    assert test_client.put("/albums/4", json={"title": "Kind of Bleu"}, headers=admin).status_code == 200
+    assert test_client.get("/albums/search", params={"q": "blue miles"}, headers=user).json()["total"] == 0
+    assert test_client.get("/albums/search", params={"q": "bleu"}, headers=user).json()["items"][0]["id"] == 4
+    assert test_client.put("/albums/4", json={"title": title}, headers=admin).status_code == 200
+
+def test_suggest_albums(test_client):
+    """
+    Test GET /albums/suggest requires a login like /songs/suggest, tolerates typos and follows updates.
+    """
+    admin, user = get_auth_headers("admin"), get_auth_headers()
+    service = app.dependency_overrides[get_album_service]()
+    assert test_client.get("/albums/suggest", params={"prefix": "thr"}, headers=user).status_code == 503
+
+    service.suggest_index = asyncio.run(suggest_partitions(SuggestIndex(), service.album_repository.stream_albums(), album_suggestions))
+    assert test_client.get("/albums/suggest", params={"prefix": "thriler"}).status_code in (401, 403)
+    response = test_client.get("/albums/suggest", params={"prefix": "thriler"}, headers=user)
+    assert response.status_code == 200
+    assert response.json()[0] == {"text": "Thriller", "kind": "album", "score": 0.25}
+    title = test_client.get("/albums/2", headers=admin).json()["title"]
+
+    assert test_client.put("/albums/2", json={"title": "Thrillogy"}, headers=admin).status_code == 200
+    assert [s["text"] for s in test_client.get("/albums/suggest", params={"prefix": "thrill"}, headers=user).json()] == ["Thrillogy"]
+    assert test_client.put("/albums/2", json={"title": title}, headers=admin).status_code == 200
 
 def test_get_album_by_id(test_client):
     """
@@ -142,20 +318,63 @@ def test_update_album(test_client):
     assert updated_response["description"] == updated_album["description"]
     assert updated_response["cover_image_url"] == updated_album["cover_image_url"]
 
-@pytest.mark.skip(reason="Further implementation needed")
 def test_get_songs_by_album_id(test_client):
     """
     Test GET /albums/{album_id}/songs endpoint returns songs for an album.
     """
 
     response = test_client.get("/albums/2/songs", headers=get_auth_headers())
-    print(f"Response status: {response.status_code}")
-    print(f"Response body: {response.text}")
     
     assert response.status_code == 200
     songs = response.json()
     
-    assert len(songs) >= 1  
+    assert [song["id"] for song in songs] == SONG_ALBUM_MAPPING[2]
+    assert songs[0]["title"] == get_songs_by_album_id(2)[0].title
+    assert test_client.get("/albums/999/songs", headers=get_auth_headers()).status_code == 404
+
+def test_get_album_with_songs(test_client):
+    """
+    Test GET /albums/{album_id}?include=songs returns the album and its tracklist.
+    """
+    response = test_client.get("/albums/3", params={"include": "songs"}, headers=get_auth_headers())
+
+    assert response.status_code == 200
+    album = response.json()
+    assert album["title"] == get_album_by_id(3).title
+    assert [song["id"] for song in album["songs"]] == SONG_ALBUM_MAPPING[3]
+    assert "songs" not in test_client.get("/albums/3", headers=get_auth_headers()).json()
+    assert test_client.get("/albums/3", params={"include": "tracks"}, headers=get_auth_headers()).status_code == 422
+
+def test_get_album_conditional_requests(test_client):
+    """
+    Test GET /albums/{album_id} answers If-None-Match / If-Modified-Since with 304 until the album changes.
+    """
+    headers = get_auth_headers()
+    first = test_client.get("/albums/4", headers=headers)
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+
+    assert test_client.get("/albums/4", headers={**headers, "If-None-Match": etag}).status_code == 304
+    assert test_client.get("/albums/4", headers={**headers, "If-Modified-Since": last_modified}).status_code == 304
+    # The embedded tracklist is a different representation with its own ETag
+    with_songs = test_client.get("/albums/4", params={"include": "songs"}, headers={**headers, "If-None-Match": etag})
+    assert with_songs.status_code == 200
+    assert test_client.get(
+        "/albums/4", params={"include": "songs"}, headers={**headers, "If-None-Match": with_songs.headers["etag"]}
+    ).status_code == 304
+
+    assert test_client.put("/albums/4", json={"title": "Retitled"}, headers=get_auth_headers(role="admin")).status_code == 200
+    changed = test_client.get("/albums/4", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["title"] == "Retitled"
+
+def test_list_albums_conditional_requests(test_client):
+    """
+    Test the public GET /albums list is revalidated with its ETag.
+    """
+    first = test_client.get("/albums")
+    assert first.headers["cache-control"].startswith("public")
+    assert test_client.get("/albums", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+    assert test_client.get("/albums", headers={"If-None-Match": '"stale"'}).status_code == 200
 
 def test_delete_album(test_client):
     """
@@ -169,6 +388,13 @@ def test_delete_album(test_client):
     response = test_client.get("/albums/1", headers=get_auth_headers())
     assert response.status_code == 404
 
+def test_update_and_delete_missing_album(test_client):
+    """
+    Test PUT and DELETE /albums/{album_id} report 404 for an unknown album.
+    """
+    admin = get_auth_headers("admin")
+    assert test_client.put("/albums/999999", json={"title": "Ghost"}, headers=admin).status_code == 404
+    assert test_client.delete("/albums/999999", headers=admin).status_code == 404
 
 def test_not_authorized_access(test_client):
     """
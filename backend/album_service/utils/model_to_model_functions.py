@@ -2,6 +2,7 @@ from backend.database.models.song_model import Song as SongModel
 from backend.database.models.album_model import Album as AlbumModel
 from backend.album_service.models.song import Song
 from backend.album_service.models.album import Album
+from backend.album_service.models.album_with_songs import AlbumWithSongs
 from backend.album_service.models.album_input import AlbumInput
 
 class ModelConverter:
@@ -35,15 +36,26 @@ class ModelConverter:
         )
 
     @staticmethod
-    def album_input_to_db_model(input: AlbumInput) -> AlbumModel:
+    def db_album_with_songs_to_model(album: AlbumModel) -> AlbumWithSongs:
+        return AlbumWithSongs(
+            **ModelConverter.db_album_to_model(album).model_dump(),
+            songs=[ModelConverter.db_song_to_model(song) for song in sorted(album.songs, key=lambda song: song.id)]
+        )
+
+    @staticmethod
+    def album_input_to_row(input: AlbumInput) -> dict:
         if not all([input.title, input.artist, input.genre, input.created_at]):
             raise ValueError("Missing required album fields")
-        return AlbumModel(
-            title=input.title,
-            artist=input.artist,
-            genre=input.genre,
-            description=input.description,
-            cover_image_url=input.cover_image_url,
-            created_at=input.created_at,
-            updated_at=input.updated_at
-        )
\ No newline at end of file
+        return {
+            "title": input.title,
+            "artist": input.artist,
+            "genre": input.genre,
+            "description": input.description,
+            "cover_image_url": input.cover_image_url,
+            "created_at": input.created_at,
+            "updated_at": input.updated_at
+        }
+
+    @staticmethod
+    def album_input_to_db_model(input: AlbumInput) -> AlbumModel:
+        return AlbumModel(**ModelConverter.album_input_to_row(input))
@@ -1,9 +1,29 @@
-from fastapi import FastAPI
-from backend.auth_service.routers import router
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from backend.auth_service.routers import router, auth_service
+from backend.auth_service.jwt_utils import JWKS
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open the pooled user service client, the credentials cache and the revocation list
+    once per process and close them on shutdown.
+    """
+    await auth_service.user_client.start()
+    if auth_service.cache is not None:
+        await auth_service.cache.start()
+    await auth_service.revocations.start()
+    yield
+    await auth_service.revocations.close()
+    if auth_service.cache is not None:
+        await auth_service.cache.close()
+    await auth_service.user_client.close()
+
 app = FastAPI(
     title="Auth Service",
     description="Authentication service for MusicPlayer",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.include_router(router, prefix="/auth")
@@ -11,3 +31,12 @@ app.include_router(router, prefix="/auth")
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/.well-known/jwks.json")
+def jwks(response: Response):
+    """
+    Public keys that verify the access tokens issued by this service.
+    Empty when tokens are signed with a shared HS256 secret, which is never published.
+    """
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return JWKS
@@ -1,64 +1,188 @@
-from backend.auth_service.security_utils import password_manager
+from backend.auth_service.security_utils import password_manager, password_pool
 from backend.auth_service.model.auth_info_model import AuthInfoModel
-from backend.auth_service.model.auth_models import LoginResponse, LoginRequest
-from backend.auth_service.jwt_utils import create_access_token
+from backend.auth_service.model.auth_models import LoginResponse, LoginRequest, LogoutResponse
+from backend.auth_service.jwt_utils import create_access_token, verify_token
 from backend.auth_service.model.jwt_payload import JWTPayload
-from backend.auth_service.exceptions.auth_exceptions import AuthenticationError, UserNotFoundError
-import requests
+from backend.auth_service.exceptions.auth_exceptions import AuthenticationError, UserNotFoundError, UserServiceUnavailableError
+from backend.auth_service.user_service_client import UserServiceClient
+from backend.common.auth.exceptions import InvalidTokenError
+from backend.common.auth.revocation import RevocationList
+from backend.common.cache.cache_backend import CacheBackend
+from backend.common.cache.keys import credentials_key
+from backend.common.cache.factory import SHARED_CACHE_BACKENDS, cache_from_env
+from typing import Optional, Tuple
+import json
+import os
 import time
+import uuid
+from dotenv import load_dotenv
+load_dotenv()
+
+CREDENTIALS_TTL_SECONDS = float(os.getenv("CREDENTIALS_TTL_SECONDS", "30"))
+CREDENTIALS_NEGATIVE_TTL_SECONDS = float(os.getenv("CREDENTIALS_NEGATIVE_TTL_SECONDS", "5"))
+ACCESS_TOKEN_TTL_SECONDS = int(os.getenv("ACCESS_TOKEN_TTL_SECONDS", "3600"))
+REFRESH_TOKEN_TTL_SECONDS = int(os.getenv("REFRESH_TOKEN_TTL_SECONDS", str(14 * 24 * 3600)))
+
+def credentials_cache_from_env() -> Optional[CacheBackend]:
+    """
+    The credentials cache, only when CACHE_BACKEND is shared with the user service.
+    The user service drops an entry when a password changes or a user is deleted;
+    a per-process memory cache never hears about it and would keep accepting the
+    old password for CREDENTIALS_TTL_SECONDS, so logins then go uncached instead.
+    """
+    backend = os.getenv("CACHE_BACKEND", "memory").lower()
+    if backend not in SHARED_CACHE_BACKENDS:
+        if backend != "none":
+            print(f"Credentials cache disabled: CACHE_BACKEND={backend} does not receive the user service's invalidations")
+        return None
+    return cache_from_env()
 
 class AuthService:
-    def __init__(self, user_service_url: str):
-        self.user_service_url = user_service_url
+    def __init__(
+        self,
+        user_client: UserServiceClient,
+        cache: Optional[CacheBackend] = None,
+        revocations: Optional[RevocationList] = None
+    ):
+        self.user_client = user_client
+        self.cache = cache
+        self.revocations = revocations if revocations is not None else RevocationList()
+
+    async def _lookup_credentials(self, email: str, refresh: bool = False) -> Tuple[Optional[dict], bool]:
+        """
+        Credentials by email, cached briefly: known emails for CREDENTIALS_TTL_SECONDS,
+        unknown ones for CREDENTIALS_NEGATIVE_TTL_SECONDS.
+        :return: The credentials (None for an unknown email) and whether they came from the cache.
+        """
+        key = credentials_key(email)
+        if self.cache is not None and not refresh:
+            hit = await self.cache.get(key)
+            if hit is not None:
+                return json.loads(hit), True
+        user = await self.get_user_by_email(email)
+        if self.cache is not None:
+            ttl = CREDENTIALS_TTL_SECONDS if user else CREDENTIALS_NEGATIVE_TTL_SECONDS
+            await self.cache.set(key, json.dumps(user), ttl)
+        return user, False
 
-    def login(self, login_request: LoginRequest) -> LoginResponse:
+    async def _check_password(self, password: str, user: dict) -> bool:
+        # bcrypt runs on the password pool, not the event loop
+        return await password_pool.run(self.verify_password, password, user['password_hash'])
+
+    async def login(self, login_request: LoginRequest) -> LoginResponse:
         """Login user and return JWT token."""
-        user = self.get_user_by_email(login_request.email)
+        user, cached = await self._lookup_credentials(login_request.email)
         if not user:
             raise AuthenticationError("Invalid credentials")
+
+        if not await self._check_password(login_request.password, user):
+            if not cached:
+                raise AuthenticationError("Invalid credentials")
+            # The cached hash may predate a password change: check against the stored one
+            fresh, _ = await self._lookup_credentials(login_request.email, refresh=True)
+            if not fresh or fresh['password_hash'] == user['password_hash'] \
+                    or not await self._check_password(login_request.password, fresh):
+                raise AuthenticationError("Invalid credentials")
+            user = fresh
+
+        if password_manager.needs_rehash(user['password_hash']):
+            await self.rehash_password(user['user_id'], login_request.password)
+            if self.cache is not None:
+                await self.cache.delete(credentials_key(login_request.email))
             
-        if not self.verify_password(login_request.password, user['password_hash']):
-            raise AuthenticationError("Invalid credentials")
-            
-        token = self.generate_token(AuthInfoModel(**user))
-        if not token:
+        return self.issue_tokens(AuthInfoModel(**user))
+
+    def issue_tokens(self, user: AuthInfoModel) -> LoginResponse:
+        """An access token and a refresh token for the user."""
+        token = self.generate_token(user)
+        refresh_token = self.generate_token(user, typ="refresh")
+        if not token or not refresh_token:
             raise Exception("Failed to generate authentication token")
-            
-        return LoginResponse(auth_token=token, user_id=user['user_id'])
-        
+
+        return LoginResponse(auth_token=token, refresh_token=refresh_token, user_id=user.user_id, role=user.role)
+
+    async def _verified_refresh_claims(self, refresh_token: str) -> dict:
+        try:
+            claims = verify_token(refresh_token)
+        except InvalidTokenError:
+            raise AuthenticationError("Invalid refresh token")
+        if claims.get("typ") != "refresh" or not claims.get("jti"):
+            raise AuthenticationError("Invalid refresh token")
+        if await self.revocations.is_revoked_async(claims["jti"]):
+            raise AuthenticationError("Refresh token has been revoked")
+        return claims
+
+    async def refresh(self, refresh_token: str) -> LoginResponse:
+        """
+        Exchange a refresh token for new tokens without checking the password.
+        The user is looked up again, so a deleted user cannot refresh and the new
+        tokens carry the user's current role rather than the one in the old token.
+        Refresh tokens are rotated: the one presented is revoked atomically, so
+        each works once, even when presented twice concurrently.
+        """
+        claims = await self._verified_refresh_claims(refresh_token)
+        user = await self.get_user_by_id(int(claims["sub"]))
+        if not user:
+            raise AuthenticationError("User no longer exists")
+        if not await self.revocations.revoke_once(claims["jti"], claims["exp"]):
+            raise AuthenticationError("Refresh token has been revoked")
+        return self.issue_tokens(AuthInfoModel(**user))
+
+    async def logout(self, refresh_token: str, access_token: Optional[str] = None) -> LogoutResponse:
+        """Revoke the refresh token and, when given, the access token issued with it."""
+        claims = await self._verified_refresh_claims(refresh_token)
+        await self.revocations.revoke(claims["jti"], claims["exp"])
+        if access_token:
+            try:
+                access_claims = verify_token(access_token)
+            except InvalidTokenError:
+                access_claims = {}
+            if access_claims.get("jti") and access_claims.get("sub") == claims["sub"]:
+                await self.revocations.revoke(access_claims["jti"], access_claims["exp"])
+        return LogoutResponse(message="Logged out")
+
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         return password_manager.verify_password(plain_password, hashed_password)
 
-    def get_user_by_email(self, email: str):
-        """Fetch user details by email from the user service."""
+    async def rehash_password(self, user_id: int, plain_password: str) -> None:
+        """
+        Re-hash a password stored with an outdated bcrypt cost and save it in the user service.
+        A failure only means the hash is upgraded at a later login.
+        """
+        new_hash = await password_pool.run(password_manager.hash_password, plain_password)
         try:
-            print(f'Sending request to user service at {self.user_service_url}/users/email/{email}')
-            response = requests.get(f"{self.user_service_url}/users/email/{email}")
-            if response.status_code == 404:
-                return None  # User not found - let login method handle this
-            elif response.status_code == 200:
-                return response.json()
-            else:
-                raise Exception(f"User service returned status {response.status_code}")
-        except requests.RequestException as e:
-            raise Exception(f"Failed to connect to user service: {e}")
-        except Exception as e:
-            raise Exception(f"Error fetching user by email: {e}")
+            if not await self.user_client.update_password_hash(user_id, new_hash):
+                print(f"Password rehash for user {user_id} was rejected by the user service")
+        except UserServiceUnavailableError as e:
+            print(f"Failed to store rehashed password for user {user_id}: {e}")
+
+    async def get_user_by_email(self, email: str):
+        """Fetch user details by email from the user service. :return: None when the user does not exist."""
+        return await self.user_client.get_auth_info(email)
+
+    async def get_user_by_id(self, user_id: int):
+        """Fetch user details by id from the user service. :return: None when the user does not exist."""
+        # Only used by the public lookup, which needs a bearer token when there is no internal token
+        access_token = self.generate_token(AuthInfoModel(user_id=user_id, password_hash=""))
+        return await self.user_client.get_auth_info_by_id(user_id, access_token)
 
-    def generate_token(self, user: AuthInfoModel) -> str:
+    def generate_token(self, user: AuthInfoModel, typ: str = "access") -> str:
         """Generate a JWT token for the user."""
         try:
-            payload = self.generate_jwt_claim(user)
+            payload = self.generate_jwt_claim(user, typ)
             return create_access_token(payload)
         except Exception as e:
             print(f"Error generating token: {e}")
             return None
 
-    def generate_jwt_claim(self, user: AuthInfoModel) -> JWTPayload:
+    def generate_jwt_claim(self, user: AuthInfoModel, typ: str = "access") -> JWTPayload:
         """Generate JWT claims from the user model."""
+        ttl = REFRESH_TOKEN_TTL_SECONDS if typ == "refresh" else ACCESS_TOKEN_TTL_SECONDS
         return JWTPayload(
             sub=str(user.user_id),
-            exp=int(time.time()) + 3600,  # Token valid for 1 hour
+            exp=int(time.time()) + ttl,
             iat=int(time.time()),  # Issued at time
-            role=user.role  # Default for now, can be extended later
+            role=user.role,  # Default for now, can be extended later
+            jti=uuid.uuid4().hex,
+            typ=typ
         )
\ No newline at end of file
@@ -1,29 +1,88 @@
 # Functions for creating and verifying JWT tokens
 
+import hashlib
 import os
 from dotenv import load_dotenv
-from jose import jwt
+from jose import jwk, jwt
 from backend.auth_service.model.jwt_payload import JWTPayload
+from backend.common.auth.exceptions import InvalidTokenError
 load_dotenv()
 
 # Get JWT configuration from environment variables
-SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-super-secret-key")  
+SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-super-secret-key")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 
+def is_asymmetric(algorithm: str) -> bool:
+    """RS*/ES* tokens are signed with a private key and verified with the published public key."""
+    return not algorithm.startswith("HS")
+
+def _read_pem(value_var: str, file_var: str) -> str:
+    value = os.getenv(value_var)
+    if value:
+        # Allow single-line PEMs in .env files
+        return value.replace("\\n", "\n")
+    path = os.getenv(file_var)
+    if not path:
+        raise ValueError(f"{value_var} or {file_var} must be set when JWT_ALGORITHM is {ALGORITHM}")
+    with open(path) as pem:
+        return pem.read()
+
+def public_jwk(public_key, algorithm: str, kid: str = None) -> dict:
+    """The JWK of a public key as published in the JWKS document."""
+    key = public_key.to_dict()
+    key.update({"alg": algorithm, "use": "sig"})
+    key["kid"] = kid or hashlib.sha256(
+        "".join(str(key[name]) for name in sorted(key) if name not in ("alg", "use")).encode("utf-8")
+    ).hexdigest()[:16]
+    return key
+
+def _load_keys():
+    """
+    Signing key, its kid and the published key set.
+    Keys retired by a rotation stay in the key set (JWT_RETIRED_PUBLIC_KEY_FILES)
+    until every token they signed has expired.
+    """
+    if not is_asymmetric(ALGORITHM):
+        return SECRET_KEY, None, {"keys": []}
+    private_key = jwk.construct(_read_pem("JWT_PRIVATE_KEY", "JWT_PRIVATE_KEY_FILE"), ALGORITHM)
+    current = public_jwk(private_key.public_key(), ALGORITHM, os.getenv("JWT_KEY_ID"))
+    keys = [current]
+    for path in filter(None, os.getenv("JWT_RETIRED_PUBLIC_KEY_FILES", "").split(",")):
+        with open(path.strip()) as pem:
+            keys.append(public_jwk(jwk.construct(pem.read(), ALGORITHM).public_key(), ALGORITHM))
+    return private_key, current["kid"], {"keys": keys}
+
+def _verification_keys(key_set: dict) -> dict:
+    """Public keys by kid: the current key and the retired ones whose tokens are still honoured."""
+    return {key["kid"]: jwk.construct(key, ALGORITHM) for key in key_set["keys"]}
+
+SIGNING_KEY, KEY_ID, JWKS = _load_keys()
+VERIFICATION_KEYS = _verification_keys(JWKS)
+
 def create_access_token(payload: JWTPayload) -> str:
     """
     Creates a JWT token from the payload.
     """
-    # Convert Pydantic model to dictionary for JWT encoding
-    payload_dict = payload.model_dump()
-    return jwt.encode(payload_dict, SECRET_KEY, algorithm=ALGORITHM)
+    # Convert Pydantic model to dictionary for JWT encoding; unset claims are left out (jose rejects a null jti)
+    payload_dict = payload.model_dump(exclude_none=True)
+    headers = {"kid": KEY_ID} if KEY_ID else None
+    return jwt.encode(payload_dict, SIGNING_KEY, algorithm=ALGORITHM, headers=headers)
 
-def verify_access_token(token: str) -> dict:
+def verify_token(token: str) -> dict:
     """
-    Verifies the JWT token and returns the payload.
-    Raises an exception if verification fails.
+    Verifies a token issued by this service, access or refresh, and returns the payload.
+    Asymmetric tokens are checked against the key named by their kid, so tokens signed
+    before a rotation stay valid while their key is listed in JWT_RETIRED_PUBLIC_KEY_FILES.
+    Raises InvalidTokenError if verification fails.
     """
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        key = SECRET_KEY
+        if KEY_ID:
+            # A token without a kid predates kids and was signed with the current key
+            kid = jwt.get_unverified_header(token).get("kid") or KEY_ID
+            key = VERIFICATION_KEYS.get(kid)
+            if key is None:
+                raise InvalidTokenError(f"Token verification failed: unknown signing key '{kid}'")
+        return jwt.decode(token, key, algorithms=[ALGORITHM])
     except jwt.JWTError as e:
-        raise Exception(f"Token verification failed: {str(e)}")
\ No newline at end of file
+        raise InvalidTokenError(f"Token verification failed: {str(e)}")
@@ -8,8 +8,12 @@ class LoginRequest(BaseModel):
 
 class LoginResponse(BaseModel):
     auth_token: str = Field(..., description="JWT token for authenticated user")
+    refresh_token: Optional[str] = Field(None, description="Long-lived token exchanged at /auth/refresh for a new auth_token")
     user_id: int = Field(..., description="ID of the authenticated user")
     role: Optional[str] = Field("user", description="Role of the authenticated user (e.g., admin, user)")
 
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(..., description="Refresh token returned by login or a previous refresh")
+
 class LogoutResponse(BaseModel):
     message: str = Field(..., description="Message indicating successful logout")
\ No newline at end of file
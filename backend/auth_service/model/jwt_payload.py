@@ -5,4 +5,6 @@ class JWTPayload(BaseModel):
     sub: str                # User ID
     exp: int                # Expiry (timestamp)
     iat: Optional[int]      # Issued at
-    role: Optional[str]     # Custom claim (e.g., user role)3
\ No newline at end of file
+    role: Optional[str]     # Custom claim (e.g., user role)
+    jti: Optional[str] = None       # Token ID, what a logout revokes
+    typ: Optional[str] = "access"   # "access" for API calls, "refresh" for /auth/refresh only3
\ No newline at end of file
@@ -1,14 +1,19 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
 from pydantic import BaseModel
-from backend.auth_service.auth_service import AuthService
-from backend.auth_service.model.auth_models import LoginResponse, LoginRequest
-from backend.auth_service.exceptions.auth_exceptions import AuthenticationError, UserNotFoundError
-import os
-from dotenv import load_dotenv
-load_dotenv()  # Load environment variables from .env file
+from backend.auth_service.auth_service import AuthService, credentials_cache_from_env
+from backend.auth_service.model.auth_models import LoginResponse, LoginRequest, LogoutResponse, RefreshRequest
+from backend.auth_service.exceptions.auth_exceptions import AuthenticationError, UserNotFoundError, UserServiceUnavailableError
+from backend.auth_service.user_service_client import user_service_client_from_env
+from backend.common.auth.exceptions import PasswordPoolBusyError
+from backend.common.auth.revocation import revocation_list_from_env
 
 router = APIRouter()
-auth_service = AuthService(user_service_url=os.getenv("USER_SERVICE_URL", "http://localhost:8000"))
+auth_service = AuthService(
+    user_client=user_service_client_from_env(),
+    cache=credentials_cache_from_env(),
+    revocations=revocation_list_from_env()
+)
 
 @router.post("/login", response_model=LoginResponse)
 async def login(request: LoginRequest):
@@ -17,12 +22,44 @@ async def login(request: LoginRequest):
     If successful, returns a JWT and expiry metadata.
     """
     try:
-        response = auth_service.login(request)
+        response = await auth_service.login(request)
         return response
+    except UserServiceUnavailableError:
+        raise HTTPException(status_code=503, detail="Authentication service temporarily unavailable", headers={"Retry-After": "1"})
+    except PasswordPoolBusyError:
+        raise HTTPException(status_code=503, detail="Too many logins in progress, retry shortly", headers={"Retry-After": "1"})
     except AuthenticationError:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     except UserNotFoundError:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     except Exception as e:
         print(f"Unexpected error during login: {e}")
-        raise HTTPException(status_code=500, detail="Authentication service temporarily unavailable")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Authentication service temporarily unavailable")
+
+@router.post("/refresh", response_model=LoginResponse)
+async def refresh(request: RefreshRequest):
+    """
+    Exchanges a refresh token for a new access token and refresh token,
+    without a password check. The user is looked up again in the user service.
+    The refresh token presented is revoked and cannot be used again.
+    """
+    try:
+        return await auth_service.refresh(request.refresh_token)
+    except AuthenticationError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    except UserServiceUnavailableError:
+        raise HTTPException(status_code=503, detail="Authentication service temporarily unavailable", headers={"Retry-After": "1"})
+    except Exception as e:
+        print(f"Unexpected error during refresh: {e}")
+        raise HTTPException(status_code=500, detail="Authentication service temporarily unavailable")
+
+@router.post("/logout", response_model=LogoutResponse)
+async def logout(request: RefreshRequest, authorization: Optional[str] = Header(None)):
+    """
+    Revokes the refresh token, and the access token sent as the bearer token if any.
+    """
+    access_token = authorization[7:] if authorization and authorization.startswith("Bearer ") else None
+    try:
+        return await auth_service.logout(request.refresh_token, access_token)
+    except AuthenticationError as e:
+        raise HTTPException(status_code=401, detail=str(e))
@@ -1,10 +1,10 @@
 # utils/security.py
-from passlib.context import CryptContext
 from backend.auth_service.exceptions.auth_exceptions import AuthenticationError
+from backend.common.auth.passwords import bcrypt_context, password_pool_from_env
 
 class PasswordManager:
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.pwd_context = bcrypt_context()
 
     def hash_password(self, password: str) -> str:
         """Hash a plain text password."""
@@ -16,9 +16,19 @@ class PasswordManager:
             raise AuthenticationError("Password verification failed: empty password or hash")
         return self.pwd_context.verify(plain_password, hashed_password)
 
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Whether the hash uses a different cost than BCRYPT_ROUNDS. Only parses the hash."""
+        try:
+            return self.pwd_context.needs_update(hashed_password)
+        except ValueError:
+            return False
+
 # Create a singleton instance for convenience
 password_manager = PasswordManager()
 
+# bcrypt calls from async code run here so they never block the event loop
+password_pool = password_pool_from_env()
+
 # Legacy function wrappers for backward compatibility
 def hash_password(password: str) -> str:
     return password_manager.hash_password(password)
@@ -1,15 +1,26 @@
 """
 Auth Service API Tests
 
-Tests only the /auth/login endpoint functionality.
+Tests the /auth/login and /.well-known/jwks.json endpoints.
 """
 
+import asyncio
 import pytest
+from types import SimpleNamespace
 from unittest.mock import patch
 from fastapi.testclient import TestClient
+from jose import jwt
 
+from backend.auth_service import jwt_utils
 from backend.auth_service.app import app
 from backend.auth_service.routers import auth_service
+from backend.auth_service.auth_service import AuthService, credentials_cache_from_env
+from backend.auth_service.exceptions.auth_exceptions import AuthenticationError, UserServiceUnavailableError
+from backend.auth_service.model.auth_info_model import AuthInfoModel
+from backend.common.auth.exceptions import InvalidTokenError
+from backend.common.cache.memory_cache import InMemoryCache
+from backend.user_service.services.async_user_alchemy_service import AsyncUserAlchemyService
+from backend.auth_service.security_utils import password_manager
 
 
 # Mock user data - just what we need for login testing
@@ -30,6 +41,11 @@ def mock_get_user_by_email(email: str):
     return MOCK_USER_RESPONSES.get(email.lower())
 
 
+def mock_get_user_by_id(user_id: int):
+    """Mock the user service lookup made on refresh."""
+    return next((user for user in MOCK_USER_RESPONSES.values() if user["user_id"] == user_id), None)
+
+
 def mock_verify_password(plain_password: str, hashed_password: str) -> bool:
     """Mock password verification for testing."""
     # Simple mock - in real tests you'd use actual hashing
@@ -44,6 +60,7 @@ def mock_verify_password(plain_password: str, hashed_password: str) -> bool:
 def test_client():
     """Create test client with mocked dependencies."""
     with patch.object(auth_service, 'get_user_by_email', side_effect=mock_get_user_by_email), \
+         patch.object(auth_service, 'get_user_by_id', side_effect=mock_get_user_by_id), \
          patch('backend.auth_service.auth_service.password_manager.verify_password', side_effect=mock_verify_password):
         yield TestClient(app)
 
@@ -110,3 +127,200 @@ def test_admin_user_login(test_client):
 if __name__ == "__main__":
     print("🔐 Auth Service Login Tests")
     print("Run with: pytest backend/auth_service/tests/test_auth_api.py -v")
+
+
+def test_login_rehashes_password_with_outdated_cost(test_client):
+    """Test a successful login stores a new hash when the bcrypt cost changed."""
+    with patch('backend.auth_service.auth_service.password_manager.needs_rehash', return_value=True), \
+         patch.object(auth_service.user_client, 'update_password_hash', return_value=True) as update:
+        response = test_client.post("/auth/login", json={
+            "email": "john.doe@example.com",
+            "password": "password123"
+        })
+
+    assert response.status_code == 200
+    user_id, new_hash = update.call_args.args
+    assert user_id == 1
+    assert password_manager.pwd_context.verify("password123", new_hash)
+
+
+def test_jwks_is_empty_for_shared_secret_tokens(test_client):
+    """Test the JWKS endpoint never publishes the HS256 secret."""
+    response = test_client.get("/.well-known/jwks.json")
+
+    assert response.status_code == 200
+    assert response.json() == {"keys": []}
+
+
+def test_login_serves_credentials_from_cache(test_client):
+    """Test repeated logins reuse cached credentials, and a changed password is picked up."""
+    with patch.object(auth_service, "cache", InMemoryCache()):
+        login = {"email": "admin@example.com", "password": "admin123"}
+        assert test_client.post("/auth/login", json=login).status_code == 200
+        assert test_client.post("/auth/login", json=login).status_code == 200
+        assert auth_service.get_user_by_email.call_count == 1
+
+        changed = {"user_id": 2, "password_hash": "$2b$12$test.hash.for.password123"}
+        with patch.dict(MOCK_USER_RESPONSES, {"admin@example.com": changed}):
+            response = test_client.post("/auth/login", json={"email": "admin@example.com", "password": "password123"})
+        assert response.status_code == 200
+        assert auth_service.get_user_by_email.call_count == 2
+
+
+def test_credentials_cache_requires_a_shared_backend(monkeypatch):
+    """Test a per-process cache, which never sees the user service's invalidations, leaves credentials uncached."""
+    for backend in ("memory", "none"):
+        monkeypatch.setenv("CACHE_BACKEND", backend)
+        assert credentials_cache_from_env() is None
+    monkeypatch.setenv("CACHE_BACKEND", "tiered")
+    assert credentials_cache_from_env() is not None
+
+
+def test_user_service_invalidation_reaches_auth_service_cache():
+    """Test deleting a user in the user service evicts the auth service's cached credentials in another process."""
+    fakeredis = pytest.importorskip("fakeredis")
+    from backend.common.cache.redis_cache import RedisCache
+    from backend.common.cache.tiered_cache import TieredCache
+    users = {"john.doe@example.com": {"user_id": 1, "password_hash": "hash", "role": "user"}}
+
+    class UserClient:
+        async def get_auth_info(self, email):
+            return users.get(email)
+
+    class UserRepo:
+        async def get_user(self, user_id):
+            return SimpleNamespace(email="john.doe@example.com")
+
+        async def delete_user(self, user_id):
+            return users.pop("john.doe@example.com", None) is not None
+
+    async def scenario():
+        server = fakeredis.FakeServer()
+
+        def tiered():
+            return TieredCache(InMemoryCache(), RedisCache(fakeredis.FakeAsyncRedis(server=server, decode_responses=True)))
+
+        auth_cache, user_cache = tiered(), tiered()
+        for cache in (auth_cache, user_cache):
+            await cache.start()
+            await cache.wait_until_subscribed()
+        try:
+            service = AuthService(user_client=UserClient(), cache=auth_cache)
+            assert (await service._lookup_credentials("john.doe@example.com"))[1] is False
+            assert (await service._lookup_credentials("john.doe@example.com"))[1] is True
+
+            await AsyncUserAlchemyService(UserRepo(), cache=user_cache).remove_user(1)
+            for _ in range(300):
+                if auth_cache.invalidations_received:
+                    break
+                await asyncio.sleep(0.01)
+            # Only the published invalidation could have emptied the auth service's local tier
+            assert await service._lookup_credentials("john.doe@example.com") == (None, False)
+        finally:
+            await auth_cache.close()
+            await user_cache.close()
+
+    asyncio.run(scenario())
+
+
+def test_refresh_token_rotation_and_logout(test_client):
+    """Test a refresh token yields new tokens once, is not an access token, and logout revokes it."""
+    login = test_client.post("/auth/login", json={"email": "john.doe@example.com", "password": "password123"}).json()
+    refresh_token = login["refresh_token"]
+
+    refreshed = test_client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["user_id"] == 1
+    assert refreshed.json()["refresh_token"] != refresh_token
+    # Rotated: the old refresh token cannot be used again, and access tokens never refresh
+    assert test_client.post("/auth/refresh", json={"refresh_token": refresh_token}).status_code == 401
+    assert test_client.post("/auth/refresh", json={"refresh_token": login["auth_token"]}).status_code == 401
+
+    latest = refreshed.json()
+    response = test_client.post(
+        "/auth/logout",
+        json={"refresh_token": latest["refresh_token"]},
+        headers={"Authorization": f"Bearer {latest['auth_token']}"}
+    )
+    assert response.status_code == 200
+    assert test_client.post("/auth/refresh", json={"refresh_token": latest["refresh_token"]}).status_code == 401
+    access_jti = jwt.get_unverified_claims(latest["auth_token"])["jti"]
+    assert auth_service.revocations.is_revoked(access_jti)
+
+
+def test_refresh_looks_up_the_user_again(test_client):
+    """Test a refresh re-reads the user: a deleted user is refused, a changed role is picked up."""
+    login = test_client.post("/auth/login", json={"email": "john.doe@example.com", "password": "password123"}).json()
+    promoted = {**MOCK_USER_RESPONSES["john.doe@example.com"], "role": "admin"}
+    with patch.object(auth_service, 'get_user_by_id', return_value=promoted):
+        refreshed = test_client.post("/auth/refresh", json={"refresh_token": login["refresh_token"]})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["role"] == "admin"
+
+    with patch.object(auth_service, 'get_user_by_id', return_value=None):
+        response = test_client.post("/auth/refresh", json={"refresh_token": refreshed.json()["refresh_token"]})
+    assert response.status_code == 401
+    # The lookup comes first, so a refresh refused for it does not use up the token
+    with patch.object(auth_service, 'get_user_by_id', side_effect=UserServiceUnavailableError("down")):
+        response = test_client.post("/auth/refresh", json={"refresh_token": refreshed.json()["refresh_token"]})
+    assert response.status_code == 503
+    assert test_client.post("/auth/refresh", json={"refresh_token": refreshed.json()["refresh_token"]}).status_code == 200
+
+
+def test_concurrent_refreshes_redeem_a_token_once():
+    """Test the rotation is one check-and-set: two refreshes of one token racing yield one pair of tokens."""
+    fakeredis = pytest.importorskip("fakeredis")
+    from backend.common.auth.revocation import RevocationList
+    from backend.common.cache.redis_cache import RedisCache
+
+    class StubUserClient:
+        async def get_auth_info_by_id(self, user_id, access_token):
+            await asyncio.sleep(0)
+            return {"user_id": user_id, "password_hash": "", "role": "user"}
+
+    server = fakeredis.FakeServer()
+    replicas = [
+        AuthService(StubUserClient(), revocations=RevocationList(store=RedisCache(fakeredis.FakeAsyncRedis(server=server))))
+        for _ in range(2)
+    ]
+    local = AuthService(StubUserClient())
+    refresh_token = local.issue_tokens(AuthInfoModel(user_id=1, password_hash="", role="user")).refresh_token
+
+    async def race(services):
+        return await asyncio.gather(*(service.refresh(refresh_token) for service in services), return_exceptions=True)
+
+    # Two replicas sharing Redis, and two requests on one in-memory replica
+    for services in (replicas, [local, local]):
+        results = asyncio.run(race(services))
+        assert sum(isinstance(result, AuthenticationError) for result in results) == 1
+
+
+def test_tokens_signed_by_a_retired_key_still_verify(monkeypatch, tmp_path):
+    """Test verify_token picks the key by kid, so refresh tokens issued before a key rotation keep working."""
+    rsa = pytest.importorskip("rsa")
+    old_public, old_private = rsa.newkeys(1024)
+    _, new_private = rsa.newkeys(1024)
+    retired = tmp_path / "retired.pem"
+    retired.write_bytes(old_public.save_pkcs1())
+    monkeypatch.setattr(jwt_utils, "ALGORITHM", "RS256")
+
+    def use_keys(private_key, retired_files=""):
+        monkeypatch.setenv("JWT_PRIVATE_KEY", private_key.save_pkcs1().decode())
+        monkeypatch.setenv("JWT_RETIRED_PUBLIC_KEY_FILES", retired_files)
+        signing_key, key_id, key_set = jwt_utils._load_keys()
+        monkeypatch.setattr(jwt_utils, "SIGNING_KEY", signing_key)
+        monkeypatch.setattr(jwt_utils, "KEY_ID", key_id)
+        monkeypatch.setattr(jwt_utils, "VERIFICATION_KEYS", jwt_utils._verification_keys(key_set))
+
+    user = AuthInfoModel(user_id=1, password_hash="", role="user")
+    use_keys(old_private)
+    before_rotation = AuthService(None).issue_tokens(user).refresh_token
+    use_keys(new_private, str(retired))
+    after_rotation = AuthService(None).issue_tokens(user).refresh_token
+
+    assert jwt_utils.verify_token(before_rotation)["sub"] == "1"
+    assert jwt_utils.verify_token(after_rotation)["sub"] == "1"
+    assert jwt.get_unverified_header(before_rotation)["kid"] != jwt.get_unverified_header(after_rotation)["kid"]
+    use_keys(new_private)
+    with pytest.raises(InvalidTokenError, match="unknown signing key"):
+        jwt_utils.verify_token(before_rotation)
@@ -0,0 +1,208 @@
+"""
+User service client tests against an in-process httpx transport.
+"""
+
+import asyncio
+import httpx
+import pytest
+
+from backend.auth_service.user_service_client import UserServiceClient
+from backend.auth_service.exceptions.auth_exceptions import UserServiceUnavailableError
+from backend.common.web.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_client(handler, breaker=None) -> UserServiceClient:
+    return UserServiceClient(
+        "http://users",
+        retries=2,
+        backoff=0,
+        breaker=breaker,
+        transport=httpx.MockTransport(handler)
+    )
+
+
+def test_get_auth_info_retries_server_errors(monkeypatch):
+    """Test 5xx responses are retried and a 404 means no such user."""
+    monkeypatch.delenv("INTERNAL_SERVICE_TOKEN", raising=False)
+    statuses = [503, 502, 200]
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.raw_path.decode())
+        if request.url.path.endswith("ghost@example.com"):
+            return httpx.Response(404)
+        return httpx.Response(statuses.pop(0), json={"user_id": 1, "password_hash": "hash", "role": "user"})
+
+    async def scenario():
+        client = make_client(handler)
+        try:
+            assert (await client.get_auth_info("john.doe+music@example.com"))["user_id"] == 1
+            assert await client.get_auth_info("ghost@example.com") is None
+        finally:
+            await client.close()
+
+    asyncio.run(scenario())
+    assert paths[0] == "/users/email/john.doe%2Bmusic@example.com"
+    assert len(paths) == 4
+
+
+def test_get_auth_info_uses_internal_credentials_endpoint(monkeypatch):
+    """Test the slim internal endpoint is called, with the token, when one is configured."""
+    monkeypatch.setenv("INTERNAL_SERVICE_TOKEN", "internal-test-token")
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"user_id": 1, "password_hash": "hash", "role": "user"})
+
+    async def scenario():
+        client = make_client(handler)
+        try:
+            return await client.get_auth_info("john.doe+music@example.com")
+        finally:
+            await client.close()
+
+    assert asyncio.run(scenario())["password_hash"] == "hash"
+    assert requests[0].url.path == "/internal/users/credentials"
+    assert requests[0].url.params["email"] == "john.doe+music@example.com"
+    assert requests[0].headers["X-Internal-Token"] == "internal-test-token"
+
+
+def test_get_auth_info_by_id_falls_back_to_public_lookup(monkeypatch):
+    """Test without an internal token the user is fetched by id with the given access token."""
+    monkeypatch.delenv("INTERNAL_SERVICE_TOKEN", raising=False)
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.url.path == "/users/2":
+            return httpx.Response(404)
+        return httpx.Response(200, json={"id": 1, "username": "john", "email": "john.doe@example.com", "password_hash": "hash"})
+
+    async def scenario():
+        client = make_client(handler)
+        try:
+            return await client.get_auth_info_by_id(1, "access-token"), await client.get_auth_info_by_id(2, "access-token")
+        finally:
+            await client.close()
+
+    user, missing = asyncio.run(scenario())
+    assert user == {"user_id": 1, "password_hash": "hash"}
+    assert missing is None
+    assert requests[0].url.path == "/users/1"
+    assert requests[0].headers["Authorization"] == "Bearer access-token"
+
+
+def test_rejected_credentials_do_not_close_the_circuit(monkeypatch):
+    """Test a 403 from a wrong internal token is neither a success nor a failure for the circuit breaker."""
+    monkeypatch.setenv("INTERNAL_SERVICE_TOKEN", "wrong-token")
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+
+    async def scenario():
+        client = make_client(lambda request: httpx.Response(403))
+        try:
+            with pytest.raises(UserServiceUnavailableError, match="403"):
+                await client.get_auth_info_by_id(1, "access-token")
+        finally:
+            await client.close()
+
+    asyncio.run(scenario())
+    assert breaker.failures == 1
+    assert breaker.state == "half-open"
+
+
+def test_circuit_opens_after_repeated_failures():
+    """Test an unreachable user service opens the circuit and calls then fail fast."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("connection refused")
+
+    async def scenario():
+        client = make_client(handler, breaker)
+        for _ in range(2):
+            with pytest.raises(UserServiceUnavailableError):
+                await client.get_auth_info("john.doe@example.com")
+        assert breaker.state == "open"
+        with pytest.raises(UserServiceUnavailableError, match="circuit is open"):
+            await client.get_auth_info("john.doe@example.com")
+        assert len(calls) == 6
+
+        clock.now = 30
+        assert breaker.state == "half-open"
+        with pytest.raises(UserServiceUnavailableError):
+            await client.get_auth_info("john.doe@example.com")
+        # One trial of three attempts, then open again
+        assert len(calls) == 9
+        assert breaker.state == "open"
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_half_open_success_closes_the_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert not breaker.allow()
+    clock.now = 10
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_cancelled_half_open_trial_releases_the_circuit():
+    """Test a trial call cancelled mid-flight lets the next call be the trial instead of blocking the circuit."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+
+    async def handler(request):
+        await asyncio.sleep(3600)
+
+    async def scenario():
+        client = make_client(handler, breaker)
+        trial = asyncio.create_task(client.get_auth_info("john.doe@example.com"))
+        await asyncio.sleep(0.05)
+        assert not breaker.allow()
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        await client.close()
+
+    asyncio.run(scenario())
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+
+
+def test_unexpected_errors_count_as_failures():
+    """Test an exception other than a transport error is raised as is and still opens the circuit."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=FakeClock())
+
+    def handler(request):
+        raise ValueError("malformed response")
+
+    async def scenario():
+        client = make_client(handler, breaker)
+        with pytest.raises(ValueError):
+            await client.get_auth_info("john.doe@example.com")
+        await client.close()
+
+    asyncio.run(scenario())
+    assert breaker.state == "open"
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import random
+from typing import Optional
+from urllib.parse import quote
+import httpx
+from dotenv import load_dotenv
+from backend.auth_service.exceptions.auth_exceptions import UserServiceUnavailableError
+from backend.common.auth.internal import INTERNAL_TOKEN_HEADER
+from backend.common.web.circuit_breaker import CircuitBreaker
+load_dotenv()
+
+class UserServiceClient:
+    """
+    Async client for the user service endpoints the auth service needs.
+
+    One pooled httpx.AsyncClient is kept per process (opened by the app lifespan,
+    or on first use), so logins reuse keep-alive connections. Transport errors,
+    timeouts and 5xx responses are retried with full-jitter exponential backoff;
+    calls that still fail count towards a circuit breaker, and while it is open
+    calls fail fast with UserServiceUnavailableError instead of waiting on a
+    service that is down.
+    """
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 2.0,
+        retries: int = 2,
+        backoff: float = 0.1,
+        max_connections: int = 100,
+        breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_connections = max_connections
+        self.breaker = breaker or CircuitBreaker()
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                transport=self._transport,
+            )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        if not self.breaker.allow():
+            raise UserServiceUnavailableError("User service circuit is open")
+        try:
+            return await self._attempt(method, url, **kwargs)
+        finally:
+            # A cancelled call (client disconnect, outer timeout) records nothing, but must not hold the half-open trial
+            self.breaker.release()
+
+    async def _attempt(self, method: str, url: str, **kwargs) -> httpx.Response:
+        await self.start()
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self._client.request(method, url, **kwargs)
+                if response.status_code in (401, 403):
+                    # A rejected credential is a configuration problem, not a sign the service is healthy or down
+                    return response
+                if response.status_code < 500:
+                    self.breaker.record_success()
+                    return response
+                failure = UserServiceUnavailableError(f"User service returned status {response.status_code}")
+            except httpx.TransportError as e:
+                failure = UserServiceUnavailableError(f"Failed to reach user service: {e}")
+            except Exception:
+                # Not retried, but still a failed call to the dependency
+                self.breaker.record_failure()
+                raise
+            if attempt < self.retries:
+                await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+        self.breaker.record_failure()
+        raise failure
+
+    async def get_auth_info(self, email: str) -> Optional[dict]:
+        """
+        Fetch a user's id, password hash and role by email.
+        Uses the slim internal credentials endpoint when INTERNAL_SERVICE_TOKEN is set,
+        otherwise the public lookup by email.
+        :return: None when no user has that email.
+        """
+        token = os.getenv("INTERNAL_SERVICE_TOKEN")
+        if token:
+            response = await self._request(
+                "GET", "/internal/users/credentials", params={"email": email}, headers={INTERNAL_TOKEN_HEADER: token}
+            )
+        else:
+            response = await self._request("GET", f"/users/email/{quote(email, safe='@')}")
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise UserServiceUnavailableError(f"User service returned status {response.status_code}")
+        return response.json()
+
+    async def get_auth_info_by_id(self, user_id: int, access_token: str) -> Optional[dict]:
+        """
+        Fetch a user's id, password hash and role by id.
+        Uses the internal credentials endpoint when INTERNAL_SERVICE_TOKEN is set,
+        otherwise the public lookup by id, authenticated with an access token for that user.
+        :return: None when the user no longer exists.
+        """
+        token = os.getenv("INTERNAL_SERVICE_TOKEN")
+        if token:
+            response = await self._request(
+                "GET", f"/internal/users/{user_id}/credentials", headers={INTERNAL_TOKEN_HEADER: token}
+            )
+        else:
+            response = await self._request(
+                "GET", f"/users/{user_id}", headers={"Authorization": f"Bearer {access_token}"}
+            )
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise UserServiceUnavailableError(f"User service returned status {response.status_code}")
+        if token:
+            return response.json()
+        # The public user model has no role; USERS has no role column either, so the default role applies
+        user = response.json()
+        return {"user_id": user["id"], "password_hash": user["password_hash"]}
+
+    async def update_password_hash(self, user_id: int, password_hash: str) -> bool:
+        """Store a re-hashed password through the internal endpoint."""
+        response = await self._request(
+            "PUT",
+            f"/internal/users/{user_id}/password-hash",
+            json={"password_hash": password_hash},
+            headers={INTERNAL_TOKEN_HEADER: os.getenv("INTERNAL_SERVICE_TOKEN", "")},
+        )
+        return response.status_code == 200
+
+def user_service_client_from_env() -> UserServiceClient:
+    return UserServiceClient(
+        base_url=os.getenv("USER_SERVICE_URL", "http://localhost:8003"),
+        timeout=float(os.getenv("USER_SERVICE_TIMEOUT_SECONDS", "2")),
+        retries=int(os.getenv("USER_SERVICE_RETRIES", "2")),
+        backoff=float(os.getenv("USER_SERVICE_BACKOFF_SECONDS", "0.1")),
+        max_connections=int(os.getenv("USER_SERVICE_MAX_CONNECTIONS", "100")),
+        breaker=CircuitBreaker(
+            failure_threshold=int(os.getenv("USER_SERVICE_CIRCUIT_FAILURES", "5")),
+            reset_timeout=float(os.getenv("USER_SERVICE_CIRCUIT_RESET_SECONDS", "30")),
+        ),
+    )
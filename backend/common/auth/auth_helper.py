@@ -0,0 +1,46 @@
+from typing import Optional, FrozenSet
+from fastapi import Depends, Request, HTTPException
+from backend.common.auth.exceptions import InvalidTokenError
+from backend.common.auth.verifier import TokenVerifier, verifier_from_env
+
+class RoleGuard:
+    """
+    FastAPI dependency that authenticates the bearer token and checks its role.
+    One instance exists per role set, so FastAPI also resolves it once per request.
+    """
+    def __init__(self, verifier: TokenVerifier, roles: Optional[FrozenSet[str]] = None):
+        self.verifier = verifier
+        self.roles = roles
+
+    async def __call__(self, request: Request) -> dict:
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
+        try:
+            payload = await self.verifier.verify_async(auth_header[7:])
+        except InvalidTokenError as e:
+            raise HTTPException(status_code=401, detail=str(e))
+        if self.roles is not None and payload.get("role") not in self.roles:
+            raise HTTPException(status_code=403, detail="Insufficient permissions")
+        return payload
+
+class AuthHelper:
+    def __init__(self, verifier: TokenVerifier):
+        self.verifier = verifier
+        self._guards = {}
+
+    def _guard(self, roles: Optional[FrozenSet[str]]) -> RoleGuard:
+        guard = self._guards.get(roles)
+        if guard is None:
+            guard = self._guards[roles] = RoleGuard(self.verifier, roles)
+        return guard
+
+    def require_auth(self):
+        """Dependency returning the token claims of any authenticated user."""
+        return Depends(self._guard(None))
+
+    def require_role(self, *roles):
+        """Dependency returning the token claims of a user holding one of roles."""
+        return Depends(self._guard(frozenset(roles)))
+
+auth_helper = AuthHelper(verifier_from_env())
@@ -0,0 +1,15 @@
+class InvalidTokenError(Exception):
+    """Raised when a bearer token is malformed, expired or has a bad signature."""
+    pass
+
+class UnknownKeyError(InvalidTokenError):
+    """Raised when a token names a signing key that is not in the loaded key set."""
+    pass
+
+class RevokedTokenError(InvalidTokenError):
+    """Raised when a token was revoked, e.g. by a logout, before it expired."""
+    pass
+
+class PasswordPoolBusyError(Exception):
+    """Raised when password hashing is saturated and a call waited too long for a worker."""
+    pass
@@ -0,0 +1,19 @@
+import hmac
+import os
+from fastapi import Depends, Header, HTTPException
+from dotenv import load_dotenv
+load_dotenv()
+
+INTERNAL_TOKEN_HEADER = "X-Internal-Token"
+
+def require_internal_token():
+    """
+    Dependency for service-to-service endpoints.
+    The caller must send INTERNAL_SERVICE_TOKEN in the X-Internal-Token header;
+    the endpoints are closed when the variable is not set.
+    """
+    async def dependency(x_internal_token: str = Header(None)):
+        expected = os.getenv("INTERNAL_SERVICE_TOKEN")
+        if not expected or not x_internal_token or not hmac.compare_digest(x_internal_token, expected):
+            raise HTTPException(status_code=403, detail="Internal endpoint")
+    return Depends(dependency)
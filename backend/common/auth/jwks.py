@@ -0,0 +1,115 @@
+import asyncio
+import os
+import time
+from typing import Callable, Optional
+import httpx
+from dotenv import load_dotenv
+load_dotenv()
+
+class JWKSProvider:
+    """
+    Local copy of the auth service's JSON Web Key Set.
+
+    The set is fetched on start and then every refresh_interval seconds in the
+    background. A token signed by an unknown kid (a rotation that happened since
+    the last refresh) triggers an early refresh, but refreshes are at most
+    min_refresh_interval apart, so a flood of bogus kids costs one fetch.
+    On fetch errors the previous keys stay in use.
+    """
+    def __init__(
+        self,
+        url: str,
+        refresh_interval: float = 300.0,
+        min_refresh_interval: float = 30.0,
+        timeout: float = 2.0,
+        client: Optional[httpx.AsyncClient] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self.clock = clock
+        # Set by TokenVerifier so keys are prepared by its JWT backend once per fetch
+        self.construct: Callable[[dict], object] = lambda key: key
+        self._client = client
+        self._owns_client = client is None
+        self._keys = {}
+        self._lock = asyncio.Lock()
+        self._last_fetch: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.failures = 0
+
+    def get(self, kid: Optional[str]):
+        """The prepared key with this kid, or None."""
+        return self._keys.get(kid)
+
+    def kids(self) -> list:
+        return list(self._keys)
+
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Fetch the key set unless it was fetched less than min_refresh_interval ago.
+        :return: True when the keys were reloaded since this call was made.
+        """
+        reloaded_before = self.refreshes
+        async with self._lock:
+            if self.refreshes != reloaded_before:
+                # Another caller reloaded the keys while this one waited
+                return True
+            now = self.clock()
+            if not force and self._last_fetch is not None and now - self._last_fetch < self.min_refresh_interval:
+                return False
+            self._last_fetch = now
+            try:
+                if self._client is None:
+                    self._client = httpx.AsyncClient()
+                response = await self._client.get(self.url, timeout=self.timeout)
+                response.raise_for_status()
+                documents = response.json().get("keys", [])
+            except Exception as e:
+                self.failures += 1
+                print(f"Error fetching JWKS from {self.url}: {e}")
+                return False
+            keys = {}
+            for document in documents:
+                if document.get("use", "sig") != "sig":
+                    continue
+                try:
+                    keys[document.get("kid")] = self.construct(document)
+                except Exception as e:
+                    print(f"Skipping JWKS key {document.get('kid')}: {e}")
+            self._keys = keys
+            self.refreshes += 1
+            return True
+
+    async def start(self) -> None:
+        await self.refresh(force=True)
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_periodically())
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh(force=True)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+def jwks_provider_from_env() -> JWKSProvider:
+    return JWKSProvider(
+        url=os.getenv("JWT_JWKS_URL", "http://localhost:8000/.well-known/jwks.json"),
+        refresh_interval=float(os.getenv("JWKS_REFRESH_SECONDS", "300")),
+        min_refresh_interval=float(os.getenv("JWKS_MIN_REFRESH_SECONDS", "30")),
+        timeout=float(os.getenv("JWKS_TIMEOUT_SECONDS", "2")),
+    )
@@ -0,0 +1,84 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+from dotenv import load_dotenv
+from passlib.context import CryptContext
+from backend.common.auth.exceptions import PasswordPoolBusyError
+load_dotenv()
+
+T = TypeVar("T")
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+def bcrypt_context(rounds: Optional[int] = None) -> CryptContext:
+    """
+    bcrypt at exactly `rounds` (BCRYPT_ROUNDS by default).
+    Hashes of any other cost report needs_update, so they are rehashed at the next login.
+    """
+    rounds = rounds or BCRYPT_ROUNDS
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+class PasswordWorkPool:
+    """
+    Runs bcrypt hashing and verification off the event loop.
+
+    bcrypt releases the GIL, so a small thread pool keeps several cores busy
+    while the loop goes on serving requests. At most max_pending calls may be
+    running or queued; beyond that callers wait up to queue_timeout for a slot
+    and then get PasswordPoolBusyError, so a login spike is shed with 503s
+    instead of building an unbounded queue.
+    """
+    def __init__(self, max_workers: int = 4, max_pending: int = 64, queue_timeout: float = 5.0):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._loop = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.rejected = 0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # asyncio primitives belong to one loop; tests and reloads may run several in turn
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._slots = loop, asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Call fn(*args) on a worker thread once a slot is free."""
+        slots = self._semaphore()
+        try:
+            await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise PasswordPoolBusyError("Password hashing is saturated, retry shortly")
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            slots.release()
+
+    def stats(self) -> dict:
+        in_use = self.max_pending - self._slots._value if self._slots is not None else 0
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": in_use,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+def password_pool_from_env() -> PasswordWorkPool:
+    return PasswordWorkPool(
+        max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))),
+        max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64")),
+        queue_timeout=float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS", "5")),
+    )
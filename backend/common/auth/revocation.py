@@ -0,0 +1,201 @@
+import asyncio
+import heapq
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from backend.common.cache.cache_backend import CacheBackend
+from backend.common.cache.keys import revoked_token_key
+load_dotenv()
+
+class RevocationList:
+    """
+    IDs (jti) of tokens revoked before they expire, e.g. by a logout.
+
+    Lookups are a dict membership test. An entry is only kept until the token
+    it names would have expired anyway (a min-heap of expiries is popped on
+    each change), so the list never outgrows the set of live revoked tokens.
+
+    With a shared store, revocations are also written there, so a logout at
+    auth-service reaches every service. The local list stays the source of
+    truth: on a Redis store every process subscribes to a revocations channel,
+    loads the revocations already stored once subscribed, and from then on adds
+    each published one locally, so checks never leave the process. Only before
+    that first sync (a cold start) and while the listener is reconnecting is a
+    local miss looked up in the store.
+    """
+    def __init__(
+        self,
+        store: Optional[CacheBackend] = None,
+        clock: Callable[[], float] = time.time,
+        channel: str = "token-revocations",
+        retry_delay: float = 1.0
+    ):
+        self.store = store
+        self.clock = clock
+        self.retry_delay = retry_delay
+        self._revoked: Dict[str, float] = {}
+        self._expiries: List[Tuple[float, str]] = []
+        # Stores with a Redis client (RedisCache) also carry revocations over pub/sub
+        self._client = getattr(store, "client", None)
+        self.channel = f"{store.namespace}:{channel}" if self._client is not None else None
+        self._listener: Optional[asyncio.Task] = None
+        self._synced = asyncio.Event()
+        self._claim_lock = threading.Lock()
+
+    def _purge(self) -> None:
+        now = self.clock()
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, jti = heapq.heappop(self._expiries)
+            if self._revoked.get(jti) == expires_at:
+                del self._revoked[jti]
+
+    def _add(self, jti: str, expires_at: float) -> None:
+        self._purge()
+        if expires_at > self.clock() and jti not in self._revoked:
+            self._revoked[jti] = expires_at
+            heapq.heappush(self._expiries, (expires_at, jti))
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """Whether jti was revoked in this process (or seen revoked in the store)."""
+        if jti is None:
+            return False
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > self.clock()
+
+    async def is_revoked_async(self, jti: Optional[str]) -> bool:
+        """Like is_revoked, but until the local list is synced a local miss is checked against the shared store."""
+        if jti is None:
+            return False
+        if self.is_revoked(jti):
+            return True
+        if self.store is None or self._synced.is_set():
+            return False
+        hit = await self.store.get(revoked_token_key(jti))
+        if hit is None:
+            return False
+        self._add(jti, float(hit))
+        return True
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """Revoke jti until expires_at, the token's exp; later it is rejected as expired."""
+        self._add(jti, expires_at)
+        ttl = expires_at - self.clock()
+        if self.store is not None and ttl > 0:
+            await self.store.set(revoked_token_key(jti), str(expires_at), ttl)
+            await self._publish(jti, expires_at)
+
+    def _claim(self, jti: str, expires_at: float) -> bool:
+        """Locked local check-and-set: True for exactly one of the callers revoking jti."""
+        with self._claim_lock:
+            if self.is_revoked(jti):
+                return False
+            self._add(jti, expires_at)
+            return True
+
+    async def revoke_once(self, jti: str, expires_at: float) -> bool:
+        """
+        Revoke jti unless it already is: of concurrent calls for the same jti, in
+        this process or (through the store's SET NX) any other, exactly one returns
+        True. Rotating a refresh token with this lets it be redeemed once even when
+        it is presented twice at the same time.
+        """
+        ttl = expires_at - self.clock()
+        if self.store is not None and ttl > 0 and not await self.store.add(revoked_token_key(jti), str(expires_at), ttl):
+            # Revoked before, here or by another process
+            self._add(jti, expires_at)
+            return False
+        if not self._claim(jti, expires_at):
+            return False
+        if self.store is not None and ttl > 0:
+            await self._publish(jti, expires_at)
+        return True
+
+    def stats(self) -> dict:
+        return {"revoked": len(self._revoked), "shared": self.store is not None, "synced": self._synced.is_set()}
+
+    async def start(self) -> None:
+        if self.store is not None:
+            await self.store.start()
+        if self._client is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def wait_until_synced(self, timeout: float = 5.0) -> None:
+        await asyncio.wait_for(self._synced.wait(), timeout)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+            self._synced.clear()
+        if self.store is not None:
+            await self.store.close()
+
+    async def _publish(self, jti: str, expires_at: float) -> None:
+        if self._client is None:
+            return
+        try:
+            await self._client.publish(self.channel, json.dumps({"jti": jti, "exp": expires_at}))
+        except Exception as e:
+            # Stored all the same; listeners that miss it resync when they reconnect
+            print(f"Revocation publish failed for {jti}: {e}")
+
+    async def _load_stored(self) -> None:
+        """Copy every revocation in the store into the local list."""
+        prefix = f"{self.store.namespace}:{revoked_token_key('')}"
+        keys = [key async for key in self._client.scan_iter(match=f"{prefix}*", count=500)]
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            for key, value in zip(batch, await self._client.mget(batch)):
+                if value is not None:
+                    key = key.decode("utf-8") if isinstance(key, bytes) else key
+                    self._add(key[len(prefix):], float(value))
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            try:
+                # Subscribed before loading, so nothing revoked in between is missed
+                await pubsub.subscribe(self.channel)
+                await self._load_stored()
+                self._synced.set()
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message.get("type") == "message":
+                        revocation = json.loads(message["data"])
+                        self._add(revocation["jti"], float(revocation["exp"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Revocation listener error: {e}")
+                # Messages may be missed until resubscribed: fall back to store reads
+                self._synced.clear()
+                await asyncio.sleep(self.retry_delay)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+def revocation_list_from_env() -> RevocationList:
+    """
+    REVOCATION_BACKEND:
+      memory - revocations only apply in the process that made them
+      redis  - shared through REDIS_URL, so every service sees them
+    Defaults to redis when CACHE_BACKEND is redis or tiered, memory otherwise.
+    """
+    from backend.common.cache.factory import SHARED_CACHE_BACKENDS, shared_cache_from_env
+    shared = os.getenv("CACHE_BACKEND", "memory").lower() in SHARED_CACHE_BACKENDS
+    backend = os.getenv("REVOCATION_BACKEND", "redis" if shared else "memory").lower()
+    if backend == "memory":
+        print("Token revocation is local-only: a logged-out access token stays valid in other services until it expires")
+        return RevocationList()
+    if backend == "redis":
+        return RevocationList(store=shared_cache_from_env())
+    raise ValueError(f"Unknown REVOCATION_BACKEND '{backend}'")
@@ -0,0 +1,87 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+from dotenv import load_dotenv
+load_dotenv()
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of JWT payloads that already passed signature verification.
+
+    Entries are keyed by the SHA-256 digest of the token, so the raw bearer
+    token is never kept, and expire at the token's own `exp` or after max_ttl
+    seconds, whichever comes first. max_ttl bounds how long a token keeps
+    being accepted after the signing key changes. Only successful
+    verifications are cached; invalid tokens always go through decoding.
+    """
+    def __init__(self, max_entries: int = 10000, max_ttl: float = 300.0, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self.clock = clock
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()  # digest -> (expires_at, payload)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return a copy of the cached payload of token, or None when it must be verified."""
+        digest = self._digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, payload = entry
+        if expires_at <= self.clock():
+            del self._entries[digest]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return dict(payload)
+
+    def put(self, token: str, payload: dict) -> None:
+        """Remember the verified payload of token until its exp or max_ttl."""
+        if self.max_entries <= 0:
+            return
+        now = self.clock()
+        expires_at = now + self.max_ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        if expires_at <= now:
+            return
+        digest = self._digest(token)
+        self._entries[digest] = (expires_at, dict(payload))
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+def token_cache_from_env() -> VerifiedTokenCache:
+    """Build the verified-token cache; TOKEN_CACHE_MAX_ENTRIES=0 disables it."""
+    return VerifiedTokenCache(
+        max_entries=int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000")),
+        max_ttl=float(os.getenv("TOKEN_CACHE_MAX_TTL_SECONDS", "300")),
+    )
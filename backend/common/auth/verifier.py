@@ -0,0 +1,174 @@
+import os
+from typing import Optional
+from dotenv import load_dotenv
+from backend.common.auth.exceptions import InvalidTokenError, RevokedTokenError, UnknownKeyError
+from backend.common.auth.revocation import RevocationList, revocation_list_from_env
+from backend.common.auth.token_cache import VerifiedTokenCache, token_cache_from_env
+load_dotenv()
+
+class JoseBackend:
+    def __init__(self, algorithm: str):
+        from jose import jwk, jwt, JWTError
+        self._jwk, self._jwt, self._error = jwk, jwt, JWTError
+        self.algorithm = algorithm
+        self.algorithms = [algorithm]
+
+    def key_from_secret(self, secret_key: str):
+        # Parsed once; given a raw secret jose re-parses it as JSON and rebuilds the key on every decode
+        return self._jwk.construct(secret_key, self.algorithm)
+
+    def key_from_jwk(self, key: dict):
+        return self._jwk.construct(key, self.algorithm)
+
+    def unverified_kid(self, token: str) -> Optional[str]:
+        try:
+            return self._jwt.get_unverified_header(token).get("kid")
+        except self._error as e:
+            raise InvalidTokenError(f"Token verification failed: {str(e)}")
+
+    def decode(self, token: str, key) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=self.algorithms)
+        except self._error as e:
+            raise InvalidTokenError(f"Token verification failed: {str(e)}")
+
+class PyJWTBackend:
+    def __init__(self, algorithm: str):
+        # Imported lazily so PyJWT is only needed when JWT_BACKEND=pyjwt
+        import jwt
+        self._jwt = jwt
+        self.algorithm = algorithm
+        self.algorithms = [algorithm]
+
+    def key_from_secret(self, secret_key: str):
+        return secret_key
+
+    def key_from_jwk(self, key: dict):
+        return self._jwt.PyJWK(key, self.algorithm).key
+
+    def unverified_kid(self, token: str) -> Optional[str]:
+        try:
+            return self._jwt.get_unverified_header(token).get("kid")
+        except self._jwt.PyJWTError as e:
+            raise InvalidTokenError(f"Token verification failed: {str(e)}")
+
+    def decode(self, token: str, key) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=self.algorithms)
+        except self._jwt.PyJWTError as e:
+            raise InvalidTokenError(f"Token verification failed: {str(e)}")
+
+BACKENDS = {"jose": JoseBackend, "pyjwt": PyJWTBackend}
+
+class TokenVerifier:
+    """
+    Verifies access tokens for every service.
+
+    HS* tokens are checked against the shared secret. RS*/ES* tokens are checked
+    against the public key named by their `kid`, taken from a JWKSProvider that
+    keeps the auth service's key set locally, so no request calls the auth service.
+    Keys are prepared once; payloads of tokens that passed verification are
+    served from a VerifiedTokenCache until they expire.
+
+    Only access tokens are accepted: refresh tokens (typ "refresh") are for
+    auth-service alone. Tokens whose jti is in the RevocationList are rejected,
+    whether or not their payload is cached.
+    """
+    def __init__(
+        self,
+        secret_key: Optional[str] = None,
+        algorithm: str = "HS256",
+        cache: Optional[VerifiedTokenCache] = None,
+        backend: str = "jose",
+        key_set=None,
+        revocations: Optional[RevocationList] = None
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown JWT_BACKEND '{backend}'")
+        self.algorithm = algorithm
+        self.backend = BACKENDS[backend](algorithm)
+        self.cache = cache if cache is not None else VerifiedTokenCache()
+        self.key_set = key_set
+        self.revocations = revocations
+        if key_set is None:
+            if secret_key is None:
+                raise ValueError(f"A secret key or a JWKS key set is needed to verify {algorithm} tokens")
+            self._secret = self.backend.key_from_secret(secret_key)
+        else:
+            key_set.construct = self.backend.key_from_jwk
+
+    async def start(self) -> None:
+        """Load the key set and start refreshing it in the background."""
+        if self.key_set is not None:
+            await self.key_set.start()
+        if self.revocations is not None:
+            await self.revocations.start()
+
+    async def close(self) -> None:
+        if self.key_set is not None:
+            await self.key_set.close()
+        if self.revocations is not None:
+            await self.revocations.close()
+
+    def _key_for(self, token: str):
+        if self.key_set is None:
+            return self._secret
+        kid = self.backend.unverified_kid(token)
+        key = self.key_set.get(kid)
+        if key is None:
+            raise UnknownKeyError(f"Token verification failed: unknown signing key '{kid}'")
+        return key
+
+    def verify(self, token: str) -> dict:
+        """
+        Return the claims of token using the keys already loaded.
+        Raises InvalidTokenError if verification fails.
+        """
+        payload = self.cache.get(token)
+        if payload is None:
+            payload = self.backend.decode(token, self._key_for(token))
+            # Tokens issued before refresh tokens existed carry no typ and are access tokens
+            if payload.get("typ", "access") != "access":
+                raise InvalidTokenError("Token verification failed: not an access token")
+            self.cache.put(token, payload)
+        if self.revocations is not None and self.revocations.is_revoked(payload.get("jti")):
+            raise RevokedTokenError("Token has been revoked")
+        return payload
+
+    async def verify_async(self, token: str) -> dict:
+        """
+        Like verify, but a token signed by a key not seen yet (e.g. just after a
+        rotation) makes the key set refresh once before the token is rejected,
+        and revocations are also looked up in the shared store until the local
+        revocation list has synced with it.
+        """
+        try:
+            payload = self.verify(token)
+        except UnknownKeyError:
+            if self.key_set is None or not await self.key_set.refresh():
+                raise
+            payload = self.verify(token)
+        # Until the revocation list is synced, revocations by other processes may only be in the shared store
+        if self.revocations is not None and await self.revocations.is_revoked_async(payload.get("jti")):
+            raise RevokedTokenError("Token has been revoked")
+        return payload
+
+def verifier_from_env() -> TokenVerifier:
+    """
+    Build the verifier from the environment.
+    JWT_ALGORITHM HS* verifies with JWT_SECRET_KEY; RS*/ES* verifies with the key
+    set published at JWT_JWKS_URL. JWT_BACKEND picks jose (default) or pyjwt.
+    """
+    algorithm = os.getenv("JWT_ALGORITHM", "HS256")
+    key_set = None
+    if not algorithm.startswith("HS"):
+        from backend.common.auth.jwks import jwks_provider_from_env
+        key_set = jwks_provider_from_env()
+    return TokenVerifier(
+        secret_key=os.getenv("JWT_SECRET_KEY", "your-super-secret-key") if key_set is None else None,
+        algorithm=algorithm,
+        cache=token_cache_from_env(),
+        backend=os.getenv("JWT_BACKEND", "jose").lower(),
+        key_set=key_set,
+        revocations=revocation_list_from_env(),
+    )
@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+class CacheBackend(ABC):
+    """
+    Pluggable read cache used by the services.
+
+    Values are serialised strings (pydantic JSON) so every backend, in-process
+    or shared, stores exactly the same thing.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None on a miss or when the entry has expired."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Store value under key for ttl seconds (the backend default when None)."""
+        pass
+
+    async def add(self, key: str, value: str, ttl: Optional[float] = None) -> bool:
+        """
+        Store value under key only if the key holds nothing.
+        :return: True when stored. Shared backends override this with one atomic operation.
+        """
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Invalidate the given keys."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop every entry."""
+        pass
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Hit, miss and size counters."""
+        pass
+
+    async def start(self) -> None:
+        """Open connections or background tasks; called once from the app lifespan."""
+        pass
+
+    async def close(self) -> None:
+        """Release connections and stop background tasks on shutdown."""
+        pass
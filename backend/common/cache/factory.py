@@ -0,0 +1,60 @@
+import os
+from typing import Optional
+from dotenv import load_dotenv
+from backend.common.cache.cache_backend import CacheBackend
+from backend.common.cache.memory_cache import InMemoryCache
+load_dotenv()
+
+# Backends whose entries, and their invalidations, are seen by every process
+SHARED_CACHE_BACKENDS = ("redis", "tiered")
+
+def _memory_cache(default_ttl: float) -> InMemoryCache:
+    return InMemoryCache(
+        max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "10000")),
+        max_bytes=int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        default_ttl=default_ttl,
+    )
+
+def _redis_cache():
+    # Imported lazily so redis is only needed when a shared tier is configured
+    from redis.asyncio import Redis
+    from backend.common.cache.redis_cache import RedisCache
+    client = Redis.from_url(
+        os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+        decode_responses=True,
+        socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.5")),
+        socket_connect_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.5")),
+    )
+    return RedisCache(
+        client,
+        namespace=os.getenv("CACHE_NAMESPACE", "music"),
+        default_ttl=float(os.getenv("CACHE_TTL_SECONDS", "60")),
+    )
+
+def shared_cache_from_env() -> CacheBackend:
+    """The Redis tier on its own, for state every replica must see (e.g. revoked tokens)."""
+    return _redis_cache()
+
+def cache_from_env() -> Optional[CacheBackend]:
+    """
+    Build the read cache configured by the environment.
+    CACHE_BACKEND:
+      memory (default) - per-process LRU/TTL cache
+      redis            - shared tier only, used by every replica
+      tiered           - per-process cache in front of redis, invalidated over pub/sub
+      none             - no caching
+    """
+    backend = os.getenv("CACHE_BACKEND", "memory").lower()
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return _memory_cache(float(os.getenv("CACHE_TTL_SECONDS", "60")))
+    if backend == "redis":
+        return _redis_cache()
+    if backend == "tiered":
+        from backend.common.cache.tiered_cache import TieredCache
+        return TieredCache(
+            local=_memory_cache(float(os.getenv("CACHE_LOCAL_TTL_SECONDS", "5"))),
+            shared=_redis_cache(),
+        )
+    raise ValueError(f"Unknown CACHE_BACKEND '{backend}'")
@@ -0,0 +1,39 @@
+"""
+Cache key layout shared by the services.
+
+Keys live here rather than in each service because with a shared cache
+tier one service's writes invalidate entries cached by another (a song
+edit in song-service drops the tracklists cached by album-service).
+"""
+
+import hashlib
+from typing import Iterable, List
+
+def song_key(song_id: int) -> str:
+    return f"song:{song_id}"
+
+def album_key(album_id: int) -> str:
+    return f"album:{album_id}"
+
+def album_with_songs_key(album_id: int) -> str:
+    return f"album:{album_id}:with_songs"
+
+def album_songs_key(album_id: int) -> str:
+    return f"album:{album_id}:songs"
+
+def album_tracklist_keys(album_ids: Iterable[int]) -> List[str]:
+    """Keys of cached entries that embed an album's songs."""
+    return [key for album_id in album_ids for key in (album_with_songs_key(album_id), album_songs_key(album_id))]
+
+def album_keys(album_ids: Iterable[int]) -> List[str]:
+    """Every key derived from the given albums."""
+    album_ids = list(album_ids)
+    return [album_key(album_id) for album_id in album_ids] + album_tracklist_keys(album_ids)
+
+def credentials_key(email: str) -> str:
+    """Login credentials cached by auth-service; the email is hashed so addresses never appear in the cache."""
+    return f"credentials:{hashlib.sha256(email.encode('utf-8')).hexdigest()}"
+
+def revoked_token_key(jti: str) -> str:
+    """A token revoked before its expiry, by its JWT ID."""
+    return f"revoked:{jti}"
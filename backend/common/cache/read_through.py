@@ -0,0 +1,26 @@
+from typing import Awaitable, Callable, Optional, TypeVar
+from pydantic import TypeAdapter
+from backend.common.cache.cache_backend import CacheBackend
+
+T = TypeVar("T")
+
+async def cached(
+    cache: Optional[CacheBackend],
+    key: str,
+    adapter: TypeAdapter,
+    loader: Callable[[], Awaitable[Optional[T]]],
+    ttl: Optional[float] = None
+) -> Optional[T]:
+    """
+    Read-through lookup: return the cached value for key or call loader and cache its result.
+    None results are not cached, so not-found lookups always reach the database.
+    """
+    if cache is None:
+        return await loader()
+    hit = await cache.get(key)
+    if hit is not None:
+        return adapter.validate_json(hit)
+    value = await loader()
+    if value is not None:
+        await cache.set(key, adapter.dump_json(value).decode("utf-8"), ttl)
+    return value
@@ -0,0 +1,89 @@
+from typing import Optional
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from backend.common.cache.cache_backend import CacheBackend
+
+class RedisCache(CacheBackend):
+    """
+    Shared cache tier on Redis (or any server speaking its protocol), used by every replica.
+
+    Keys are prefixed with namespace. A Redis outage never fails a request:
+    errors are counted and reads fall through to the database as misses.
+    """
+    def __init__(self, client: Redis, namespace: str = "music", default_ttl: float = 300.0):
+        self.client = client
+        self.namespace = namespace
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            value = await self.client.get(self._key(key))
+        except RedisError as e:
+            self.errors += 1
+            print(f"Cache get failed for {key}: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        try:
+            await self.client.set(self._key(key), value, px=max(1, int(ttl * 1000)))
+        except RedisError as e:
+            self.errors += 1
+            print(f"Cache set failed for {key}: {e}")
+
+    async def add(self, key: str, value: str, ttl: Optional[float] = None) -> bool:
+        ttl = self.default_ttl if ttl is None else ttl
+        try:
+            # SET NX: of concurrent adds, across every process, exactly one stores the value
+            return bool(await self.client.set(self._key(key), value, px=max(1, int(ttl * 1000)), nx=True))
+        except RedisError as e:
+            self.errors += 1
+            print(f"Cache add failed for {key}: {e}")
+            raise
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self.client.delete(*[self._key(key) for key in keys])
+        except RedisError as e:
+            self.errors += 1
+            print(f"Cache delete failed for {keys}: {e}")
+
+    async def clear(self) -> None:
+        try:
+            batch = []
+            async for key in self.client.scan_iter(match=self._key("*"), count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    await self.client.delete(*batch)
+                    batch = []
+            if batch:
+                await self.client.delete(*batch)
+        except RedisError as e:
+            self.errors += 1
+            print(f"Cache clear failed: {e}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "errors": self.errors,
+        }
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import uuid
+from typing import Optional
+from backend.common.cache.cache_backend import CacheBackend
+from backend.common.cache.memory_cache import InMemoryCache
+from backend.common.cache.redis_cache import RedisCache
+
+class TieredCache(CacheBackend):
+    """
+    Per-process InMemoryCache in front of the shared RedisCache.
+
+    Reads try the local tier, then Redis (copying hits into the local tier).
+    Invalidations are applied to both tiers and published on a Redis channel;
+    every replica listens on that channel and drops the keys from its local
+    tier, so an admin edit is visible on all replicas straight away. The local
+    TTL is kept short as a safety net, and the local tier is cleared whenever
+    the listener loses its connection, since messages may have been missed.
+    """
+    def __init__(
+        self,
+        local: InMemoryCache,
+        shared: RedisCache,
+        channel: str = "cache-invalidation",
+        retry_delay: float = 1.0
+    ):
+        self.local = local
+        self.shared = shared
+        self.channel = f"{shared.namespace}:{channel}"
+        self.retry_delay = retry_delay
+        self.instance_id = uuid.uuid4().hex
+        self.invalidations_received = 0
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.local.get(key)
+        if value is not None:
+            return value
+        value = await self.shared.get(key)
+        if value is not None:
+            await self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        await self.shared.set(key, value, ttl)
+        await self.local.set(key, value, None if ttl is None else min(ttl, self.local.default_ttl))
+
+    async def add(self, key: str, value: str, ttl: Optional[float] = None) -> bool:
+        if not await self.shared.add(key, value, ttl):
+            return False
+        await self.local.set(key, value, None if ttl is None else min(ttl, self.local.default_ttl))
+        return True
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        await self.local.delete(*keys)
+        await self.shared.delete(*keys)
+        await self._publish({"keys": list(keys)})
+
+    async def clear(self) -> None:
+        await self.local.clear()
+        await self.shared.clear()
+        await self._publish({"clear": True})
+
+    def stats(self) -> dict:
+        return {
+            "backend": "tiered",
+            "local": self.local.stats(),
+            "shared": self.shared.stats(),
+            "invalidations_received": self.invalidations_received,
+        }
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def wait_until_subscribed(self, timeout: float = 5.0) -> None:
+        await asyncio.wait_for(self._subscribed.wait(), timeout)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self.shared.close()
+
+    async def _publish(self, message: dict) -> None:
+        try:
+            await self.shared.client.publish(self.channel, json.dumps({"origin": self.instance_id, **message}))
+        except Exception as e:
+            self.shared.errors += 1
+            print(f"Cache invalidation publish failed: {e}")
+
+    async def _apply(self, data) -> None:
+        message = json.loads(data)
+        if message.get("origin") == self.instance_id:
+            return
+        self.invalidations_received += 1
+        if message.get("clear"):
+            await self.local.clear()
+        else:
+            await self.local.delete(*message.get("keys", []))
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.shared.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                self._subscribed.set()
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message.get("type") == "message":
+                        await self._apply(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Cache invalidation listener error: {e}")
+                self._subscribed.clear()
+                await self.local.clear()
+                await asyncio.sleep(self.retry_delay)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
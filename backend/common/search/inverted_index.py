@@ -0,0 +1,199 @@
+import heapq
+import math
+import os
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from sortedcontainers import SortedList
+from backend.common.search.text import tokenize
+load_dotenv()
+
+# A last query word of at least this length also matches longer words it starts
+MIN_PREFIX_LENGTH = int(os.getenv("SEARCH_MIN_PREFIX_LENGTH", "2"))
+# Upper bound on the indexed words a single prefix expands to; beyond it the
+# alphabetically later words are left out, and the results say they are truncated
+MAX_PREFIX_TERMS = int(os.getenv("SEARCH_MAX_PREFIX_TERMS", "64"))
+# A prefix match scores this fraction of an exact match
+PREFIX_WEIGHT = 0.5
+# Result pages kept for repeated queries; any write to the index drops them
+RESULT_CACHE_SIZE = int(os.getenv("SEARCH_RESULT_CACHE_SIZE", "1024"))
+
+class InvertedIndex:
+    """
+    In-process full-text index over the rows of one table.
+
+    Each folded word maps to the rows containing it, with a weight summed from
+    the boosts of the fields it appears in (title counts more than genre).
+    The words are also kept sorted, so the word being typed is matched as a
+    prefix with a range scan instead of a pass over the vocabulary.
+
+    Every query word must match (AND). Rows are ranked by the sum, per query
+    word, of their best matching word's weight times its inverse document
+    frequency, so rare words dominate common ones. Results hold only row IDs;
+    callers load the rows by primary key.
+
+    Work is proportional to the rows matching the rarest query word, so a
+    query made only of very common words costs the most; its pages are kept
+    in a small LRU until the next write, which also makes repeats free.
+    """
+    def __init__(
+        self,
+        fields: Dict[str, float],
+        max_prefix_terms: int = MAX_PREFIX_TERMS,
+        result_cache_size: int = RESULT_CACHE_SIZE
+    ):
+        self.fields = fields
+        self.max_prefix_terms = max_prefix_terms
+        self.result_cache_size = result_cache_size
+        self._results: "OrderedDict[Tuple[Tuple[str, ...], int, int], Tuple[List[int], int]]" = OrderedDict()
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self._terms = SortedList()
+        self.truncated_prefixes = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def _term_weights(self, row) -> Dict[str, float]:
+        weights = {}
+        for field, boost in self.fields.items():
+            for token in tokenize(getattr(row, field, None) or ""):
+                weights[token] = weights.get(token, 0.0) + boost
+        return weights
+
+    def add(self, doc_id: int, row) -> None:
+        """Index row under doc_id, replacing what was indexed for it before."""
+        self.remove(doc_id)
+        self._results.clear()
+        weights = self._term_weights(row)
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._terms.add(term)
+            postings[doc_id] = weight
+        self._doc_terms[doc_id] = tuple(weights)
+
+    def remove(self, doc_id: int) -> None:
+        if doc_id in self._doc_terms:
+            self._results.clear()
+        for term in self._doc_terms.pop(doc_id, ()):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                self._terms.remove(term)
+
+    def _expand(self, token: str, prefix: bool) -> List[Tuple[Dict[int, float], float]]:
+        """Postings matching one query word, each with its score multiplier."""
+        total = len(self._doc_terms)
+        matches = []
+        if prefix and len(token) >= MIN_PREFIX_LENGTH:
+            for term in self._terms.irange(minimum=token):
+                if not term.startswith(token) or len(matches) >= self.max_prefix_terms:
+                    break
+                postings = self._postings[term]
+                factor = 1.0 if term == token else PREFIX_WEIGHT
+                matches.append((postings, factor * math.log(1 + total / len(postings))))
+        elif token in self._postings:
+            postings = self._postings[token]
+            matches.append((postings, math.log(1 + total / len(postings))))
+        return matches
+
+    @staticmethod
+    def _merge(matches) -> Dict[int, float]:
+        """Score of each row for one query word: its best matching indexed word."""
+        if len(matches) == 1:
+            postings, idf = matches[0]
+            return {doc_id: weight * idf for doc_id, weight in postings.items()}
+        merged = {}
+        for postings, idf in matches:
+            for doc_id, weight in postings.items():
+                if weight * idf > merged.get(doc_id, 0.0):
+                    merged[doc_id] = weight * idf
+        return merged
+
+    @staticmethod
+    def _top(scores: Dict[int, float], count: int) -> List[int]:
+        """The count best-scoring IDs, ties going to the lower ID so pages are stable."""
+        if count <= 0 or not scores:
+            return []
+        # Only rows scoring at least the count-th best score can make the cut
+        threshold = heapq.nlargest(count, scores.values())[-1]
+        above = sorted(((score, doc_id) for doc_id, score in scores.items() if score > threshold), key=lambda item: (-item[0], item[1]))
+        tied = heapq.nsmallest(count - len(above), (doc_id for doc_id, score in scores.items() if score == threshold))
+        return [doc_id for _, doc_id in above] + tied
+
+    def search(self, query: str, limit: int, offset: int = 0) -> Tuple[List[int], int]:
+        """
+        Rank the rows matching every word of query. The last word is the one
+        still being typed, so it also matches the indexed words it begins.
+        :return: The IDs of one page of results, best first, and the number of matching rows.
+        """
+        tokens = tuple(dict.fromkeys(tokenize(query)))
+        key = (tokens, limit, offset)
+        result = self._results.get(key)
+        if result is None:
+            result = self._search(tokens, limit, offset)
+            self._results[key] = result
+            if len(self._results) > self.result_cache_size:
+                self._results.popitem(last=False)
+        else:
+            self._results.move_to_end(key)
+        return list(result[0]), result[1]
+
+    def prefix_truncated(self, query: str) -> bool:
+        """Whether the last word of query begins more than max_prefix_terms indexed words, so search left some out."""
+        tokens = tuple(dict.fromkeys(tokenize(query)))
+        if not tokens or len(tokens[-1]) < MIN_PREFIX_LENGTH:
+            return False
+        token = tokens[-1]
+        for count, term in enumerate(self._terms.irange(minimum=token)):
+            if not term.startswith(token):
+                return False
+            if count >= self.max_prefix_terms:
+                self.truncated_prefixes += 1
+                return True
+        return False
+
+    def _search(self, tokens: Tuple[str, ...], limit: int, offset: int) -> Tuple[List[int], int]:
+        expanded = [self._expand(token, prefix=i == len(tokens) - 1) for i, token in enumerate(tokens)]
+        if not expanded or not all(expanded):
+            return [], 0
+        if len(expanded) == 1 and len(expanded[0]) == 1:
+            # One indexed word: its weights already give the order
+            postings, _ = expanded[0][0]
+            return self._top(postings, offset + limit)[offset:], len(postings)
+        # Start from the most selective word so later words only probe the survivors
+        expanded.sort(key=lambda matches: sum(len(postings) for postings, _ in matches))
+        scores: Optional[Dict[int, float]] = None
+        for matches in expanded:
+            if scores is None:
+                scores = self._merge(matches)
+                continue
+            if len(matches) == 1:
+                postings, idf = matches[0]
+                if len(postings) < len(scores):
+                    scores = {doc_id: scores[doc_id] + weight * idf for doc_id, weight in postings.items() if doc_id in scores}
+                else:
+                    scores = {doc_id: score + postings[doc_id] * idf for doc_id, score in scores.items() if doc_id in postings}
+            else:
+                word_scores = self._merge(matches)
+                scores = {doc_id: score + word_scores[doc_id] for doc_id, score in scores.items() if doc_id in word_scores}
+            if not scores:
+                return [], 0
+        return self._top(scores, offset + limit)[offset:], len(scores)
+
+    def stats(self) -> dict:
+        return {"documents": len(self._doc_terms), "terms": len(self._postings), "truncated_prefixes": self.truncated_prefixes}
+
+async def index_partitions(index: InvertedIndex, partitions: AsyncIterator[list]) -> InvertedIndex:
+    """Build index from streamed batches of rows, e.g. a repository's export stream."""
+    async for partition in partitions:
+        for row in partition:
+            index.add(row.id, row)
+    return index
+
+def search_enabled() -> bool:
+    """SEARCH_ENABLED=false skips building the index at startup; search then answers 503."""
+    return os.getenv("SEARCH_ENABLED", "true").lower() not in ("false", "0", "no")
@@ -0,0 +1,291 @@
+import heapq
+import os
+import sys
+from array import array
+from bisect import bisect_left, insort
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from dotenv import load_dotenv
+from backend.common.search.text import tokenize
+load_dotenv()
+
+# Prefixes at least this long are also matched with typos when exact matches run short
+FUZZY_MIN_LENGTH = int(os.getenv("SUGGEST_FUZZY_MIN_LENGTH", "3"))
+# Prefixes at least this long may contain two typos instead of one
+FUZZY_TWO_EDITS_LENGTH = int(os.getenv("SUGGEST_FUZZY_TWO_EDITS_LENGTH", "6"))
+# Each typo multiplies a suggestion's score by this
+FUZZY_PENALTY = 0.25
+# Changed entries kept in the sorted delta before it is merged into the arrays
+COMPACT_MIN_CHANGES = int(os.getenv("SUGGEST_COMPACT_MIN_CHANGES", "4096"))
+
+# Sorts before every character, so an entry's key sits right before the longer keys it prefixes
+_KIND_SEPARATOR = "\x00"
+
+def _successor(prefix: str) -> str:
+    """The smallest string greater than every string starting with prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def _step(row: List[int], query: str, char: str) -> List[int]:
+    """Next row of the Levenshtein matrix between query and a prefix extended by char."""
+    next_row = [row[0] + 1]
+    for j in range(1, len(query) + 1):
+        next_row.append(min(next_row[j - 1] + 1, row[j] + 1, row[j - 1] + (query[j - 1] != char)))
+    return next_row
+
+def _prefix_ranges(keys: List[str], query: str, max_edits: int) -> List[Tuple[int, int, int]]:
+    """
+    Ranges of keys starting with a string within max_edits edits of query, with the edits.
+
+    keys are walked as a trie: the keys below a prefix are a contiguous range,
+    and its children are found by bisecting that range, so the walk only visits
+    prefixes whose Levenshtein row can still come within max_edits. The first
+    character must match, which keeps the walk small (typos there are rare).
+    """
+    ranges = []
+    first = query[0]
+    lo, hi = bisect_left(keys, first), bisect_left(keys, _successor(first))
+    stack = [(first, lo, hi, _step(list(range(len(query) + 1)), query, first))]
+    while stack:
+        prefix, lo, hi, row = stack.pop()
+        if row[-1] <= max_edits:
+            ranges.append((lo, hi, row[-1]))
+            if row[-1] == 0:
+                continue
+        if min(row) > max_edits or len(prefix) >= len(query) + max_edits:
+            continue
+        depth, i = len(prefix), lo
+        while i < hi:
+            key = keys[i]
+            if len(key) <= depth or key[depth] == _KIND_SEPARATOR:
+                # Entries for prefix itself; they have no children
+                i += 1
+                continue
+            child = prefix + key[depth]
+            j = bisect_left(keys, _successor(child), i, hi)
+            child_row = _step(row, query, key[depth])
+            if min(child_row) <= max_edits:
+                stack.append((child, i, j, child_row))
+            i = j
+    return ranges
+
+class SuggestIndex:
+    """
+    Popularity-weighted autocomplete over short texts (titles, artist names).
+
+    An entry is a folded text and its kind ("song", "artist", "album"). Its
+    weight is the sum contributed by the rows mentioning it, so an artist with
+    many songs ranks above one with a single song.
+
+    Entries live in sorted arrays: the keys, their weights, and a segment tree
+    giving the heaviest entry of any key range. Keys starting with a prefix
+    form one range, so the top-k of a prefix costs O(k log n) whatever its
+    size. Changes since the arrays were built sit in a small sorted delta
+    that queries merge in; compact() folds it into the arrays once it grows.
+
+    Prefixes with few exact matches are also matched with one or two typos;
+    each typo divides a suggestion's score by 1 / FUZZY_PENALTY.
+    """
+    def __init__(self, compact_min_changes: int = COMPACT_MIN_CHANGES):
+        self.compact_min_changes = compact_min_changes
+        self._weights: Dict[str, float] = {}
+        self._display: Dict[str, str] = {}
+        self._doc_entries: Dict[int, Tuple[Tuple[str, float], ...]] = {}
+        # Arrays built by compact()
+        self._keys: List[str] = []
+        self._key_weights = array("d")
+        self._tree = array("l")
+        self._leaves = 1
+        # Keys changed since compact(), sorted
+        self._dirty: List[str] = []
+        self._dirty_set = set()
+        self._memory_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    @staticmethod
+    def _key(kind: str, text: str) -> Optional[str]:
+        folded = " ".join(tokenize(text or ""))
+        # Interned so rows sharing a text (an artist's songs) hold a single copy
+        return sys.intern(f"{folded}{_KIND_SEPARATOR}{kind}") if folded else None
+
+    def _change(self, key: str, delta: float, text: Optional[str] = None) -> None:
+        weight = self._weights.get(key, 0.0) + delta
+        if weight > 1e-9:
+            self._weights[key] = weight
+            if text is not None:
+                self._display.setdefault(key, text)
+        else:
+            self._weights.pop(key, None)
+            self._display.pop(key, None)
+        if key not in self._dirty_set:
+            self._dirty_set.add(key)
+            insort(self._dirty, key)
+
+    def index(self, doc_id: int, entries: Iterable[Tuple[str, str, float]]) -> None:
+        """
+        Set the (kind, text, weight) entries contributed by row doc_id,
+        replacing what it contributed before.
+        """
+        self.remove(doc_id)
+        contributed = []
+        for kind, text, weight in entries:
+            key = self._key(kind, text)
+            if key is not None:
+                self._change(key, weight, text)
+                contributed.append((key, weight))
+        self._doc_entries[doc_id] = tuple(contributed)
+        self._maybe_compact()
+
+    def load(self, doc_id: int, entries: Iterable[Tuple[str, str, float]]) -> None:
+        """
+        Like index(), for building from scratch: skips the delta, so nothing
+        loaded is suggested until compact(). doc_id must not be indexed yet.
+        """
+        contributed = []
+        for kind, text, weight in entries:
+            key = self._key(kind, text)
+            if key is not None:
+                self._weights[key] = self._weights.get(key, 0.0) + weight
+                self._display.setdefault(key, text)
+                contributed.append((key, weight))
+        self._doc_entries[doc_id] = tuple(contributed)
+
+    def remove(self, doc_id: int) -> None:
+        for key, weight in self._doc_entries.pop(doc_id, ()):
+            self._change(key, -weight)
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        if len(self._dirty) > max(self.compact_min_changes, len(self._keys) // 20):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rebuild the sorted arrays from the current weights and empty the delta."""
+        self._keys = sorted(self._weights)
+        self._key_weights = array("d", (self._weights[key] for key in self._keys))
+        self._leaves = 1
+        while self._leaves < max(1, len(self._keys)):
+            self._leaves *= 2
+        # tree[leaves + i] = i; each parent holds the index of its heavier child
+        tree = array("l", [-1]) * (2 * self._leaves)
+        for i in range(len(self._keys)):
+            tree[self._leaves + i] = i
+        weights = self._key_weights
+        for node in range(self._leaves - 1, 0, -1):
+            left, right = tree[2 * node], tree[2 * node + 1]
+            tree[node] = left if right < 0 or (left >= 0 and weights[left] >= weights[right]) else right
+        self._tree = tree
+        self._dirty = []
+        self._dirty_set = set()
+        self._memory_bytes = self.memory_bytes()
+
+    def _argmax(self, lo: int, hi: int) -> int:
+        """Index of the heaviest key in keys[lo:hi], by the weights at the last compact()."""
+        best = -1
+        weights = self._key_weights
+        lo += self._leaves
+        hi += self._leaves
+        while lo < hi:
+            if lo & 1:
+                candidate = self._tree[lo]
+                if best < 0 or weights[candidate] > weights[best]:
+                    best = candidate
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                candidate = self._tree[hi]
+                if best < 0 or weights[candidate] > weights[best]:
+                    best = candidate
+            lo //= 2
+            hi //= 2
+        return best
+
+    def _compacted(self, lo: int, hi: int, factor: float) -> Iterator[Tuple[float, str]]:
+        """Keys of one compacted range, heaviest first, as (-score, key); changed keys are left to the delta."""
+        heap = []
+
+        def push(start, stop):
+            if start < stop:
+                i = self._argmax(start, stop)
+                heapq.heappush(heap, (-self._key_weights[i], i, start, stop))
+
+        push(lo, hi)
+        while heap:
+            negative_weight, i, start, stop = heapq.heappop(heap)
+            key = self._keys[i]
+            if key not in self._dirty_set:
+                yield negative_weight * factor, key
+            push(start, i)
+            push(i + 1, stop)
+
+    def _changed(self, lo: int, hi: int, factor: float) -> List[Tuple[float, str]]:
+        """Live keys of one delta range, heaviest first, as (-score, key)."""
+        return sorted(
+            (-self._weights[key] * factor, key) for key in self._dirty[lo:hi] if key in self._weights
+        )
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[dict]:
+        """
+        The heaviest entries whose text starts with prefix, falling back to
+        prefixes within one or two typos when there are fewer than limit.
+        :return: Dicts with the entry's text, kind and score, best first.
+        """
+        query = " ".join(tokenize(prefix))
+        if not query or limit <= 0:
+            return []
+        exact = self._collect(query, 0, limit)
+        if len(exact) >= limit or len(query) < FUZZY_MIN_LENGTH:
+            return exact
+        return self._collect(query, 2 if len(query) >= FUZZY_TWO_EDITS_LENGTH else 1, limit)
+
+    def _collect(self, query: str, max_edits: int, limit: int) -> List[dict]:
+        streams = []
+        for keys, is_delta in ((self._keys, False), (self._dirty, True)):
+            if max_edits:
+                ranges = _prefix_ranges(keys, query, max_edits)
+            else:
+                ranges = [(bisect_left(keys, query), bisect_left(keys, _successor(query)), 0)]
+            for lo, hi, edits in ranges:
+                if lo < hi:
+                    factor = FUZZY_PENALTY ** edits
+                    streams.append(iter(self._changed(lo, hi, factor)) if is_delta else self._compacted(lo, hi, factor))
+        results, seen = [], set()
+        # Streams are each sorted best first, so the first time a key comes out is its best score
+        for negative_score, key in heapq.merge(*streams):
+            if key in seen:
+                continue
+            seen.add(key)
+            kind = key.rsplit(_KIND_SEPARATOR, 1)[1]
+            results.append({"text": self._display[key], "kind": kind, "score": -negative_score})
+            if len(results) >= limit:
+                break
+        return results
+
+    def memory_bytes(self) -> int:
+        """
+        Approximate memory held by the index: containers plus the strings they hold.
+        Walks every entry; stats() reports the figure taken at the last compact().
+        """
+        size = sum(sys.getsizeof(container) for container in (
+            self._weights, self._display, self._doc_entries, self._keys,
+            self._key_weights, self._tree, self._dirty, self._dirty_set
+        ))
+        size += sum(sys.getsizeof(key) for key in self._weights)
+        size += sum(sys.getsizeof(text) for text in self._display.values())
+        size += sum(sys.getsizeof(entries) for entries in self._doc_entries.values())
+        return size
+
+    def stats(self) -> dict:
+        return {"entries": len(self._weights), "pending_changes": len(self._dirty), "memory_bytes": self._memory_bytes}
+
+async def suggest_partitions(
+    index: SuggestIndex,
+    partitions: AsyncIterator[list],
+    entries: Callable[[object], Iterable[Tuple[str, str, float]]]
+) -> SuggestIndex:
+    """Build index from streamed batches of rows, entries giving each row's (kind, text, weight) entries."""
+    async for partition in partitions:
+        for row in partition:
+            index.load(row.id, entries(row))
+    index.compact()
+    return index
@@ -0,0 +1,24 @@
+"""
+Text normalisation shared by the search indexes and their queries.
+
+Indexed fields and queries go through the same folding, so "Beyoncé",
+"BEYONCE" and "beyonce" all produce the token "beyonce".
+"""
+
+import re
+import unicodedata
+from typing import List
+
+_TOKEN = re.compile(r"\w+")
+
+def fold(text: str) -> str:
+    """Case- and diacritic-insensitive form of text."""
+    if text.isascii():
+        # Nothing to decompose; most titles take this path
+        return text.casefold()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+def tokenize(text: str) -> List[str]:
+    """The folded words of text, in order."""
+    return _TOKEN.findall(fold(text))
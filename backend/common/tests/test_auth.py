@@ -0,0 +1,69 @@
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+from starlette.requests import Request
+from backend.common.auth.auth_helper import AuthHelper
+from backend.common.auth.exceptions import InvalidTokenError, RevokedTokenError
+from backend.common.auth.revocation import RevocationList
+from backend.common.auth.verifier import TokenVerifier
+
+SECRET = "unit-test-secret"
+
+def make_token(role: str = "user", exp_in: int = 3600, secret: str = SECRET, **claims) -> str:
+    now = int(time.time())
+    claims.update({"sub": "1", "role": role, "iat": now, "exp": now + exp_in})
+    return jwt.encode(claims, secret, algorithm="HS256")
+
+def make_request(token: str) -> Request:
+    return Request({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+@pytest.mark.parametrize("backend", ["jose", "pyjwt"])
+def test_verifier_checks_signature_and_expiry(backend):
+    if backend == "pyjwt":
+        pytest.importorskip("jwt")
+    verifier = TokenVerifier(SECRET, backend=backend)
+    assert verifier.verify(make_token())["role"] == "user"
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(make_token(secret="other-secret"))
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(make_token(exp_in=-10))
+    with pytest.raises(InvalidTokenError):
+        verifier.verify("not-a-token")
+
+def test_verifier_serves_repeat_tokens_from_cache():
+    verifier = TokenVerifier(SECRET)
+    token = make_token()
+    verifier.verify(token)
+    verifier.verify(token)
+    assert verifier.cache.stats()["hits"] == 1
+
+def test_verifier_rejects_refresh_and_revoked_tokens():
+    revocations = RevocationList()
+    verifier = TokenVerifier(SECRET, revocations=revocations)
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(make_token(typ="refresh", jti="r1"))
+
+    token = make_token(typ="access", jti="a1")
+    verifier.verify(token)
+    asyncio.run(revocations.revoke("a1", time.time() + 3600))
+    # Revocation applies even though the payload is cached
+    with pytest.raises(RevokedTokenError):
+        verifier.verify(token)
+    with pytest.raises(RevokedTokenError):
+        asyncio.run(verifier.verify_async(token))
+
+def test_role_guards_are_shared_and_enforced():
+    helper = AuthHelper(TokenVerifier(SECRET))
+    assert helper.require_role("admin").dependency is helper.require_role("admin").dependency
+    assert helper.require_auth().dependency is not helper.require_role("admin").dependency
+
+    admin_only = helper.require_role("admin").dependency
+    assert asyncio.run(admin_only(make_request(make_token(role="admin"))))["role"] == "admin"
+    with pytest.raises(HTTPException) as denied:
+        asyncio.run(admin_only(make_request(make_token())))
+    assert denied.value.status_code == 403
+    with pytest.raises(HTTPException) as invalid:
+        asyncio.run(helper.require_auth().dependency(make_request(make_token(secret="other-secret"))))
+    assert invalid.value.status_code == 401
@@ -0,0 +1,42 @@
+from datetime import datetime
+from types import SimpleNamespace
+from fastapi import Response
+from starlette.requests import Request
+from backend.common.web.conditional import conditional_response, entity_validators, collection_validators
+
+def make_request(**headers) -> Request:
+    raw = [(name.replace("_", "-").lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+def row(id, created_at, updated_at=None):
+    return SimpleNamespace(id=id, created_at=created_at, updated_at=updated_at)
+
+def test_entity_version_prefers_updated_at():
+    created = datetime(2024, 1, 1, 12, 0, 0)
+    updated = datetime(2024, 2, 1, 12, 0, 0, 500)
+    etag, last_modified = entity_validators(row(1, created))
+    assert etag.startswith('W/"') and last_modified == created
+    new_etag, last_modified = entity_validators(row(1, created, updated))
+    assert new_etag != etag and last_modified == updated
+
+def test_collection_etag_covers_ids_and_extras():
+    created = datetime(2024, 1, 1)
+    base, last_modified = collection_validators([row(1, created), row(2, created)], 3)
+    assert last_modified is None
+    assert collection_validators([row(1, created)], 3)[0] != base
+    assert collection_validators([row(1, created), row(2, created)], None)[0] != base
+
+def test_preconditions():
+    etag, last_modified = entity_validators(row(1, datetime(2024, 1, 1, 12, 0, 0, 250)))
+    response = Response()
+    assert conditional_response(make_request(), response, etag, last_modified, "private") is None
+    assert response.headers["last-modified"] == "Mon, 01 Jan 2024 12:00:00 GMT"
+
+    assert conditional_response(make_request(if_none_match=f'"x", {etag}'), Response(), etag, last_modified, "private").status_code == 304
+    assert conditional_response(make_request(if_none_match="*"), Response(), etag, last_modified, "private").status_code == 304
+    assert conditional_response(make_request(if_modified_since="Mon, 01 Jan 2024 12:00:00 GMT"), Response(), etag, last_modified, "private").status_code == 304
+    assert conditional_response(make_request(if_modified_since="Mon, 01 Jan 2024 11:59:59 GMT"), Response(), etag, last_modified, "private") is None
+    assert conditional_response(make_request(if_modified_since="not a date"), Response(), etag, last_modified, "private") is None
+    # If-None-Match wins over If-Modified-Since
+    request = make_request(if_none_match='"other"', if_modified_since="Mon, 01 Jan 2024 12:00:00 GMT")
+    assert conditional_response(request, Response(), etag, last_modified, "private") is None
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+from backend.common.search.inverted_index import InvertedIndex
+from backend.common.search.text import tokenize
+
+FIELDS = {"title": 3.0, "artist": 2.0, "genre": 1.0}
+
+def row(title: str, artist: str = "", genre: str = ""):
+    return SimpleNamespace(title=title, artist=artist, genre=genre)
+
+def make_index() -> InvertedIndex:
+    index = InvertedIndex(FIELDS)
+    index.add(1, row("Halo", "Beyoncé", "Pop"))
+    index.add(2, row("Crazy in Love", "Beyoncé", "R&B"))
+    index.add(3, row("Love Story", "Taylor Swift", "Pop"))
+    index.add(4, row("Pop Muzik", "M", "Pop"))
+    return index
+
+def test_tokenize_folds_case_and_diacritics():
+    assert tokenize("Beyoncé — CRAZY in Love!") == ["beyonce", "crazy", "in", "love"]
+    assert tokenize("Straße") == ["strasse"]
+
+def test_every_word_must_match_and_prefixes_match():
+    index = make_index()
+    assert index.search("beyonce love", 10) == ([2], 1)
+    assert sorted(index.search("BEYO", 10)[0]) == [1, 2]
+    assert index.search("beyonce swift", 10) == ([], 0)
+    assert index.search("", 10) == ([], 0)
+
+def test_results_are_ranked_and_paged():
+    index = make_index()
+    # "pop" in the title outranks "pop" as the genre
+    assert index.search("pop", 10)[0][0] == 4
+    first, total = index.search("pop", 2)
+    second, _ = index.search("pop", 2, offset=2)
+    assert total == 3 and len(first) == 2 and len(second) == 1
+    assert set(first + second) == {1, 3, 4}
+
+def test_updates_and_removals_are_incremental():
+    index = make_index()
+    index.add(3, row("Shake It Off", "Taylor Swift", "Pop"))
+    assert index.search("story", 10) == ([], 0)
+    assert index.search("shake", 10) == ([3], 1)
+    index.remove(3)
+    index.remove(3)
+    assert index.search("swift", 10) == ([], 0)
+    assert index.stats()["documents"] == 3
+    assert "swift" not in index._terms
+
+def test_truncated_prefix_expansions_are_reported():
+    index = InvertedIndex(FIELDS, max_prefix_terms=2)
+    for doc_id, title in enumerate(["Lava", "Lazy", "Layla", "Love"], start=1):
+        index.add(doc_id, row(title))
+    # "la" begins three words but expands to the first two: Lazy is left out
+    assert sorted(index.search("la", 10)[0]) == [1, 3]
+    assert index.prefix_truncated("la")
+    assert not index.prefix_truncated("laz") and not index.prefix_truncated("lo")
+    assert index.stats()["truncated_prefixes"] == 1
@@ -0,0 +1,85 @@
+import asyncio
+import time
+import httpx
+import pytest
+import rsa
+from jose import jwk, jwt
+from backend.common.auth.exceptions import InvalidTokenError, UnknownKeyError
+from backend.common.auth.jwks import JWKSProvider
+from backend.common.auth.verifier import TokenVerifier
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def new_signing_key(kid: str):
+    _, private_key = rsa.newkeys(1024)
+    pem = private_key.save_pkcs1().decode()
+    public = jwk.construct(pem, "RS256").public_key().to_dict()
+    public.update({"kid": kid, "use": "sig"})
+    return pem, public
+
+def sign(pem: str, kid: str) -> str:
+    now = int(time.time())
+    return jwt.encode({"sub": "1", "role": "user", "iat": now, "exp": now + 600}, pem, algorithm="RS256", headers={"kid": kid})
+
+def test_rs256_tokens_are_verified_against_the_published_key_set():
+    old_pem, old_public = new_signing_key("k1")
+    new_pem, new_public = new_signing_key("k2")
+    published = {"keys": [old_public]}
+    fetches = []
+
+    def serve(request):
+        fetches.append(request.url.path)
+        return httpx.Response(200, json=published)
+
+    async def scenario():
+        clock = FakeClock()
+        key_set = JWKSProvider(
+            "http://auth/.well-known/jwks.json",
+            min_refresh_interval=30,
+            client=httpx.AsyncClient(transport=httpx.MockTransport(serve)),
+            clock=clock,
+        )
+        verifier = TokenVerifier(algorithm="RS256", key_set=key_set)
+        await verifier.start()
+        try:
+            assert (await verifier.verify_async(sign(old_pem, "k1")))["sub"] == "1"
+            with pytest.raises(InvalidTokenError):
+                await verifier.verify_async(sign(new_pem, "k1"))
+
+            # Rotation: the new key is published, the first token signed with it reloads the set once
+            published["keys"] = [new_public, old_public]
+            clock.now = 60
+            assert (await verifier.verify_async(sign(new_pem, "k2")))["sub"] == "1"
+            assert key_set.kids() == ["k2", "k1"]
+
+            # Unknown kids within min_refresh_interval do not fetch again
+            with pytest.raises(UnknownKeyError):
+                await verifier.verify_async(sign(new_pem, "k3"))
+            assert len(fetches) == 2
+        finally:
+            await verifier.close()
+
+    asyncio.run(scenario())
+
+def test_fetch_errors_keep_the_previous_keys():
+    pem, public = new_signing_key("k1")
+    responses = [httpx.Response(200, json={"keys": [public]}), httpx.Response(503)]
+
+    async def scenario():
+        key_set = JWKSProvider(
+            "http://auth/.well-known/jwks.json",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(lambda request: responses.pop(0))),
+        )
+        verifier = TokenVerifier(algorithm="RS256", key_set=key_set)
+        await verifier.start()
+        assert await key_set.refresh(force=True) is False
+        assert key_set.failures == 1
+        assert verifier.verify(sign(pem, "k1"))["sub"] == "1"
+        await verifier.close()
+
+    asyncio.run(scenario())
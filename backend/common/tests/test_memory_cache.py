@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+from pydantic import BaseModel, TypeAdapter
+from backend.common.cache.memory_cache import InMemoryCache
+from backend.common.cache.read_through import cached
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_hit_miss_and_stats():
+    cache = InMemoryCache()
+    assert run(cache.get("a")) is None
+    run(cache.set("a", "1"))
+    assert run(cache.get("a")) == "1"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (1, 1, 1, 1)
+    assert stats["hit_ratio"] == 0.5
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = InMemoryCache(default_ttl=10, clock=clock)
+    run(cache.set("a", "1"))
+    run(cache.set("b", "2", ttl=30))
+    clock.now = 10
+    assert run(cache.get("a")) is None
+    assert run(cache.get("b")) == "2"
+    assert cache.stats()["expirations"] == 1
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = InMemoryCache(max_entries=2)
+    run(cache.set("a", "1"))
+    run(cache.set("b", "2"))
+    run(cache.get("a"))
+    run(cache.set("c", "3"))
+    assert run(cache.get("b")) is None
+    assert run(cache.get("a")) == "1"
+    assert cache.stats()["evictions"] == 1
+
+def test_byte_limit_evicts_and_skips_oversized_values():
+    cache = InMemoryCache(max_bytes=10)
+    run(cache.set("a", "xxxx"))
+    run(cache.set("b", "yyyy"))
+    run(cache.set("c", "zzzz"))
+    assert run(cache.get("a")) is None
+    assert cache.stats()["bytes"] == 8
+    run(cache.set("huge", "x" * 11))
+    assert run(cache.get("huge")) is None
+
+def test_delete_and_clear():
+    cache = InMemoryCache()
+    run(cache.set("a", "1"))
+    run(cache.set("b", "2"))
+    run(cache.delete("a", "missing"))
+    assert run(cache.get("a")) is None
+    run(cache.clear())
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+def test_read_through_loads_once_and_skips_none():
+    cache = InMemoryCache()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return Item(id=1, name="one")
+
+    adapter = TypeAdapter(Item)
+    assert run(cached(cache, "item:1", adapter, load)) == Item(id=1, name="one")
+    assert run(cached(cache, "item:1", adapter, load)) == Item(id=1, name="one")
+    assert len(calls) == 1
+
+    async def load_missing():
+        return None
+
+    assert run(cached(cache, "item:2", adapter, load_missing)) is None
+    assert run(cache.get("item:2")) is None
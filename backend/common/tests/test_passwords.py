@@ -0,0 +1,36 @@
+import asyncio
+import threading
+import pytest
+from backend.common.auth.exceptions import PasswordPoolBusyError
+from backend.common.auth.passwords import PasswordWorkPool, bcrypt_context
+
+def test_changed_cost_marks_hashes_for_rehash():
+    old_hash = bcrypt_context(4).hash("secret")
+    current = bcrypt_context(5)
+    assert current.verify("secret", old_hash)
+    assert current.needs_update(old_hash)
+    assert not current.needs_update(current.hash("secret"))
+
+def test_work_runs_on_pool_threads():
+    pool = PasswordWorkPool(max_workers=2)
+    name = asyncio.run(pool.run(lambda: threading.current_thread().name))
+    assert name.startswith("bcrypt")
+    pool.shutdown()
+
+def test_saturated_pool_rejects_after_queue_timeout():
+    pool = PasswordWorkPool(max_workers=1, max_pending=1, queue_timeout=0.05)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.01)
+        assert pool.stats()["pending"] == 1
+        with pytest.raises(PasswordPoolBusyError):
+            await pool.run(lambda: None)
+        release.set()
+        await blocked
+        assert await pool.run(lambda: "ok") == "ok"
+
+    asyncio.run(scenario())
+    assert pool.stats()["rejected"] == 1
+    pool.shutdown()
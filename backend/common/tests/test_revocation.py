@@ -0,0 +1,91 @@
+import asyncio
+import pytest
+from backend.common.auth.revocation import RevocationList, revocation_list_from_env
+from backend.common.cache.memory_cache import InMemoryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_revocations_are_dropped_once_the_token_expires():
+    clock = FakeClock()
+    revocations = RevocationList(clock=clock)
+    asyncio.run(revocations.revoke("short", clock.now + 10))
+    asyncio.run(revocations.revoke("long", clock.now + 100))
+    asyncio.run(revocations.revoke("expired", clock.now - 1))
+    assert revocations.is_revoked("short") and revocations.is_revoked("long")
+    assert not revocations.is_revoked("expired")
+    assert not revocations.is_revoked(None)
+
+    clock.now += 50
+    assert not revocations.is_revoked("short")
+    asyncio.run(revocations.revoke("another", clock.now + 10))
+    assert revocations.stats()["revoked"] == 2
+
+
+def test_revocations_reach_other_processes_through_the_shared_store():
+    store = InMemoryCache()
+    issuer, consumer = RevocationList(store=store), RevocationList(store=store)
+
+    async def scenario():
+        await issuer.revoke("jti-1", issuer.clock() + 60)
+        assert not consumer.is_revoked("jti-1")
+        assert await consumer.is_revoked_async("jti-1")
+        assert not await consumer.is_revoked_async("jti-2")
+
+    asyncio.run(scenario())
+    # The store hit was copied locally
+    assert consumer.is_revoked("jti-1")
+
+
+def test_synced_revocations_are_checked_locally():
+    fakeredis = pytest.importorskip("fakeredis")
+    from backend.common.cache.redis_cache import RedisCache
+
+    server = fakeredis.FakeServer()
+    issuer = RevocationList(store=RedisCache(fakeredis.FakeAsyncRedis(server=server)))
+    consumer = RevocationList(store=RedisCache(fakeredis.FakeAsyncRedis(server=server)))
+
+    async def scenario():
+        # Revoked before the consumer started: loaded from the store when it syncs
+        await issuer.revoke("before-start", issuer.clock() + 60)
+        assert await consumer.is_revoked_async("before-start")
+        await consumer.start()
+        await consumer.wait_until_synced()
+        assert consumer.is_revoked("before-start")
+
+        # Revoked afterwards: published to the consumer's local list
+        await issuer.revoke("after-start", issuer.clock() + 60)
+        await issuer.revoke_once("rotated", issuer.clock() + 60)
+        for _ in range(100):
+            if consumer.is_revoked("after-start") and consumer.is_revoked("rotated"):
+                break
+            await asyncio.sleep(0.01)
+        assert consumer.is_revoked("after-start") and consumer.is_revoked("rotated")
+
+        # Once synced a local miss is final: the store is not read
+        reads = consumer.store.hits + consumer.store.misses
+        assert not await consumer.is_revoked_async("never-revoked")
+        assert consumer.store.hits + consumer.store.misses == reads
+        await consumer.close()
+        assert not consumer.stats()["synced"]
+
+    asyncio.run(scenario())
+
+
+def test_revocations_are_shared_by_default_with_a_shared_cache(monkeypatch):
+    """Test REVOCATION_BACKEND follows CACHE_BACKEND when unset, so logouts reach every service."""
+    pytest.importorskip("redis")
+    monkeypatch.delenv("REVOCATION_BACKEND", raising=False)
+    monkeypatch.setenv("CACHE_BACKEND", "tiered")
+    assert revocation_list_from_env().store is not None
+    monkeypatch.setenv("CACHE_BACKEND", "memory")
+    assert revocation_list_from_env().store is None
+    monkeypatch.setenv("REVOCATION_BACKEND", "memory")
+    monkeypatch.setenv("CACHE_BACKEND", "redis")
+    assert revocation_list_from_env().store is None
@@ -0,0 +1,72 @@
+import asyncio
+import pytest
+fakeredis = pytest.importorskip("fakeredis")
+from backend.common.cache.memory_cache import InMemoryCache
+from backend.common.cache.redis_cache import RedisCache
+from backend.common.cache.tiered_cache import TieredCache
+
+def redis_cache(server, namespace="test"):
+    return RedisCache(fakeredis.FakeAsyncRedis(server=server, decode_responses=True), namespace=namespace)
+
+async def wait_for(condition, timeout=3.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+def test_redis_cache_round_trip_and_clear():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        cache = redis_cache(server)
+        other_namespace = redis_cache(server, namespace="other")
+        assert await cache.get("a") is None
+        await cache.set("a", "1", ttl=30)
+        await cache.set("b", "2")
+        await other_namespace.set("a", "kept")
+        assert await cache.get("a") == "1"
+        assert 0 < await cache.client.pttl("test:a") <= 30000
+        await cache.delete("a")
+        assert await cache.get("a") is None
+        await cache.clear()
+        assert await cache.get("b") is None
+        assert await other_namespace.get("a") == "kept"
+        assert (cache.hits, cache.misses) == (1, 3)
+        await cache.close()
+    asyncio.run(scenario())
+
+def test_redis_outage_is_a_miss_not_an_error():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        cache = redis_cache(server)
+        server.connected = False
+        assert await cache.get("a") is None
+        await cache.set("a", "1")
+        await cache.delete("a")
+        assert cache.stats()["errors"] == 3
+    asyncio.run(scenario())
+
+def test_tiered_cache_shares_values_and_broadcasts_invalidations():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        replica_a = TieredCache(InMemoryCache(), redis_cache(server))
+        replica_b = TieredCache(InMemoryCache(), redis_cache(server))
+        await replica_a.start()
+        await replica_b.start()
+        await replica_a.wait_until_subscribed()
+        await replica_b.wait_until_subscribed()
+        try:
+            await replica_a.set("album:1", '{"id": 1}')
+            # Served from the shared tier, then from replica B's own local tier
+            assert await replica_b.get("album:1") == '{"id": 1}'
+            assert await replica_b.local.get("album:1") == '{"id": 1}'
+
+            await replica_a.delete("album:1")
+            await wait_for(lambda: replica_b.invalidations_received == 1)
+            assert await replica_b.local.get("album:1") is None
+            assert await replica_b.get("album:1") is None
+            assert replica_a.invalidations_received == 0
+        finally:
+            await replica_a.close()
+            await replica_b.close()
+    asyncio.run(scenario())
@@ -0,0 +1,75 @@
+import random
+from backend.common.search.suggest import SuggestIndex
+
+def entries(title: str, artist: str):
+    return [("song", title, 1.0), ("artist", artist, 1.0)]
+
+def make_index(compact: bool = True) -> SuggestIndex:
+    index = SuggestIndex()
+    index.index(1, entries("Halo", "Beyoncé"))
+    index.index(2, entries("Crazy in Love", "Beyoncé"))
+    index.index(3, entries("Hallelujah", "Leonard Cohen"))
+    index.index(4, entries("Beyond the Sea", "Bobby Darin"))
+    if compact:
+        index.compact()
+    return index
+
+def texts(suggestions):
+    return [suggestion["text"] for suggestion in suggestions]
+
+def test_prefix_matches_rank_by_popularity():
+    index = make_index()
+    # Two songs make Beyoncé heavier than a single title
+    assert index.suggest("BEYO") == [
+        {"text": "Beyoncé", "kind": "artist", "score": 2.0},
+        {"text": "Beyond the Sea", "kind": "song", "score": 1.0},
+    ]
+    # Equal weights are ordered by text
+    assert texts(index.suggest("hal")) == ["Hallelujah", "Halo"]
+    assert texts(index.suggest("crazy in l")) == ["Crazy in Love"]
+    assert index.suggest("beyo", limit=1) == [{"text": "Beyoncé", "kind": "artist", "score": 2.0}]
+    assert index.suggest("") == [] and index.suggest("zz") == []
+
+def test_typos_are_matched_and_scored_lower():
+    index = make_index()
+    assert index.suggest("bobyy") == [{"text": "Bobby Darin", "kind": "artist", "score": 0.25}]
+    assert texts(index.suggest("halleluja")) == ["Hallelujah"]
+    # Two typos are only allowed in longer prefixes
+    assert index.suggest("cazry") == []
+    assert texts(index.suggest("leanord co")) == ["Leonard Cohen"]
+
+def test_uncompacted_changes_are_suggested():
+    index = make_index()
+    index.index(5, entries("Beyoncé Medley", "Beyoncé"))
+    index.remove(4)
+    index.index(1, entries("Halo (Live)", "Beyoncé"))
+    assert index.stats()["pending_changes"] > 0
+    expected = [
+        {"text": "Beyoncé", "kind": "artist", "score": 3.0},
+        {"text": "Beyoncé Medley", "kind": "song", "score": 1.0},
+    ]
+    assert index.suggest("beyo") == expected
+    assert texts(index.suggest("halo", limit=1)) == ["Halo (Live)"]
+    index.compact()
+    assert index.suggest("beyo") == expected
+    assert index.stats()["pending_changes"] == 0
+
+def test_delta_and_compacted_arrays_agree():
+    rng = random.Random(7)
+    words = ["love", "lover", "lonely", "night", "nights", "light", "blue", "blues", "moon"]
+    live, batched = SuggestIndex(compact_min_changes=1 << 30), SuggestIndex(compact_min_changes=1 << 30)
+    for doc_id in range(300):
+        row = entries(" ".join(rng.sample(words, 2)), rng.choice(words).title())
+        live.index(doc_id, row)
+        batched.load(doc_id, row)
+        if doc_id % 7 == 0:
+            live.remove(doc_id // 2)
+            batched.remove(doc_id // 2)
+    batched.compact()
+    for prefix in ["l", "lo", "love", "lovr", "nigth", "blu", "moon l", "x"]:
+        assert live.suggest(prefix, 5) == batched.suggest(prefix, 5)
+
+def test_memory_footprint_is_reported():
+    index = make_index()
+    assert index.stats()["entries"] == 7
+    assert index.stats()["memory_bytes"] == index.memory_bytes() > 0
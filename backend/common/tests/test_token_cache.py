@@ -0,0 +1,47 @@
+from backend.common.auth.token_cache import VerifiedTokenCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_hits_return_copies_and_count():
+    cache = VerifiedTokenCache(clock=FakeClock())
+    assert cache.get("a.b.c") is None
+    cache.put("a.b.c", {"sub": "1", "exp": 2000})
+    payload = cache.get("a.b.c")
+    payload["role"] = "admin"
+    assert cache.get("a.b.c") == {"sub": "1", "exp": 2000}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (2, 1, 2 / 3)
+
+def test_entries_expire_at_exp_or_max_ttl():
+    clock = FakeClock()
+    cache = VerifiedTokenCache(max_ttl=300, clock=clock)
+    cache.put("short", {"exp": 1010})
+    cache.put("long", {"exp": 99999})
+    cache.put("expired", {"exp": 900})
+    clock.now = 1010
+    assert cache.get("short") is None
+    assert cache.get("long") is not None
+    assert cache.get("expired") is None
+    clock.now = 1300
+    assert cache.get("long") is None
+    assert cache.stats()["expirations"] == 2
+
+def test_least_recently_used_token_is_evicted():
+    cache = VerifiedTokenCache(max_entries=2, clock=FakeClock())
+    cache.put("a", {"exp": 2000})
+    cache.put("b", {"exp": 2000})
+    cache.get("a")
+    cache.put("c", {"exp": 2000})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+def test_zero_entries_disables_caching():
+    cache = VerifiedTokenCache(max_entries=0, clock=FakeClock())
+    cache.put("a", {"exp": 2000})
+    assert cache.get("a") is None
@@ -0,0 +1,55 @@
+import time
+from typing import Callable
+
+class CircuitBreaker:
+    """
+    Stops calling a dependency that keeps failing.
+
+    closed    - calls go through; failure_threshold consecutive failures open the circuit
+    open      - calls are refused until reset_timeout seconds have passed
+    half-open - one trial call is let through; its success closes the circuit,
+                its failure opens it again for another reset_timeout
+    """
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may be made now."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release(self) -> None:
+        """
+        End a call without recording an outcome, e.g. when it was cancelled.
+        Lets the next call be the half-open trial instead of the breaker waiting on one that never ends.
+        """
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
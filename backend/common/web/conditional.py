@@ -0,0 +1,102 @@
+"""
+HTTP conditional GET helpers for the catalogue endpoints.
+
+Validators are derived from row versions: a row's version is its updated_at,
+or created_at for a row that was never updated. Both are computed from the
+loaded models, so If-None-Match / If-Modified-Since can be answered with an
+empty 304 before the body is validated against the response model and encoded.
+"""
+
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional, Tuple
+from dotenv import load_dotenv
+from fastapi import Request, Response
+load_dotenv()
+
+# Single rows: clients may reuse their copy briefly, then revalidate
+ITEM_CACHE_CONTROL = os.getenv("ITEM_CACHE_CONTROL", "private, max-age=60, must-revalidate")
+# Pages and batches change whenever a row is added or removed, so always revalidate
+LIST_CACHE_CONTROL = os.getenv("LIST_CACHE_CONTROL", "private, no-cache")
+# Lists served without authentication may also be stored by shared caches
+PUBLIC_LIST_CACHE_CONTROL = os.getenv("PUBLIC_LIST_CACHE_CONTROL", "public, no-cache")
+
+def row_version(model) -> Optional[datetime]:
+    """The version of a row: when it was last updated, or created if never updated."""
+    return getattr(model, "updated_at", None) or getattr(model, "created_at", None)
+
+def _http_time(value: datetime) -> datetime:
+    """Timestamps are stored naive in UTC; HTTP dates only carry whole seconds."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+def _weak_etag(parts: Iterable[str]) -> str:
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return f'W/"{digest.hexdigest()[:32]}"'
+
+def _version_part(model) -> str:
+    version = row_version(model)
+    return f"{model.id}@{version.isoformat() if version else ''}"
+
+def entity_validators(model) -> Tuple[str, Optional[datetime]]:
+    """ETag and Last-Modified of a response holding a single row."""
+    return _weak_etag([_version_part(model)]), row_version(model)
+
+def collection_validators(models: Iterable, *extra) -> Tuple[str, Optional[datetime]]:
+    """
+    ETag of a response holding several rows, e.g. a page and its cursor.
+    No Last-Modified is given: removing a row does not move the newest version
+    forward, so only the ETag, which covers every ID, detects it.
+    """
+    parts = [_version_part(model) for model in models]
+    parts.extend(repr(part) for part in extra)
+    return _weak_etag(parts), None
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of etag against an If-None-Match header."""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return _http_time(last_modified) <= since
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime],
+    cache_control: str
+) -> Optional[Response]:
+    """
+    Set ETag, Last-Modified and Cache-Control on response and evaluate the request's preconditions.
+    If-None-Match takes precedence over If-Modified-Since, as in RFC 9110.
+    :return: An empty 304 response when the client's copy is current, None when the body must be sent.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_http_time(last_modified), usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        fresh = bool(if_modified_since and last_modified and _not_modified_since(if_modified_since, last_modified))
+    if fresh:
+        return Response(status_code=304, headers=headers)
+    return None
@@ -0,0 +1,82 @@
+"""
+Helpers for the batch endpoints.
+
+Multi-get (`GET /songs?ids=1,2,3`) resolves the IDs with a single
+`WHERE id IN (...)` query, puts the results back into request order and
+reports the IDs that matched no row.
+
+Bulk writes (`POST|PATCH|DELETE /songs:batch`) validate every item on its
+own so the caller gets one error entry per bad item, then apply the whole
+batch in a single transaction.
+"""
+
+import os
+import json
+from typing import Callable, List, Optional, Tuple, Type
+from pydantic import BaseModel, ValidationError
+from dotenv import load_dotenv
+load_dotenv()
+
+MAX_BATCH_IDS = int(os.getenv("MAX_BATCH_IDS", "100"))
+MAX_BULK_ITEMS = int(os.getenv("MAX_BULK_ITEMS", "1000"))
+
+def parse_id_list(raw: str, max_ids: int = None) -> List[int]:
+    """
+    Parse a comma-separated list of IDs, dropping duplicates but keeping first-seen order.
+    :raises ValueError: if an ID is not a non-negative integer or there are too many IDs.
+    """
+    max_ids = max_ids or MAX_BATCH_IDS
+    ids = []
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdigit():
+            raise ValueError(f"Invalid id '{part}'")
+        ids.append(int(part))
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise ValueError("At least one id is required")
+    if len(ids) > max_ids:
+        raise ValueError(f"At most {max_ids} ids can be requested at once")
+    return ids
+
+def order_by_request(rows: list, ids: List[int], key: Callable = lambda row: row.id) -> Tuple[list, List[int]]:
+    """
+    Reorder rows to match the requested IDs.
+    :return: (rows in request order, requested IDs that matched no row)
+    """
+    by_id = {key(row): row for row in rows}
+    return [by_id[i] for i in ids if i in by_id], [i for i in ids if i not in by_id]
+
+def validate_items(
+    items: list, model: Type[BaseModel], unique_key: Optional[str] = None, check: Optional[Callable] = None
+) -> Tuple[list, List[dict]]:
+    """
+    Validate each raw item of a bulk request against model, then against check when given:
+    the conversion the single-item endpoint applies, raising ValueError for a bad item.
+    :return: (validated models, one {"index", "errors"} entry per invalid item)
+    """
+    if len(items) > MAX_BULK_ITEMS:
+        return [], [{"index": None, "errors": [f"At most {MAX_BULK_ITEMS} items can be sent at once"]}]
+    validated, errors, seen = [], [], set()
+    for index, item in enumerate(items):
+        try:
+            obj = model.model_validate(item)
+        except ValidationError as e:
+            errors.append({"index": index, "errors": json.loads(e.json(include_url=False))})
+            continue
+        if check is not None:
+            try:
+                check(obj)
+            except ValueError as e:
+                errors.append({"index": index, "errors": [str(e)]})
+                continue
+        if unique_key is not None:
+            key = getattr(obj, unique_key)
+            if key in seen:
+                errors.append({"index": index, "errors": [f"Duplicate {unique_key} {key}"]})
+                continue
+            seen.add(key)
+        validated.append(obj)
+    return validated, errors
@@ -0,0 +1,82 @@
+"""
+One-shot schema bootstrap / migration command.
+
+Run once per deploy, before the services start, with credentials allowed to
+issue DDL:
+
+    PYTHONPATH=. python -m backend.database.bootstrap
+    PYTHONPATH=. python -m backend.database.bootstrap --database-url sqlite:///music.db
+
+Applied versions are recorded in the SCHEMA_VERSION table, so running the
+command again only applies migrations that are newer than the database.
+"""
+
+import argparse
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, create_engine, select, func
+from backend.database.migrations.versions import MIGRATIONS
+
+# Kept out of Base.metadata so model-level create_all calls never touch it
+schema_metadata = MetaData()
+
+schema_version = Table(
+    "SCHEMA_VERSION",
+    schema_metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+def current_version(connection) -> int:
+    """Return the highest applied migration version, or 0 for an empty database."""
+    schema_metadata.create_all(connection, tables=[schema_version])
+    return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+def run_migrations(engine, target_version: int = None) -> list[int]:
+    """
+    Apply every pending migration up to target_version (default: latest).
+    Each migration runs in its own transaction together with its SCHEMA_VERSION row.
+    :return: The versions that were applied by this call.
+    """
+    with engine.begin() as connection:
+        applied_version = current_version(connection)
+
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version <= applied_version:
+            continue
+        if target_version is not None and migration.version > target_version:
+            break
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(schema_version.insert().values(
+                version=migration.version,
+                description=migration.description,
+                applied_at=datetime.utcnow(),
+            ))
+        applied.append(migration.version)
+    return applied
+
+def main(argv=None) -> None:
+    from backend.database.connector.connector import resolve_database_url
+
+    parser = argparse.ArgumentParser(description="Create or upgrade the MusicPlayer database schema.")
+    parser.add_argument("--database-url", default=None, help="Defaults to DATABASE_URL / DB_* environment variables.")
+    parser.add_argument("--target", type=int, default=None, help="Stop after this schema version.")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url or resolve_database_url())
+    try:
+        applied = run_migrations(engine, target_version=args.target)
+        with engine.begin() as connection:
+            version = current_version(connection)
+    finally:
+        engine.dispose()
+
+    if applied:
+        print(f"Applied migrations {applied}; schema is at version {version}")
+    else:
+        print(f"Schema already at version {version}; nothing to do")
+
+if __name__ == "__main__":
+    main()
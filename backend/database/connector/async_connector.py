@@ -0,0 +1,19 @@
+from backend.database.connector.connector import resolve_database_url
+from backend.database.connector.engine_registry import engine_registry, to_async_url
+
+class AsyncDatabaseConnector:
+    """
+    Runtime connector handing out AsyncSession objects from the shared AsyncEngine.
+
+    DATABASE_URL keeps naming the sync driver (e.g. postgresql://, mssql+pyodbc://);
+    the matching asyncio driver (asyncpg, aioodbc, aiomysql, aiosqlite) is swapped in here.
+    Like DatabaseConnector it never issues DDL.
+    """
+    def __init__(self, registry=None, database_url: str = None):
+        self.DATABASE_URL = to_async_url(database_url or resolve_database_url())
+        self.registry = registry or engine_registry
+        self.engine = self.registry.get_async_engine(self.DATABASE_URL)
+        self.SessionLocal = self.registry.get_async_session_factory(self.DATABASE_URL)
+
+    def get_session(self):
+        return self.SessionLocal()
@@ -1,27 +1,51 @@
 import os
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 from backend.database.models.base import Base
 from backend.database.models.album_model import Album
 from backend.database.models.song_model import Song
 from backend.database.models.user_model import User
+from backend.database.connector.engine_registry import engine_registry
 load_dotenv()
 
+def resolve_database_url() -> str:
+    """Build the database URL from DATABASE_URL or the individual DB_* variables."""
+    db_user = os.getenv("DB_USER")
+    db_password = os.getenv("DB_PASSWORD")
+    db_host = os.getenv("DB_HOST", "localhost")
+    db_port = os.getenv("DB_PORT", "3306")
+    db_name = os.getenv("DB_NAME")
+    db_driver = os.getenv("DB_DRIVER", "ODBC Driver 18 for SQL Server")
+    return os.getenv("DATABASE_URL") or (
+        f"mssql+pyodbc://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}?driver={db_driver.replace(' ', '+')}"
+    )
+
 class DatabaseConnector:
-    def __init__(self):
+    """
+    Runtime connector. It never issues DDL unless DB_AUTO_MIGRATE is enabled, so
+    services can run with read/write-only credentials once the schema has been
+    created by `python -m backend.database.bootstrap`.
+    """
+    _migrated_urls = set()
+
+    def __init__(self, registry=None, auto_migrate: bool = None):
         self.DB_USER = os.getenv("DB_USER")
         self.DB_PASSWORD = os.getenv("DB_PASSWORD")
         self.DB_HOST = os.getenv("DB_HOST", "localhost")
         self.DB_PORT = os.getenv("DB_PORT", "3306")
         self.DB_NAME = os.getenv("DB_NAME")
-        self.DATABASE_URL = os.getenv("DATABASE_URL") or (
-            f"mssql+pyodbc://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}?driver={self.DB_DRIVER.replace(' ', '+')}"
-        )
-        self.engine = create_engine(self.DATABASE_URL, echo=True)
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.DATABASE_URL = resolve_database_url()
+        # Engines and their pools are shared per DATABASE_URL across the whole process
+        self.registry = registry or engine_registry
+        self.engine = self.registry.get_engine(self.DATABASE_URL)
+        self.SessionLocal = self.registry.get_session_factory(self.DATABASE_URL)
 
-        Base.metadata.create_all(bind=self.engine)
+        if auto_migrate is None:
+            auto_migrate = os.getenv("DB_AUTO_MIGRATE", "false").strip().lower() in ("1", "true", "yes", "on")
+        if auto_migrate and self.DATABASE_URL not in DatabaseConnector._migrated_urls:
+            # Local development convenience only; deploys run the bootstrap command instead
+            from backend.database.bootstrap import run_migrations
+            run_migrations(self.engine)
+            DatabaseConnector._migrated_urls.add(self.DATABASE_URL)
 
     def get_session(self):
-        return self.SessionLocal()
\ No newline at end of file
+        return self.SessionLocal()
@@ -0,0 +1,160 @@
+import os
+import threading
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+load_dotenv()
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+def pool_settings_from_env() -> dict:
+    """
+    Read the connection pool tuning knobs from the environment.
+
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING and DB_ECHO map directly onto create_engine arguments.
+    """
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": _env_flag("DB_POOL_PRE_PING", "true"),
+        "echo": _env_flag("DB_ECHO", "false"),
+    }
+
+def engine_options_for_url(database_url: str, settings: dict) -> dict:
+    """
+    Drop the queue pool options SQLite does not understand.
+    """
+    if database_url.startswith("sqlite"):
+        return {key: settings[key] for key in ("pool_pre_ping", "echo") if key in settings}
+    return dict(settings)
+
+# Async driver used for each sync driver / backend name found in DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+    "mariadb": "aiomysql",
+    "mssql": "aioodbc",
+}
+
+def to_async_url(database_url: str) -> str:
+    """
+    Swap the driver of a sync database URL for its asyncio counterpart,
+    e.g. postgresql://... -> postgresql+asyncpg://...
+    URLs that already name an async driver are returned unchanged.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    async_driver = ASYNC_DRIVERS.get(backend)
+    if async_driver is None:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    if url.get_driver_name() == async_driver:
+        return database_url
+    return url.set(drivername=f"{backend}+{async_driver}").render_as_string(hide_password=False)
+
+class EngineRegistry:
+    """
+    Process-wide registry owning one engine and one session factory per database URL.
+
+    Engines hold the connection pool, so they must be created once at startup and
+    shared by every request instead of being rebuilt by each repository.
+    """
+    def __init__(self, pool_settings: dict = None):
+        self.pool_settings = pool_settings if pool_settings is not None else pool_settings_from_env()
+        self._engines = {}
+        self._session_factories = {}
+        self._async_engines = {}
+        self._async_session_factories = {}
+        self._lock = threading.Lock()
+
+    def get_engine(self, database_url: str):
+        """
+        Return the engine for database_url, creating it on first use.
+        """
+        engine = self._engines.get(database_url)
+        if engine is not None:
+            return engine
+        with self._lock:
+            engine = self._engines.get(database_url)
+            if engine is None:
+                engine = create_engine(database_url, **engine_options_for_url(database_url, self.pool_settings))
+                self._engines[database_url] = engine
+                self._session_factories[database_url] = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        return engine
+
+    def get_session_factory(self, database_url: str):
+        """
+        Return the sessionmaker bound to the shared engine for database_url.
+        """
+        self.get_engine(database_url)
+        return self._session_factories[database_url]
+
+    def get_async_engine(self, database_url: str):
+        """
+        Return the AsyncEngine for database_url (which must name an async driver),
+        creating it on first use.
+        """
+        engine = self._async_engines.get(database_url)
+        if engine is not None:
+            return engine
+        with self._lock:
+            engine = self._async_engines.get(database_url)
+            if engine is None:
+                engine = create_async_engine(database_url, **engine_options_for_url(database_url, self.pool_settings))
+                self._async_engines[database_url] = engine
+                # expire_on_commit=False: attributes cannot be lazily reloaded outside the session in async code
+                self._async_session_factories[database_url] = async_sessionmaker(
+                    bind=engine, autoflush=False, expire_on_commit=False
+                )
+        return engine
+
+    def get_async_session_factory(self, database_url: str):
+        """
+        Return the async_sessionmaker bound to the shared AsyncEngine for database_url.
+        """
+        self.get_async_engine(database_url)
+        return self._async_session_factories[database_url]
+
+    def dispose(self, database_url: str) -> None:
+        """
+        Close the pool for database_url and forget its engine.
+        """
+        with self._lock:
+            engine = self._engines.pop(database_url, None)
+            self._session_factories.pop(database_url, None)
+        if engine is not None:
+            engine.dispose()
+
+    async def dispose_async(self, database_url: str) -> None:
+        """
+        Close the async pool for database_url and forget its engine.
+        """
+        with self._lock:
+            engine = self._async_engines.pop(database_url, None)
+            self._async_session_factories.pop(database_url, None)
+        if engine is not None:
+            await engine.dispose()
+
+    def dispose_all(self) -> None:
+        """
+        Close every sync pool owned by the registry.
+        """
+        for database_url in list(self._engines):
+            self.dispose(database_url)
+
+    async def dispose_all_async(self) -> None:
+        """
+        Close every sync and async pool owned by the registry. Called from the app lifespan on shutdown.
+        """
+        self.dispose_all()
+        for database_url in list(self._async_engines):
+            await self.dispose_async(database_url)
+
+# Shared instance used by every service in this process
+engine_registry = EngineRegistry()
@@ -0,0 +1,34 @@
+"""
+Streaming export helpers shared by the catalogue export endpoints.
+
+Exports read the table through a server-side cursor in EXPORT_BATCH_SIZE
+partitions (`yield_per`) and emit each partition as one chunk of
+newline-delimited JSON, so memory stays bounded to a single batch no matter
+how many rows the table holds.
+"""
+
+import os
+from typing import AsyncIterator, Callable, Optional
+from dotenv import load_dotenv
+load_dotenv()
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+async def stream_partitions(session, statement, batch_size: Optional[int] = None) -> AsyncIterator[list]:
+    """
+    Yield the ORM objects selected by statement in lists of at most batch_size
+    (EXPORT_BATCH_SIZE by default).
+    The caller owns the session and must keep it open until iteration ends.
+    """
+    batch_size = batch_size or EXPORT_BATCH_SIZE
+    result = await session.stream_scalars(statement.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        # The identity map only holds weak references, so each batch is freed
+        # once the consumer has rendered it and moved on to the next one
+        yield partition
+
+async def ndjson_chunks(partitions: AsyncIterator[list], to_model: Callable) -> AsyncIterator[str]:
+    """Render each partition as one chunk of NDJSON, one pydantic model per line."""
+    async for partition in partitions:
+        yield "".join(to_model(row).model_dump_json() + "\n" for row in partition)
@@ -1,16 +1,17 @@
 from backend.database.connector.connector import DatabaseConnector as ProdDatabaseConnector
 from backend.database.connector.test_connector import TestConnector
+from backend.database.connector.async_connector import AsyncDatabaseConnector
 
 def create_connector(connector_type="prod", session_factory=None):
         """
         Create a database connector based on the specified type.
         
         Args:
-            connector_type (str): Type of connector ('prod' or 'test').
-            session_factory: Optional session factory for test connectors.
+            connector_type (str): Type of connector ('prod', 'async' or 'test').
+            session_factory: Optional session factory (sync or async) for test connectors.
         
         Returns:
-            DatabaseConnector or TestConnector: An instance of the appropriate connector.
+            DatabaseConnector, AsyncDatabaseConnector or TestConnector: An instance of the appropriate connector.
         """
         if connector_type == "test":
             if session_factory is None:
@@ -18,5 +19,7 @@ def create_connector(connector_type="prod", session_factory=None):
             return TestConnector(session_factory)
         elif connector_type == "prod":
             return ProdDatabaseConnector()
+        elif connector_type == "async":
+            return AsyncDatabaseConnector()
         else:
-            raise ValueError(f"Unknown connector_type: {connector_type}. Use 'prod' or 'test'.")
\ No newline at end of file
+            raise ValueError(f"Unknown connector_type: {connector_type}. Use 'prod', 'async' or 'test'.")
\ No newline at end of file
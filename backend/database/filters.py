@@ -0,0 +1,22 @@
+"""
+Filter predicates shared by the list endpoints.
+
+Each filterable column has a (column, id) index declared on its model, so an
+equality filter plus the keyset cursor is a single ordered index range, and a
+range filter is an index range scan whose matches are sorted by ID.
+"""
+
+from typing import Optional
+
+def equals(column, value: Optional[object]) -> list:
+    """column == value, or no predicate when value is None."""
+    return [] if value is None else [column == value]
+
+def between(column, low: Optional[object] = None, high: Optional[object] = None) -> list:
+    """Inclusive bounds on column for whichever of low and high are set."""
+    predicates = []
+    if low is not None:
+        predicates.append(column >= low)
+    if high is not None:
+        predicates.append(column <= high)
+    return predicates
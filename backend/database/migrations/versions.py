@@ -0,0 +1,103 @@
+"""
+Ordered schema migrations applied by backend.database.bootstrap.
+
+Every migration must be idempotent: it inspects the live schema before issuing
+DDL so that re-running a version against a database created by an older
+create_all() is harmless. Append new migrations with the next version number;
+never edit or reorder a migration that has already shipped.
+"""
+
+from sqlalchemy import inspect, select, update, func, text
+from sqlalchemy.schema import AddConstraint, CreateColumn
+from backend.database.models.base import Base
+from backend.database.models.album_model import Album
+from backend.database.models.song_model import Song
+from backend.database.models.user_model import User
+from backend.database.models.album_songs_model import album_songs
+from backend.database.models.user_likes import user_likes
+from backend.database.models.playlist_model import Playlist
+from backend.database.models.playlist_tracks_model import playlist_tracks
+
+class Migration:
+    def __init__(self, version: int, description: str, upgrade):
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+
+def _create_initial_schema(connection) -> None:
+    """Create the USERS, ALBUMS, SONGS, ALBUM_SONGS and USER_LIKES tables."""
+    tables = [User.__table__, Album.__table__, Song.__table__, album_songs, user_likes]
+    existing = set(inspect(connection).get_table_names())
+    Base.metadata.create_all(connection, tables=[t for t in tables if t.name not in existing])
+
+def _create_indexes(connection, table, names) -> None:
+    """Create the named indexes declared on table that the database does not have yet."""
+    existing = {index["name"] for index in inspect(connection).get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name in names and index.name not in existing:
+            index.create(connection)
+
+def _add_filter_indexes(connection) -> None:
+    """Index the SONGS and ALBUMS columns the list endpoints filter on."""
+    _create_indexes(connection, Song.__table__, {
+        "ix_songs_artist_id", "ix_songs_genre_id", "ix_songs_release_date_id", "ix_songs_duration_id"
+    })
+    _create_indexes(connection, Album.__table__, {"ix_albums_artist_id", "ix_albums_genre_id"})
+
+def add_column_ddl(table, column, dialect) -> str:
+    """ALTER TABLE adding column to table, in dialect's syntax (T-SQL has no COLUMN keyword)."""
+    definition = CreateColumn(column).compile(dialect=dialect)
+    name = dialect.identifier_preparer.format_table(table)
+    keyword = "ADD" if dialect.name == "mssql" else "ADD COLUMN"
+    return f"ALTER TABLE {name} {keyword} {definition}"
+
+def _add_column(connection, table, column) -> None:
+    """Add column to table unless the database already has it."""
+    if column.name not in {existing["name"] for existing in inspect(connection).get_columns(table.name)}:
+        connection.execute(text(add_column_ddl(table, column, connection.dialect)))
+
+def like_count_backfill():
+    """UPDATE setting every SONGS.like_count to its number of USER_LIKES rows."""
+    songs = Song.__table__
+    likes = select(func.count()).select_from(user_likes).where(user_likes.c.song_id == songs.c.id).scalar_subquery()
+    return update(songs).values(like_count=likes)
+
+def _add_song_like_counts(connection) -> None:
+    """Add SONGS.like_count, fill it from USER_LIKES and index it."""
+    songs = Song.__table__
+    _add_column(connection, songs, songs.c.like_count)
+    _create_indexes(connection, user_likes, {"ix_user_likes_song_id"})
+    # Counting here once is what lets reads never count
+    connection.execute(like_count_backfill())
+    _create_indexes(connection, songs, {"ix_songs_like_count_id"})
+
+def _create_playlists(connection) -> None:
+    """Create the PLAYLISTS and PLAYLIST_TRACKS tables."""
+    tables = [Playlist.__table__, playlist_tracks]
+    existing = set(inspect(connection).get_table_names())
+    Base.metadata.create_all(connection, tables=[t for t in tables if t.name not in existing])
+
+def _add_unique_playlist_positions(connection) -> None:
+    """Make (playlist_id, position) unique in PLAYLIST_TRACKS created by version 4 before it was."""
+    constraint = next(c for c in playlist_tracks.constraints if c.name == "uq_playlist_tracks_playlist_id_position")
+    inspector = inspect(connection)
+    existing = {c["name"] for c in inspector.get_unique_constraints(playlist_tracks.name)}
+    existing |= {index["name"] for index in inspector.get_indexes(playlist_tracks.name)}
+    if constraint.name in existing:
+        return
+    if connection.dialect.name == "sqlite":
+        # SQLite cannot add a constraint to an existing table; a unique index enforces the same
+        connection.execute(text(
+            f"CREATE UNIQUE INDEX {constraint.name} ON {connection.dialect.identifier_preparer.format_table(playlist_tracks)} "
+            "(playlist_id, position)"
+        ))
+    else:
+        connection.execute(AddConstraint(constraint))
+
+MIGRATIONS = [
+    Migration(1, "initial schema", _create_initial_schema),
+    Migration(2, "filter indexes on songs and albums", _add_filter_indexes),
+    Migration(3, "song like counts", _add_song_like_counts),
+    Migration(4, "playlists", _create_playlists),
+    Migration(5, "unique playlist positions", _add_unique_playlist_positions),
+]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from backend.database.models.base import Base
@@ -14,4 +14,9 @@ class Album(Base):
     cover_image_url = Column(String(255))
     created_at = Column(DateTime, nullable=False)
     updated_at = Column(DateTime)
-    songs = relationship("Song", secondary=album_songs, back_populates="albums")
\ No newline at end of file
+    songs = relationship("Song", secondary=album_songs, back_populates="albums")
+    # Back the /albums filters; id comes second so a filtered keyset page is one ordered index range
+    __table_args__ = (
+        Index("ix_albums_artist_id", artist, id),
+        Index("ix_albums_genre_id", genre, id),
+    )
\ No newline at end of file
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from backend.database.models.base import Base
+
+class Playlist(Base):
+    __tablename__ = "PLAYLISTS"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    owner_id = Column(Integer, ForeignKey("USERS.id"), nullable=False)
+    name = Column(String(100), nullable=False)
+    description = Column(String(500))
+    # Kept equal to the playlist's PLAYLIST_TRACKS rows by the track writes, so fetching a page never counts
+    track_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime)
+    __table_args__ = (
+        Index("ix_playlists_owner_id_id", owner_id, id),
+    )
@@ -0,0 +1,21 @@
+from sqlalchemy import Table, Column, Integer, BigInteger, ForeignKey, Index, UniqueConstraint
+from backend.database.models.base import Base
+
+# A song may appear in a playlist more than once, so each entry has its own id.
+# Entries are ordered by (position, id), and no two entries of a playlist share
+# a position. Positions are spaced apart, so an entry is inserted or moved by
+# giving it a position between its neighbours' instead of renumbering the rest
+# of the playlist.
+playlist_tracks = Table(
+    "PLAYLIST_TRACKS",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("playlist_id", Integer, ForeignKey("PLAYLISTS.id"), nullable=False),
+    Column("song_id", Integer, ForeignKey("SONGS.id"), nullable=False),
+    Column("position", BigInteger, nullable=False),
+    UniqueConstraint("playlist_id", "position", name="uq_playlist_tracks_playlist_id_position"),
+    # A page of a playlist is one ordered range of this index
+    Index("ix_playlist_tracks_playlist_id_position", "playlist_id", "position", "id"),
+    # Serves removing a deleted song from every playlist
+    Index("ix_playlist_tracks_song_id", "song_id"),
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from backend.database.models.base import Base
 from backend.database.models.album_songs_model import album_songs
@@ -17,5 +17,16 @@ class Song(Base):
     release_date = Column(DateTime)
     created_at = Column(DateTime, nullable=False)
     updated_at = Column(DateTime)
+    # Kept equal to the song's USER_LIKES rows by the like/unlike writes, so nothing counts them at read time
+    like_count = Column(Integer, nullable=False, default=0, server_default="0")
     albums = relationship("Album", secondary=album_songs, back_populates="songs")
-    user_likes = relationship("User", secondary=user_likes, back_populates="likes")
\ No newline at end of file
+    user_likes = relationship("User", secondary=user_likes, back_populates="likes")
+    # Back the /songs filters; id comes second so a filtered keyset page is one ordered index range
+    __table_args__ = (
+        Index("ix_songs_artist_id", artist, id),
+        Index("ix_songs_genre_id", genre, id),
+        Index("ix_songs_release_date_id", release_date, id),
+        Index("ix_songs_duration_id", duration, id),
+        # Most-liked first is a backward scan of this index
+        Index("ix_songs_like_count_id", like_count, id),
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Integer, ForeignKey, Index
 from backend.database.models.base import Base
 
 user_likes = Table(
@@ -6,4 +6,6 @@ user_likes = Table(
     Base.metadata,
     Column("user_id", Integer, ForeignKey("USERS.id"), primary_key=True),
     Column("song_id", Integer, ForeignKey("SONGS.id"), primary_key=True),
+    # The primary key serves lookups by user; this one serves lookups and deletes by song
+    Index("ix_user_likes_song_id", "song_id"),
 )
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Gap-based position keys for user-ordered rows (playlist tracks).
+
+Rows are ordered by an integer position, and neighbouring positions start
+POSITION_GAP apart. Inserting or moving a row gives it a position between its
+new neighbours, so it writes that one row instead of renumbering everything
+after it. Only once repeated inserts at one spot use up a gap are the rows
+around it spread out again, and only as many of them as it takes.
+"""
+
+import os
+from typing import List, Optional
+from dotenv import load_dotenv
+load_dotenv()
+
+# Distance between the positions of neighbouring rows when they are (re)numbered
+POSITION_GAP = int(os.getenv("POSITION_GAP", str(1 << 20)))
+# Rows around a full gap are respaced over a range averaging at least this per row
+MIN_RESPACE_GAP = int(os.getenv("MIN_RESPACE_GAP", "1024"))
+
+def spread(low: int, high: int, count: int, min_gap: int = 1) -> Optional[List[int]]:
+    """
+    count evenly spaced positions strictly between low and high.
+    :return: The positions in ascending order, or None when they would be less than min_gap apart.
+    """
+    step = (high - low) // (count + 1)
+    if step < min_gap:
+        return None
+    return [low + step * (i + 1) for i in range(count)]
+
+def appended(last: Optional[int], count: int) -> List[int]:
+    """Positions for count rows added after the row at position last (None when there are no rows)."""
+    start = POSITION_GAP if last is None else last + POSITION_GAP
+    return [start + POSITION_GAP * i for i in range(count)]
@@ -0,0 +1,58 @@
+"""
+Keyset (cursor) pagination helpers shared by the list endpoints.
+
+Pages are ordered by a unique, indexed key (the primary key) and the cursor
+is the last key of the previous page, so fetching any page is an index range
+scan of `limit + 1` rows no matter how deep into the table it is.
+"""
+
+import os
+from typing import Optional, Tuple
+from dotenv import load_dotenv
+from sqlalchemy import and_, or_
+load_dotenv()
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+
+def keyset_window(statement, key_column, limit: int, after: Optional[int] = None):
+    """
+    Restrict a select to the page following `after`.
+    One extra row is fetched so the caller can tell whether another page exists.
+    """
+    if after is not None:
+        statement = statement.where(key_column > after)
+    return statement.order_by(key_column).limit(limit + 1)
+
+def composite_keyset_window(statement, key_columns: list, limit: int, after: Optional[tuple] = None):
+    """
+    keyset_window for a key spanning several columns, e.g. (position, id).
+    "After" is spelled (a > :a) OR (a = :a AND b > :b), which every dialect
+    accepts (row-value comparisons are not valid T-SQL) and serves from an
+    index on the columns.
+    """
+    if after is not None:
+        statement = statement.where(or_(*(
+            and_(*(column == value for column, value in zip(key_columns[:i], after[:i])), key_columns[i] > after[i])
+            for i in range(len(key_columns))
+        )))
+    return statement.order_by(*key_columns).limit(limit + 1)
+
+# A composite cursor is its integer parts joined by ":", e.g. "1048576:42"
+COMPOSITE_CURSOR_PATTERN = r"^-?\d+(:-?\d+)+$"
+
+def encode_cursor(key: tuple) -> str:
+    return ":".join(str(part) for part in key)
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[int, ...]]:
+    return None if cursor is None else tuple(int(part) for part in cursor.split(":"))
+
+def split_page(rows: list, limit: int, key=lambda row: row.id):
+    """
+    Trim the extra look-ahead row fetched by keyset_window.
+    :return: (rows for this page, cursor for the next page or None on the last page)
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, key(rows[-1])
+    return rows, None
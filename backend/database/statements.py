@@ -0,0 +1,130 @@
+"""
+Single-statement write helpers for the async repositories.
+
+Instead of SELECT, mutate, COMMIT and refresh, an update is one
+`UPDATE ... WHERE id = :id RETURNING *` and a delete is one
+`DELETE ... WHERE id = :id` whose rowcount tells whether the row existed.
+Dialects without UPDATE ... RETURNING (MySQL/MariaDB) fall back to UPDATE
+followed by a primary key lookup.
+"""
+
+from typing import List, Optional
+from sqlalchemy import and_, or_, insert, select, update, delete
+
+def column_values(model, data: dict) -> dict:
+    """Keep only the keys of data that are columns of model's table."""
+    columns = model.__table__.columns.keys()
+    return {key: value for key, value in data.items() if key in columns}
+
+async def update_returning(session, model, key, values: dict):
+    """
+    UPDATE one row by primary key and return the updated ORM object.
+    :return: The updated object, or None when no row has that key.
+    """
+    if not values:
+        return await session.get(model, key)
+    statement = (
+        update(model)
+        .where(model.id == key)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if session.get_bind().dialect.update_returning:
+        return (await session.scalars(statement.returning(model))).first()
+    result = await session.execute(statement)
+    if result.rowcount == 0:
+        return None
+    return await session.get(model, key, populate_existing=True)
+
+async def delete_by_key(session, model, key) -> bool:
+    """DELETE one row by primary key. :return: False when no row has that key."""
+    result = await session.execute(
+        delete(model).where(model.id == key).execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
+
+# Bound parameters per statement on the generic paths; SQL Server takes at most 2100,
+# and at most 1000 rows in one VALUES list
+MAX_PARAMETERS = 2000
+
+def _chunks(items: list, width: int) -> List[list]:
+    """items split so that no chunk binds more than MAX_PARAMETERS values, width per item."""
+    size = max(1, min(1000, MAX_PARAMETERS // width))
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+def _key_columns(table) -> list:
+    return list(table.primary_key.columns)
+
+def _key_match(columns: list, keys: List[tuple]):
+    """
+    Rows whose primary key is one of keys. Composite keys become (a = :a AND b = :b) OR ...,
+    since row-value IN lists are not valid T-SQL.
+    """
+    if len(columns) == 1:
+        return columns[0].in_([key[0] for key in keys])
+    return or_(*(and_(*(column == value for column, value in zip(columns, key))) for key in keys))
+
+def _locking_select(table, keys: List[tuple]):
+    """SELECT of those of keys that exist, locking them and the gaps where missing ones would go until commit."""
+    columns = _key_columns(table)
+    # FOR UPDATE is not rendered on MSSQL: UPDLOCK takes the row locks there, HOLDLOCK the key ranges
+    return (
+        select(*columns)
+        .where(_key_match(columns, keys))
+        .with_for_update()
+        .with_hint(table, "WITH (UPDLOCK, HOLDLOCK)", "mssql")
+    )
+
+async def _locked_keys(session, table, keys: List[tuple]) -> List[tuple]:
+    """Those of keys that exist, locked (with the gaps where missing ones would go) until commit."""
+    found = []
+    for chunk in _chunks(keys, len(_key_columns(table))):
+        found += [tuple(row) for row in (await session.execute(_locking_select(table, chunk))).all()]
+    return found
+
+async def insert_missing(session, table, rows: List[dict]) -> List[tuple]:
+    """
+    INSERT rows in one multi-row statement (per MAX_PARAMETERS values where
+    conflicts are not skipped natively), skipping those whose primary key
+    already exists (ON CONFLICT DO NOTHING ... RETURNING where supported).
+    :return: The primary keys of the rows actually inserted.
+    """
+    columns = _key_columns(table)
+    rows = list({tuple(row[column.name] for column in columns): row for row in rows}.values())
+    if not rows:
+        return []
+    dialect = session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        statement = dialect_insert(table).values(rows).on_conflict_do_nothing().returning(*columns)
+        return [tuple(row) for row in (await session.execute(statement)).all()]
+    # No RETURNING for skipped conflicts: lock out concurrent inserts of these keys, then insert the rest
+    keys = [tuple(row[column.name] for column in columns) for row in rows]
+    existing = set(await _locked_keys(session, table, keys))
+    rows = [row for row, key in zip(rows, keys) if key not in existing]
+    for chunk in _chunks(rows, len(table.columns)):
+        await session.execute(insert(table).values(chunk))
+    return [key for key in keys if key not in existing]
+
+async def delete_keys(session, table, keys: List[tuple]) -> List[tuple]:
+    """
+    DELETE the rows with the given primary keys, in one statement per MAX_PARAMETERS keys.
+    :return: The keys of the rows that existed.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return []
+    columns = _key_columns(table)
+    if session.get_bind().dialect.delete_returning:
+        deleted = []
+        for chunk in _chunks(keys, len(columns)):
+            statement = delete(table).where(_key_match(columns, chunk)).returning(*columns)
+            deleted += [tuple(row) for row in (await session.execute(statement)).all()]
+        return deleted
+    existing = await _locked_keys(session, table, keys)
+    for chunk in _chunks(existing, len(columns)):
+        await session.execute(delete(table).where(_key_match(columns, chunk)))
+    return existing
@@ -0,0 +1,135 @@
+import pytest
+from sqlalchemy import create_engine, inspect, select, insert, text
+from sqlalchemy.exc import IntegrityError
+from backend.database.bootstrap import run_migrations, current_version
+from backend.database.migrations.versions import MIGRATIONS, add_column_ddl, like_count_backfill
+from backend.database.pagination import composite_keyset_window
+from backend.database.models.base import Base
+from backend.database.models.song_model import Song
+from backend.database.models.album_model import Album
+from backend.database.models.user_likes import user_likes
+from backend.database.models.playlist_tracks_model import playlist_tracks
+from backend.database.connector.connector import DatabaseConnector
+from backend.database.connector.engine_registry import EngineRegistry
+
+LATEST_VERSION = max(m.version for m in MIGRATIONS)
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bootstrap.db'}")
+    yield engine
+    engine.dispose()
+
+def test_bootstrap_creates_schema_and_records_version(engine):
+    applied = run_migrations(engine)
+
+    assert applied == [m.version for m in sorted(MIGRATIONS, key=lambda m: m.version)]
+    tables = set(inspect(engine).get_table_names())
+    assert {"USERS", "ALBUMS", "SONGS", "ALBUM_SONGS", "USER_LIKES", "SCHEMA_VERSION"} <= tables
+    with engine.begin() as connection:
+        assert current_version(connection) == LATEST_VERSION
+
+def test_bootstrap_is_idempotent(engine):
+    run_migrations(engine)
+    assert run_migrations(engine) == []
+
+def test_bootstrap_adopts_schema_created_by_create_all(engine):
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    with engine.begin() as connection:
+        assert current_version(connection) == LATEST_VERSION
+
+def test_filter_indexes_are_added_to_an_existing_schema(engine):
+    run_migrations(engine, target_version=1)
+    with engine.begin() as connection:
+        # A version 1 database created before the indexes were declared
+        for table in (Song.__table__, Album.__table__):
+            for index in table.indexes:
+                index.drop(connection)
+
+    assert 2 in run_migrations(engine)
+    assert {"ix_songs_artist_id", "ix_songs_duration_id"} <= {i["name"] for i in inspect(engine).get_indexes("SONGS")}
+    assert {"ix_albums_artist_id", "ix_albums_genre_id"} <= {i["name"] for i in inspect(engine).get_indexes("ALBUMS")}
+
+def test_filtered_keyset_page_is_an_index_range(engine):
+    run_migrations(engine)
+    statement = select(Song).where(Song.artist == "Queen", Song.id > 10).order_by(Song.id).limit(51)
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as connection:
+        plan = " ".join(str(row[-1]) for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}"))
+    assert "USING INDEX ix_songs_artist_id" in plan and "TEMP B-TREE" not in plan
+
+def test_playlist_page_is_an_index_range_joined_to_songs(engine):
+    run_migrations(engine)
+    statement = composite_keyset_window(
+        select(playlist_tracks.c.id, Song)
+        .join(Song, Song.id == playlist_tracks.c.song_id)
+        .where(playlist_tracks.c.playlist_id == 1),
+        [playlist_tracks.c.position, playlist_tracks.c.id], 50, (1048576, 7)
+    )
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as connection:
+        plan = " ".join(str(row[-1]) for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}"))
+    assert "ix_playlist_tracks_playlist_id_position" in plan and "TEMP B-TREE" not in plan
+    assert "INTEGER PRIMARY KEY" in plan
+
+def test_like_counts_are_added_and_backfilled(engine):
+    run_migrations(engine, target_version=2)
+    with engine.begin() as connection:
+        # A version 2 database from before SONGS.like_count existed
+        connection.execute(text("DROP INDEX ix_songs_like_count_id"))
+        connection.execute(text("DROP INDEX ix_user_likes_song_id"))
+        connection.execute(text('ALTER TABLE "SONGS" DROP COLUMN like_count'))
+        for song_id in (1, 2):
+            connection.execute(text(
+                'INSERT INTO "SONGS" (id, title, artist, genre, file_url, created_at) '
+                f"VALUES ({song_id}, 'Song', 'Artist', 'Genre', 'url', '2024-01-01')"
+            ))
+        connection.execute(insert(user_likes), [{"user_id": 1, "song_id": 1}, {"user_id": 2, "song_id": 1}])
+
+    assert 3 in run_migrations(engine)
+    with engine.connect() as connection:
+        assert dict(connection.execute(select(Song.id, Song.like_count).order_by(Song.id)).all()) == {1: 2, 2: 0}
+    assert "ix_songs_like_count_id" in {i["name"] for i in inspect(engine).get_indexes("SONGS")}
+
+def test_playlist_positions_are_made_unique(engine):
+    run_migrations(engine, target_version=4)
+    with engine.begin() as connection:
+        # PLAYLIST_TRACKS as version 4 created it before positions were unique
+        connection.execute(text('DROP TABLE "PLAYLIST_TRACKS"'))
+        connection.execute(text(
+            'CREATE TABLE "PLAYLIST_TRACKS" (id INTEGER PRIMARY KEY, playlist_id INTEGER NOT NULL, '
+            'song_id INTEGER NOT NULL, position BIGINT NOT NULL)'
+        ))
+
+    assert 5 in run_migrations(engine)
+    assert run_migrations(engine) == []
+    rows = [{"playlist_id": 1, "song_id": 1, "position": 1024}, {"playlist_id": 1, "song_id": 2, "position": 1024}]
+    with pytest.raises(IntegrityError):
+        with engine.begin() as connection:
+            connection.execute(insert(playlist_tracks), rows)
+
+@pytest.mark.parametrize("dialect_name", ["postgresql", "mysql", "mssql", "sqlite"])
+def test_like_count_migration_compiles_for_every_dialect(dialect_name):
+    from sqlalchemy.dialects import registry
+    from sqlalchemy.schema import CreateIndex
+    dialect = registry.load(dialect_name)()
+    songs = Song.__table__
+    ddl = add_column_ddl(songs, songs.c.like_count, dialect)
+    # T-SQL rejects ADD COLUMN
+    keyword = "ADD" if dialect_name == "mssql" else "ADD COLUMN"
+    assert f" {keyword} like_count INTEGER" in ddl and "NOT NULL" in ddl and "DEFAULT '0'" in ddl
+    assert "like_count=(SELECT count(*)" in str(like_count_backfill().compile(dialect=dialect)).replace(" = ", "=")
+    for index in (user_likes.indexes | songs.indexes):
+        str(CreateIndex(index).compile(dialect=dialect))
+
+def test_connector_issues_no_ddl_by_default(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'runtime.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    monkeypatch.delenv("DB_AUTO_MIGRATE", raising=False)
+    registry = EngineRegistry(pool_settings={"pool_pre_ping": False, "echo": False})
+
+    connector = DatabaseConnector(registry=registry)
+
+    assert inspect(connector.engine).get_table_names() == []
+    registry.dispose_all()
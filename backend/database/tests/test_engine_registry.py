@@ -0,0 +1,53 @@
+import pytest
+from backend.database.connector.engine_registry import EngineRegistry, engine_options_for_url, to_async_url
+
+@pytest.fixture
+def registry():
+    registry = EngineRegistry(pool_settings={
+        "pool_size": 2,
+        "max_overflow": 1,
+        "pool_timeout": 5,
+        "pool_recycle": 60,
+        "pool_pre_ping": True,
+        "echo": False,
+    })
+    yield registry
+    registry.dispose_all()
+
+def test_same_url_shares_engine_and_session_factory(registry, tmp_path):
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+    assert registry.get_engine(url) is registry.get_engine(url)
+    assert registry.get_session_factory(url) is registry.get_session_factory(url)
+
+def test_different_urls_get_different_engines(registry, tmp_path):
+    first = registry.get_engine(f"sqlite:///{tmp_path / 'first.db'}")
+    second = registry.get_engine(f"sqlite:///{tmp_path / 'second.db'}")
+    assert first is not second
+
+def test_session_factory_is_bound_to_shared_engine(registry, tmp_path):
+    url = f"sqlite:///{tmp_path / 'bound.db'}"
+    session = registry.get_session_factory(url)()
+    assert session.get_bind() is registry.get_engine(url)
+    session.close()
+
+def test_dispose_all_forgets_engines(registry, tmp_path):
+    url = f"sqlite:///{tmp_path / 'disposed.db'}"
+    engine = registry.get_engine(url)
+    registry.dispose_all()
+    assert registry.get_engine(url) is not engine
+
+def test_queue_pool_options_are_not_passed_to_sqlite():
+    settings = {"pool_size": 5, "max_overflow": 10, "pool_pre_ping": True, "echo": False}
+    assert engine_options_for_url("sqlite:///music.db", settings) == {"pool_pre_ping": True, "echo": False}
+    assert engine_options_for_url("postgresql://localhost/music_db", settings) == settings
+
+def test_to_async_url_swaps_in_asyncio_drivers():
+    assert to_async_url("sqlite:///music.db") == "sqlite+aiosqlite:///music.db"
+    assert to_async_url("postgresql://user:pw@db:5432/music_db") == "postgresql+asyncpg://user:pw@db:5432/music_db"
+    assert to_async_url("mysql+pymysql://user:pw@db/music_db") == "mysql+aiomysql://user:pw@db/music_db"
+    assert to_async_url("postgresql+asyncpg://user:pw@db/music_db") == "postgresql+asyncpg://user:pw@db/music_db"
+
+def test_async_engine_is_shared_per_url(registry, tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'async.db'}"
+    assert registry.get_async_engine(url) is registry.get_async_engine(url)
+    assert registry.get_async_session_factory(url) is registry.get_async_session_factory(url)
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from datetime import datetime
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from backend.database.models.base import Base
+from backend.database.models.album_model import Album
+from backend.database.models.song_model import Song
+from backend.database.models.user_model import User
+from backend.database.models.user_likes import user_likes
+from backend.database.statements import column_values, update_returning, delete_by_key, insert_missing, delete_keys, _locking_select
+
+async def _seed(url):
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as db:
+        db.add(Album(id=1, title="Old", artist="A", genre="G", created_at=datetime(2024, 1, 1)))
+        await db.commit()
+    return engine, session_factory
+
+async def _update_delete_roundtrip(url, returning: bool):
+    engine, session_factory = await _seed(url)
+    try:
+        async with session_factory() as db:
+            db.get_bind().dialect.update_returning = returning
+            album = await update_returning(db, Album, 1, {"title": "New"})
+            missing = await update_returning(db, Album, 2, {"title": "Ghost"})
+            await db.commit()
+        async with session_factory() as db:
+            deleted = await delete_by_key(db, Album, 1)
+            deleted_again = await delete_by_key(db, Album, 1)
+            await db.commit()
+        return album.title, missing, deleted, deleted_again
+    finally:
+        engine.sync_engine.dialect.update_returning = True
+        await engine.dispose()
+
+@pytest.mark.parametrize("returning", [True, False])
+def test_update_and_delete_report_missing_rows(tmp_path, returning):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'statements.db'}"
+    title, missing, deleted, deleted_again = asyncio.run(_update_delete_roundtrip(url, returning))
+    assert title == "New"
+    assert missing is None
+    assert deleted is True
+    assert deleted_again is False
+
+async def _insert_delete_keys_roundtrip(url, returning: bool):
+    engine, session_factory = await _seed(url)
+    dialect = engine.sync_engine.dialect
+    try:
+        if not returning:
+            # Take the lock-then-write path used by dialects without skip-on-conflict RETURNING
+            dialect.name, dialect.delete_returning = "mysql", False
+        async with session_factory() as db:
+            first = await insert_missing(db, user_likes, [{"user_id": 1, "song_id": 1}, {"user_id": 1, "song_id": 2}])
+            second = await insert_missing(db, user_likes, [{"user_id": 1, "song_id": 2}, {"user_id": 2, "song_id": 2}, {"user_id": 2, "song_id": 2}])
+            deleted = await delete_keys(db, user_likes, [(1, 1), (3, 3), (1, 1)])
+            await db.commit()
+        async with session_factory() as db:
+            remaining = sorted(tuple(row) for row in (await db.execute(user_likes.select())).all())
+        return sorted(first), sorted(second), deleted, remaining
+    finally:
+        dialect.name, dialect.delete_returning = "sqlite", True
+        await engine.dispose()
+
+@pytest.mark.parametrize("max_parameters", [2000, 2])
+@pytest.mark.parametrize("returning", [True, False])
+def test_insert_missing_and_delete_keys_report_changed_keys(tmp_path, monkeypatch, returning, max_parameters):
+    # A tiny parameter budget splits every generic-path statement into one-key chunks
+    monkeypatch.setattr("backend.database.statements.MAX_PARAMETERS", max_parameters)
+    url = f"sqlite+aiosqlite:///{tmp_path / 'keys.db'}"
+    first, second, deleted, remaining = asyncio.run(_insert_delete_keys_roundtrip(url, returning))
+    assert first == [(1, 1), (1, 2)]
+    assert second == [(2, 2)]
+    assert deleted == [(1, 1)]
+    assert remaining == [(1, 2), (2, 2)]
+
+@pytest.mark.parametrize("dialect_name, lock", [("mssql", "WITH (UPDLOCK, HOLDLOCK)"), ("mysql", "FOR UPDATE")])
+def test_locking_select_matches_composite_keys_on_every_dialect(dialect_name, lock):
+    from sqlalchemy.dialects import registry
+    sql = str(_locking_select(user_likes, [(1, 2), (3, 4)]).compile(dialect=registry.load(dialect_name)()))
+    assert lock in sql
+    # No row-value IN, which T-SQL lacks
+    assert " OR " in sql and " IN " not in sql
+
+def test_column_values_drops_non_columns():
+    assert column_values(User, {"first_name": "Ann", "password": "secret"}) == {"first_name": "Ann"}
+    assert column_values(Song, {"title": "T", "albums": []}) == {"title": "T"}
@@ -1,14 +1,67 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from backend.database.connector.async_connector import AsyncDatabaseConnector
+from backend.database.connector.engine_registry import engine_registry
+from backend.common.cache.factory import cache_from_env
+from backend.common.search.inverted_index import InvertedIndex, index_partitions, search_enabled
+from backend.common.search.suggest import SuggestIndex, suggest_partitions
+from backend.song_service.repos.async_song_alchemy_repo import AsyncSongAlchemyRepository
+from backend.song_service.services.async_song_alchemy_service import AsyncSongAlchemyService, SONG_SEARCH_FIELDS, song_suggestions
+from backend.song_service.services.like_buffer import like_buffer_from_env
 from backend.song_service.routers.song_router import router as song_router
+from backend.song_service.routers.playlist_router import router as playlist_router
+from backend.common.auth.auth_helper import auth_helper
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the shared database connector, read cache and token key set once per process and close them on shutdown.
+    The search and suggest indexes are built from the SONGS table here and kept current by the song service's writes.
+    The like buffer is drained before the database engines are disposed.
+    """
+    app.state.db_connector = AsyncDatabaseConnector()
+    app.state.search_index = None
+    app.state.suggest_index = None
+    repository = AsyncSongAlchemyRepository(db_connector=app.state.db_connector)
+    if search_enabled():
+        app.state.search_index = await index_partitions(InvertedIndex(SONG_SEARCH_FIELDS), repository.stream_songs())
+        app.state.suggest_index = await suggest_partitions(SuggestIndex(), repository.stream_songs(), song_suggestions)
+    app.state.cache = cache_from_env()
+    if app.state.cache is not None:
+        await app.state.cache.start()
+    # Flushed likes reweigh the suggest index like unbuffered ones do
+    suggestions = AsyncSongAlchemyService(repository, suggest_index=app.state.suggest_index)
+    app.state.like_buffer = like_buffer_from_env(repository, on_applied=suggestions.reweigh_suggestions)
+    if app.state.like_buffer is not None:
+        await app.state.like_buffer.start()
+    await auth_helper.verifier.start()
+    yield
+    await auth_helper.verifier.close()
+    if app.state.like_buffer is not None:
+        await app.state.like_buffer.close()
+    if app.state.cache is not None:
+        await app.state.cache.close()
+    await engine_registry.dispose_all_async()
 
 app = FastAPI(
     title="Song Service",
-    description="Service for managing music songs",
-    version="1.0.0"
+    description="Service for managing music songs and playlists",
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.include_router(song_router)
+app.include_router(playlist_router)
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    search_index = getattr(app.state, "search_index", None)
+    suggest_index = getattr(app.state, "suggest_index", None)
+    like_buffer = getattr(app.state, "like_buffer", None)
+    return {
+        "status": "healthy",
+        "token_cache": auth_helper.verifier.cache.stats(),
+        "search_index": search_index.stats() if search_index is not None else None,
+        "suggest_index": suggest_index.stats() if suggest_index is not None else None,
+        "like_buffer": like_buffer.stats() if like_buffer is not None else None
+    }
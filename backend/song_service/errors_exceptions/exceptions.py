@@ -4,4 +4,12 @@ class SongNotFoundError(Exception):
 
 class PermissionDeniedError(Exception):
     """Raised when a user attempts an unauthorized action."""
-    pass
\ No newline at end of file
+    pass
+
+class PlaylistNotFoundError(Exception):
+    """Raised when a playlist or one of its entries cannot be found."""
+    pass
+
+class LikeBufferFullError(Exception):
+    """Raised when the like buffer stays full, e.g. while the database is down."""
+    pass
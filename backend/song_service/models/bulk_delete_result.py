@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class BulkDeleteResult(BaseModel):
+    deleted: List[int]
+    missing: List[int] = Field(default_factory=list, description="Requested IDs that matched no song")
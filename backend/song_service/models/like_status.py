@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class LikeStatus(BaseModel):
+    song_id: int
+    liked: bool = Field(..., description="Whether the current user likes the song")
+    like_count: Optional[int] = Field(
+        ...,
+        description="How many users like the song. Null in the answer to a like or unlike while the like buffer "
+                    "is enabled: the change is pending until the buffer's next flush writes and counts it"
+    )
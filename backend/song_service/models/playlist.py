@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+class Playlist(BaseModel):
+    id: int
+    owner_id: int
+    name: str
+    description: Optional[str] = None
+    track_count: int = Field(..., description="How many tracks the playlist holds")
+    created_at: datetime
+    updated_at: Optional[datetime] = None
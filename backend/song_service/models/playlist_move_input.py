@@ -0,0 +1,5 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class PlaylistMoveInput(BaseModel):
+    before: Optional[int] = Field(None, description="Entry to move the track in front of; null moves it to the end")
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from backend.song_service.models.playlist import Playlist
+from backend.song_service.models.playlist_track import PlaylistTrack
+
+class PlaylistPage(BaseModel):
+    playlist: Playlist
+    tracks: List[PlaylistTrack]
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Pass as `after` to fetch the next page; null on the last page. "
+                    "The cursor is the last track's position and entry id, so it is invalidated when an insert "
+                    "or move respaces the positions around it: tracks may then be skipped or repeated"
+    )
@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+from backend.song_service.models.song import Song
+
+class PlaylistTrack(BaseModel):
+    entry_id: int = Field(..., description="Identifies this entry of the playlist; a song added twice has two")
+    song: Song
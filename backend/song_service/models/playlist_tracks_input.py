@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from backend.database.batch import MAX_BULK_ITEMS
+
+class PlaylistTracksInput(BaseModel):
+    song_ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+    before: Optional[int] = Field(None, description="Entry to insert the songs in front of; null appends them")
@@ -0,0 +1,5 @@
+from pydantic import Field
+from backend.song_service.models.song import Song
+
+class PopularSong(Song):
+    like_count: int = Field(..., description="How many users like the song")
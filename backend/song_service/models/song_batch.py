@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+from typing import List
+from backend.song_service.models.song import Song
+
+class SongBatch(BaseModel):
+    items: List[Song]
+    missing: List[int] = Field(default_factory=list, description="Requested IDs that matched no song")
@@ -0,0 +1,13 @@
+from pydantic import field_validator
+from backend.song_service.models.song_update_input import SongUpdateInput
+
+class SongBulkUpdateInput(SongUpdateInput):
+    id: int
+
+    @field_validator("title", "artist", "genre", "file_url", "created_at")
+    @classmethod
+    def not_null(cls, value):
+        # NOT NULL in SONGS: an explicit null is reported for its item instead of failing the whole batch
+        if value is None:
+            raise ValueError("may not be null")
+        return value
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+class SongFilter(BaseModel):
+    artist: Optional[str] = Field(None, description="Exact artist name")
+    genre: Optional[str] = Field(None, description="Exact genre")
+    released_after: Optional[datetime] = Field(None, description="Earliest release date, inclusive")
+    released_before: Optional[datetime] = Field(None, description="Latest release date, inclusive")
+    min_duration: Optional[int] = Field(None, ge=0, description="Shortest duration in seconds, inclusive")
+    max_duration: Optional[int] = Field(None, ge=0, description="Longest duration in seconds, inclusive")
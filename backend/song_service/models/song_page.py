@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from backend.song_service.models.song import Song
+
+class SongPage(BaseModel):
+    items: List[Song]
+    next_cursor: Optional[int] = Field(None, description="Pass as `after` to fetch the next page; null on the last page")
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from backend.song_service.models.song import Song
+
+class SongSearchPage(BaseModel):
+    items: List[Song]
+    total: int = Field(..., description="Number of songs matching the query")
+    next_offset: Optional[int] = Field(None, description="Pass as `offset` to fetch the next page; null on the last page")
+    truncated: bool = Field(False, description="The last word begins more indexed words than SEARCH_MAX_PREFIX_TERMS, so songs matching only the later ones are missing; type more of it")
@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+
+class Suggestion(BaseModel):
+    text: str
+    kind: str = Field(..., description="What the text is: song or artist")
+    score: float = Field(..., description="Popularity, reduced for each typo the prefix needed")
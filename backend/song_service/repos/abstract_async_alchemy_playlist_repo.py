@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+from backend.database.models.playlist_model import Playlist
+
+
+class AbstractAsyncAlchemyPlaylistRepo(ABC):
+    @abstractmethod
+    async def create_playlist(self, playlist: Playlist) -> Playlist:
+        """Create a new, empty playlist."""
+        pass
+
+    @abstractmethod
+    async def get_playlist(self, playlist_id: int) -> Optional[Playlist]:
+        """Retrieve a playlist by its ID, without its tracks."""
+        pass
+
+    @abstractmethod
+    async def delete_playlist(self, playlist_id: int) -> bool:
+        """Delete a playlist and its tracks."""
+        pass
+
+    @abstractmethod
+    async def get_existing_song_ids(self, song_ids: List[int]) -> List[int]:
+        """Those of the given song IDs that exist."""
+        pass
+
+    @abstractmethod
+    async def add_tracks(self, playlist_id: int, song_ids: List[int], before: Optional[int] = None) -> Optional[list]:
+        """Insert songs in front of entry before, or at the end; returns the new (id, position, Song) rows, or None if before is not an entry."""
+        pass
+
+    @abstractmethod
+    async def move_track(self, playlist_id: int, entry_id: int, before: Optional[int] = None) -> bool:
+        """Move an entry in front of entry before, or to the end."""
+        pass
+
+    @abstractmethod
+    async def remove_track(self, playlist_id: int, entry_id: int) -> bool:
+        """Remove one entry from a playlist."""
+        pass
+
+    @abstractmethod
+    async def list_tracks(self, playlist_id: int, limit: int, after: Optional[Tuple[int, int]] = None) -> list:
+        """List up to limit + 1 (id, position, Song) rows following the (position, id) key after, in playlist order."""
+        pass
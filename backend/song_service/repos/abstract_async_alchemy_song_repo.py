@@ -0,0 +1,92 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, List, Optional, Tuple
+from backend.database.models.song_model import Song
+from backend.song_service.models.song_update_input import SongUpdateInput
+from backend.song_service.models.song_filter import SongFilter
+
+
+class AbstractAsyncAlchemySongRepo(ABC):
+    @abstractmethod
+    async def create_song(self, song: Song) -> Optional[Song]:
+        """Create a new song."""
+        pass
+
+    @abstractmethod
+    async def get_song_by_id(self, song_id: int) -> Optional[Song]:
+        """Retrieve a song by its ID."""
+        pass
+
+    @abstractmethod
+    async def get_songs_by_ids(self, song_ids: List[int]) -> List[Song]:
+        """Retrieve the songs matching any of the given IDs, in no particular order."""
+        pass
+
+    @abstractmethod
+    async def get_album_ids_for_songs(self, song_ids: List[int]) -> List[int]:
+        """Retrieve the IDs of the albums containing any of the given songs."""
+        pass
+
+    @abstractmethod
+    async def update_song(self, song_id: int, song: SongUpdateInput) -> Optional[Song]:
+        """Update an existing song."""
+        pass
+
+    @abstractmethod
+    async def delete_song(self, song_id: int) -> bool:
+        """Delete a song by its ID."""
+        pass
+
+    @abstractmethod
+    async def create_songs(self, rows: List[dict]) -> List[Song]:
+        """Insert many songs in one transaction, returning them in input order."""
+        pass
+
+    @abstractmethod
+    async def update_songs(self, rows: List[dict]) -> List[Song]:
+        """Apply many partial updates keyed by id in one transaction, returning the songs that exist."""
+        pass
+
+    @abstractmethod
+    async def delete_songs(self, song_ids: List[int]) -> List[int]:
+        """Delete many songs in one transaction, returning the IDs that existed."""
+        pass
+
+    @abstractmethod
+    async def list_songs(self, limit: int, after: Optional[int] = None, filters: Optional[SongFilter] = None) -> List[Song]:
+        """List up to limit + 1 songs matching filters with an ID greater than after, ordered by ID."""
+        pass
+
+    @abstractmethod
+    async def like_song(self, user_id: int, song_id: int) -> Optional[Song]:
+        """Record that a user likes a song, counting it once however often it is repeated."""
+        pass
+
+    @abstractmethod
+    async def unlike_song(self, user_id: int, song_id: int) -> Optional[Song]:
+        """Remove a user's like of a song, if there is one."""
+        pass
+
+    @abstractmethod
+    async def apply_likes(self, likes: List[Tuple[int, int]], unlikes: List[Tuple[int, int]]) -> List[Song]:
+        """Write a batch of (user_id, song_id) likes and unlikes in one transaction, returning the songs whose count changed."""
+        pass
+
+    @abstractmethod
+    async def is_liked(self, user_id: int, song_id: int) -> bool:
+        """Whether a user likes a song."""
+        pass
+
+    @abstractmethod
+    async def list_liked_songs(self, user_id: int, limit: int, after: Optional[int] = None) -> List[Song]:
+        """List up to limit + 1 songs a user likes with an ID greater than after, ordered by ID."""
+        pass
+
+    @abstractmethod
+    async def list_most_liked(self, limit: int) -> List[Song]:
+        """List the limit most liked songs, ties going to the newest."""
+        pass
+
+    @abstractmethod
+    def stream_songs(self) -> AsyncIterator[List[Song]]:
+        """Stream every song ordered by ID, one batch at a time."""
+        pass
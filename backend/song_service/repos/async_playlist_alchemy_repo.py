@@ -0,0 +1,203 @@
+from backend.song_service.repos.abstract_async_alchemy_playlist_repo import AbstractAsyncAlchemyPlaylistRepo
+from backend.database.models.playlist_model import Playlist
+from backend.database.models.playlist_tracks_model import playlist_tracks
+from backend.database.models.song_model import Song
+from backend.database.connector.async_connector import AsyncDatabaseConnector
+from backend.database.pagination import composite_keyset_window
+from backend.database.statements import delete_by_key
+from backend.database.ordering import POSITION_GAP, MIN_RESPACE_GAP, spread, appended
+from sqlalchemy import select, insert, update, delete, func, bindparam
+from typing import List, Optional, Tuple
+from datetime import datetime
+from contextlib import asynccontextmanager
+
+# Rows taken on each side of a full gap when first trying to respace around it
+RESPACE_WINDOW = 16
+
+class AsyncPlaylistAlchemyRepository(AbstractAsyncAlchemyPlaylistRepo):
+    def __init__(self, db_connector=None):
+        super().__init__()
+        self.db_connector = db_connector if db_connector else AsyncDatabaseConnector()
+
+    @asynccontextmanager
+    async def db_session(self):
+        """Async context manager for database session."""
+        db = self.db_connector.get_session()
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    async def create_playlist(self, playlist: Playlist) -> Playlist:
+        """Create a new, empty playlist."""
+        async with self.db_session() as db:
+            db.add(playlist)
+            await db.commit()
+            await db.refresh(playlist)
+        return playlist
+
+    async def get_playlist(self, playlist_id: int) -> Optional[Playlist]:
+        """Retrieve a playlist by its ID, without its tracks."""
+        async with self.db_session() as db:
+            return await db.get(Playlist, playlist_id)
+
+    async def delete_playlist(self, playlist_id: int) -> bool:
+        """Delete a playlist and its tracks."""
+        async with self.db_session() as db:
+            await db.execute(delete(playlist_tracks).where(playlist_tracks.c.playlist_id == playlist_id))
+            deleted = await delete_by_key(db, Playlist, playlist_id)
+            await db.commit()
+        return deleted
+
+    async def get_existing_song_ids(self, song_ids: List[int]) -> List[int]:
+        """Those of the given song IDs that exist."""
+        async with self.db_session() as db:
+            return list((await db.scalars(select(Song.id).where(Song.id.in_(song_ids)))).all())
+
+    async def _touch(self, db, playlist_id: int, added: int) -> bool:
+        """Move track_count by added and bump updated_at; False when the playlist does not exist."""
+        # Updating the playlist row first locks it, so concurrent edits of one playlist never pick the same positions
+        result = await db.execute(
+            update(Playlist)
+            .where(Playlist.id == playlist_id)
+            .values(track_count=Playlist.track_count + added, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+    @staticmethod
+    def _in_playlist(playlist_id: int, exclude: Optional[int]) -> list:
+        """Predicates selecting a playlist's entries, leaving out the one being moved."""
+        predicates = [playlist_tracks.c.playlist_id == playlist_id]
+        return predicates if exclude is None else predicates + [playlist_tracks.c.id != exclude]
+
+    async def _position(self, db, playlist_id: int, entry_id: int) -> Optional[int]:
+        return await db.scalar(
+            select(playlist_tracks.c.position).where(playlist_tracks.c.id == entry_id, playlist_tracks.c.playlist_id == playlist_id)
+        )
+
+    async def _slots(self, db, playlist_id: int, count: int, before: Optional[int], exclude: Optional[int] = None) -> Optional[List[int]]:
+        """Positions for count entries placed in front of entry before, or at the end; None if before is not an entry."""
+        positions = playlist_tracks.c.position
+        if before is None:
+            last = await db.scalar(select(func.max(positions)).where(*self._in_playlist(playlist_id, exclude)))
+            return appended(last, count)
+        anchor = await self._position(db, playlist_id, before)
+        if anchor is None:
+            return None
+        previous = await db.scalar(
+            select(func.max(positions)).where(*self._in_playlist(playlist_id, exclude), positions < anchor)
+        )
+        if previous is None:
+            previous = anchor - POSITION_GAP * (count + 1)
+        return spread(previous, anchor, count) or await self._respace(db, playlist_id, anchor, count, exclude)
+
+    async def _respace(self, db, playlist_id: int, anchor: int, count: int, exclude: Optional[int]) -> List[int]:
+        """
+        Spread out the entries around a gap too small for count more, doubling the
+        window until its bounds leave MIN_RESPACE_GAP per entry (or it reaches an end
+        of the playlist, which leaves room for any number).
+        :return: The freed positions for the new entries, in front of anchor.
+        """
+        positions = playlist_tracks.c.position
+        window = RESPACE_WINDOW
+        while True:
+            entries = select(playlist_tracks.c.id, positions).where(*self._in_playlist(playlist_id, exclude))
+            below = (await db.execute(entries.where(positions < anchor).order_by(positions.desc()).limit(window + 1))).all()
+            above = (await db.execute(entries.where(positions >= anchor).order_by(positions).limit(window + 1))).all()
+            # The row just outside the window on each side, if any, bounds it
+            low = below.pop()[1] if len(below) > window else None
+            high = above.pop()[1] if len(above) > window else None
+            rows = below[::-1] + [None] * count + above
+            span = POSITION_GAP * (len(rows) + 1)
+            if low is None and high is None:
+                low = rows[0][1] - POSITION_GAP if rows[0] is not None else anchor - span
+            if low is None:
+                low = high - span
+            if high is None:
+                high = low + span
+            spaced = spread(low, high, len(rows), MIN_RESPACE_GAP)
+            if spaced is not None:
+                break
+            window *= 2
+        changes = [
+            {"entry_id": row[0], "new_position": position}
+            for row, position in zip(rows, spaced) if row is not None and row[1] != position
+        ]
+        # (playlist_id, position) is unique and checked row by row, so the entries first move
+        # below every position in the playlist, old or new; the entry being moved goes there
+        # too, as its current position may be one of the new ones
+        parked = [change["entry_id"] for change in changes] + ([exclude] if exclude is not None else [])
+        floor = min([await db.scalar(select(func.min(positions)).where(playlist_tracks.c.playlist_id == playlist_id))] + spaced)
+        move = (
+            update(playlist_tracks)
+            .where(playlist_tracks.c.id == bindparam("entry_id"))
+            .values(position=bindparam("new_position"))
+        )
+        if parked:
+            await db.execute(move, [{"entry_id": entry_id, "new_position": floor - 1 - i} for i, entry_id in enumerate(parked)])
+        if changes:
+            await db.execute(move, changes)
+        return [position for row, position in zip(rows, spaced) if row is None]
+
+    def _tracks(self):
+        """Entries joined to their songs; one statement serves every page."""
+        return select(playlist_tracks.c.id, playlist_tracks.c.position, Song).join(Song, Song.id == playlist_tracks.c.song_id)
+
+    async def add_tracks(self, playlist_id: int, song_ids: List[int], before: Optional[int] = None) -> Optional[list]:
+        """Insert songs in front of entry before, or at the end; returns the new (id, position, Song) rows, or None if before is not an entry."""
+        async with self.db_session() as db:
+            if not await self._touch(db, playlist_id, len(song_ids)):
+                return None
+            positions = await self._slots(db, playlist_id, len(song_ids), before)
+            if positions is None:
+                return None
+            rows = [
+                {"playlist_id": playlist_id, "song_id": song_id, "position": position}
+                for song_id, position in zip(song_ids, positions)
+            ]
+            entry_ids = list((await db.scalars(
+                insert(playlist_tracks).returning(playlist_tracks.c.id, sort_by_parameter_order=True), rows
+            )).all())
+            result = await db.execute(
+                self._tracks().where(playlist_tracks.c.id.in_(entry_ids)).order_by(playlist_tracks.c.position)
+            )
+            tracks = list(result.all())
+            await db.commit()
+        return tracks
+
+    async def move_track(self, playlist_id: int, entry_id: int, before: Optional[int] = None) -> bool:
+        """Move an entry in front of entry before, or to the end."""
+        async with self.db_session() as db:
+            if not await self._touch(db, playlist_id, 0) or await self._position(db, playlist_id, entry_id) is None:
+                return False
+            if before != entry_id:
+                positions = await self._slots(db, playlist_id, 1, before, exclude=entry_id)
+                if positions is None:
+                    return False
+                # The moved entry is the only row written unless its new gap had to be respaced
+                await db.execute(update(playlist_tracks).where(playlist_tracks.c.id == entry_id).values(position=positions[0]))
+            await db.commit()
+        return True
+
+    async def remove_track(self, playlist_id: int, entry_id: int) -> bool:
+        """Remove one entry from a playlist."""
+        async with self.db_session() as db:
+            if not await self._touch(db, playlist_id, -1):
+                return False
+            result = await db.execute(
+                delete(playlist_tracks).where(playlist_tracks.c.id == entry_id, playlist_tracks.c.playlist_id == playlist_id)
+            )
+            if not result.rowcount:
+                return False
+            await db.commit()
+        return True
+
+    async def list_tracks(self, playlist_id: int, limit: int, after: Optional[Tuple[int, int]] = None) -> list:
+        """List up to limit + 1 (id, position, Song) rows following the (position, id) key after, in playlist order."""
+        statement = self._tracks().where(playlist_tracks.c.playlist_id == playlist_id)
+        key = [playlist_tracks.c.position, playlist_tracks.c.id]
+        async with self.db_session() as db:
+            # A range of the (playlist_id, position, id) index, each row joined to SONGS by primary key
+            result = await db.execute(composite_keyset_window(statement, key, limit, after))
+            return list(result.all())
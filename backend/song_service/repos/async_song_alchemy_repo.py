@@ -0,0 +1,238 @@
+from backend.song_service.repos.abstract_async_alchemy_song_repo import AbstractAsyncAlchemySongRepo
+from backend.database.models.song_model import Song
+from backend.database.models.album_songs_model import album_songs
+from backend.database.models.user_likes import user_likes
+from backend.database.models.user_model import User
+from backend.database.models.playlist_model import Playlist
+from backend.database.models.playlist_tracks_model import playlist_tracks
+from backend.song_service.models.song_update_input import SongUpdateInput
+from backend.song_service.models.song_filter import SongFilter
+from backend.database.connector.async_connector import AsyncDatabaseConnector
+from backend.database.pagination import keyset_window
+from backend.database.filters import equals, between
+from backend.database.export import stream_partitions
+from backend.database.statements import column_values, update_returning, delete_by_key, insert_missing, delete_keys
+from sqlalchemy import select, insert, update, delete, bindparam, func
+from typing import List, Optional, Tuple
+from collections import Counter
+from datetime import datetime
+from contextlib import asynccontextmanager
+
+class AsyncSongAlchemyRepository(AbstractAsyncAlchemySongRepo):
+    def __init__(self, db_connector=None):
+        super().__init__()
+        self.db_connector = db_connector if db_connector else AsyncDatabaseConnector()
+
+    @asynccontextmanager
+    async def db_session(self):
+        """Async context manager for database session."""
+        db = self.db_connector.get_session()
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    async def create_song(self, song: Song) -> Song:
+        """Create a new song."""
+        async with self.db_session() as db:
+            db.add(song)
+            await db.commit()
+            await db.refresh(song)
+        return song
+
+    async def get_song_by_id(self, song_id: int) -> Optional[Song]:
+        """Retrieve a song by its ID."""
+        async with self.db_session() as db:
+            return await db.get(Song, song_id)
+
+    async def get_songs_by_ids(self, song_ids: List[int]) -> List[Song]:
+        """Retrieve the songs matching any of the given IDs, in no particular order."""
+        async with self.db_session() as db:
+            result = await db.execute(select(Song).where(Song.id.in_(song_ids)))
+            return list(result.scalars().all())
+
+    async def get_album_ids_for_songs(self, song_ids: List[int]) -> List[int]:
+        """Retrieve the IDs of the albums containing any of the given songs."""
+        async with self.db_session() as db:
+            result = await db.scalars(
+                select(album_songs.c.album_id).where(album_songs.c.song_id.in_(song_ids)).distinct()
+            )
+            return list(result.all())
+
+    async def update_song(self, song_id: int, song_input: SongUpdateInput) -> Optional[Song]:
+        """Update an existing song."""
+        values = column_values(Song, song_input.model_dump(exclude_unset=True))
+        if values:
+            # updated_at is the row version behind ETag / Last-Modified
+            values["updated_at"] = datetime.utcnow()
+        async with self.db_session() as db:
+            song = await update_returning(db, Song, song_id, values)
+            await db.commit()
+        return song
+
+    async def _remove_from_playlists(self, db, song_ids: List[int]) -> None:
+        """Delete the playlist entries of songs, keeping each playlist's track_count right."""
+        result = await db.execute(
+            select(playlist_tracks.c.playlist_id, func.count())
+            .where(playlist_tracks.c.song_id.in_(song_ids))
+            .group_by(playlist_tracks.c.playlist_id)
+        )
+        removed = [{"playlist": playlist_id, "removed": count} for playlist_id, count in result.all()]
+        if removed:
+            await db.execute(delete(playlist_tracks).where(playlist_tracks.c.song_id.in_(song_ids)))
+            playlists = Playlist.__table__
+            await db.execute(
+                update(playlists)
+                .where(playlists.c.id == bindparam("playlist"))
+                .values(track_count=playlists.c.track_count - bindparam("removed")),
+                removed
+            )
+
+    async def delete_song(self, song_id: int) -> bool:
+        """Delete a song by its ID."""
+        async with self.db_session() as db:
+            await self._remove_from_playlists(db, [song_id])
+            await db.execute(delete(album_songs).where(album_songs.c.song_id == song_id))
+            await db.execute(delete(user_likes).where(user_likes.c.song_id == song_id))
+            deleted = await delete_by_key(db, Song, song_id)
+            await db.commit()
+        return deleted
+
+    async def create_songs(self, rows: List[dict]) -> List[Song]:
+        """Insert many songs in one transaction, returning them in input order."""
+        async with self.db_session() as db:
+            # executemany INSERT ... RETURNING, batched by the dialect
+            result = await db.scalars(insert(Song).returning(Song, sort_by_parameter_order=True), rows)
+            songs = list(result.all())
+            await db.commit()
+        return songs
+
+    async def update_songs(self, rows: List[dict]) -> List[Song]:
+        """Apply many partial updates keyed by id in one transaction, returning the songs that exist."""
+        song_ids = [row["id"] for row in rows]
+        async with self.db_session() as db:
+            existing = set((await db.scalars(select(Song.id).where(Song.id.in_(song_ids)))).all())
+            now = datetime.utcnow()
+            changes = [{**row, "updated_at": now} for row in rows if row["id"] in existing and len(row) > 1]
+            if changes:
+                # ORM bulk UPDATE by primary key: one executemany per distinct set of columns
+                await db.execute(update(Song), changes)
+            result = await db.scalars(select(Song).where(Song.id.in_(existing)))
+            songs = list(result.all())
+            await db.commit()
+        return songs
+
+    async def delete_songs(self, song_ids: List[int]) -> List[int]:
+        """Delete many songs in one transaction, returning the IDs that existed."""
+        async with self.db_session() as db:
+            existing = list((await db.scalars(select(Song.id).where(Song.id.in_(song_ids)))).all())
+            if existing:
+                await self._remove_from_playlists(db, existing)
+                await db.execute(delete(album_songs).where(album_songs.c.song_id.in_(existing)))
+                await db.execute(delete(user_likes).where(user_likes.c.song_id.in_(existing)))
+                await db.execute(delete(Song).where(Song.id.in_(existing)))
+            await db.commit()
+        return existing
+
+    async def list_songs(self, limit: int, after: Optional[int] = None, filters: Optional[SongFilter] = None) -> list[Song]:
+        """List up to limit + 1 songs matching filters with an ID greater than after, ordered by ID."""
+        statement = select(Song)
+        if filters is not None:
+            statement = statement.where(
+                *equals(Song.artist, filters.artist),
+                *equals(Song.genre, filters.genre),
+                *between(Song.release_date, filters.released_after, filters.released_before),
+                *between(Song.duration, filters.min_duration, filters.max_duration)
+            )
+        async with self.db_session() as db:
+            result = await db.execute(keyset_window(statement, Song.id, limit, after))
+            return list(result.scalars().all())
+
+    async def like_song(self, user_id: int, song_id: int) -> Optional[Song]:
+        """Record that a user likes a song, counting it once however often it is repeated."""
+        async with self.db_session() as db:
+            if await db.scalar(select(Song.id).where(Song.id == song_id)) is None:
+                return None
+            if await insert_missing(db, user_likes, [{"user_id": user_id, "song_id": song_id}]):
+                # Relative update, so concurrent likes of the same song never lose a count
+                song = await update_returning(db, Song, song_id, {"like_count": Song.like_count + 1})
+            else:
+                song = await db.get(Song, song_id)
+            await db.commit()
+        return song
+
+    async def unlike_song(self, user_id: int, song_id: int) -> Optional[Song]:
+        """Remove a user's like of a song, if there is one."""
+        async with self.db_session() as db:
+            result = await db.execute(
+                delete(user_likes).where(user_likes.c.user_id == user_id, user_likes.c.song_id == song_id)
+            )
+            if result.rowcount:
+                song = await update_returning(db, Song, song_id, {"like_count": Song.like_count - 1})
+            else:
+                song = await db.get(Song, song_id)
+            await db.commit()
+        return song
+
+    async def apply_likes(self, likes: List[Tuple[int, int]], unlikes: List[Tuple[int, int]]) -> List[Song]:
+        """
+        Write a batch of (user_id, song_id) likes and unlikes in one transaction,
+        moving each song's like_count by the rows that actually changed.
+        Likes of songs that do not exist, and of users deleted while their likes were buffered, are dropped.
+        :return: The songs whose like_count changed.
+        """
+        song_ids = {song_id for _, song_id in likes}
+        user_ids = {user_id for user_id, _ in likes}
+        songs = Song.__table__
+        async with self.db_session() as db:
+            existing = set((await db.scalars(select(Song.id).where(Song.id.in_(song_ids)))).all()) if song_ids else set()
+            users = set((await db.scalars(select(User.id).where(User.id.in_(user_ids)))).all()) if user_ids else set()
+            inserted = await insert_missing(
+                db,
+                user_likes,
+                [{"user_id": user_id, "song_id": song_id} for user_id, song_id in likes if song_id in existing and user_id in users]
+            )
+            deleted = await delete_keys(db, user_likes, unlikes)
+            deltas = Counter(song_id for _, song_id in inserted)
+            deltas.subtract(song_id for _, song_id in deleted)
+            changes = [{"song_id": song_id, "delta": delta} for song_id, delta in sorted(deltas.items()) if delta]
+            changed = []
+            if changes:
+                # One executemany of relative updates, so concurrent writers never lose a count
+                await db.execute(
+                    update(songs)
+                    .where(songs.c.id == bindparam("song_id"))
+                    .values(like_count=songs.c.like_count + bindparam("delta")),
+                    changes
+                )
+                result = await db.scalars(select(Song).where(Song.id.in_([change["song_id"] for change in changes])))
+                changed = list(result.all())
+            await db.commit()
+        return changed
+
+    async def is_liked(self, user_id: int, song_id: int) -> bool:
+        """Whether a user likes a song."""
+        async with self.db_session() as db:
+            return await db.scalar(
+                select(user_likes.c.song_id).where(user_likes.c.user_id == user_id, user_likes.c.song_id == song_id)
+            ) is not None
+
+    async def list_liked_songs(self, user_id: int, limit: int, after: Optional[int] = None) -> List[Song]:
+        """List up to limit + 1 songs a user likes with an ID greater than after, ordered by ID."""
+        statement = select(Song).join(user_likes, user_likes.c.song_id == Song.id).where(user_likes.c.user_id == user_id)
+        async with self.db_session() as db:
+            # Ordered by the USER_LIKES key, so the page is a range of its primary key
+            result = await db.execute(keyset_window(statement, user_likes.c.song_id, limit, after))
+            return list(result.scalars().all())
+
+    async def list_most_liked(self, limit: int) -> List[Song]:
+        """List the limit most liked songs, ties going to the newest."""
+        async with self.db_session() as db:
+            result = await db.execute(select(Song).order_by(Song.like_count.desc(), Song.id.desc()).limit(limit))
+            return list(result.scalars().all())
+
+    async def stream_songs(self):
+        """Stream every song ordered by ID, one batch at a time."""
+        async with self.db_session() as db:
+            async for batch in stream_partitions(db, select(Song).order_by(Song.id)):
+                yield batch
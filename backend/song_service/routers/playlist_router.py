@@ -0,0 +1,126 @@
+from fastapi import APIRouter, HTTPException, Depends, Request, Query
+from typing import List, Optional
+from backend.song_service.models.playlist import Playlist
+from backend.song_service.models.playlist_page import PlaylistPage
+from backend.song_service.models.playlist_track import PlaylistTrack
+from backend.song_service.models.playlist_input import PlaylistInput
+from backend.song_service.models.playlist_tracks_input import PlaylistTracksInput
+from backend.song_service.models.playlist_move_input import PlaylistMoveInput
+from backend.song_service.repos.async_playlist_alchemy_repo import AsyncPlaylistAlchemyRepository
+from backend.song_service.services.async_playlist_service import AsyncPlaylistService
+from backend.common.auth.auth_helper import auth_helper
+from backend.song_service.errors_exceptions.exceptions import PlaylistNotFoundError, PermissionDeniedError, SongNotFoundError
+from backend.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, COMPOSITE_CURSOR_PATTERN
+
+
+router = APIRouter()
+def get_playlist_service(request: Request):
+    db_connector = getattr(request.app.state, "db_connector", None)
+    return AsyncPlaylistService(playlist_repository=AsyncPlaylistAlchemyRepository(db_connector=db_connector))
+
+@router.post("/playlists", response_model=Playlist)
+async def create_playlist(playlist_input: PlaylistInput, current_user=auth_helper.require_auth(), playlist_service=Depends(get_playlist_service)):
+    """
+    Create an empty playlist owned by the current user.
+    :param playlist_input: The playlist's name and description.
+    :return: The created playlist.
+    """
+    return await playlist_service.create_playlist(int(current_user["sub"]), playlist_input)
+
+@router.get("/playlists/{playlist_id}", response_model=PlaylistPage)
+async def get_playlist(
+    playlist_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, pattern=COMPOSITE_CURSOR_PATTERN, description="next_cursor from the previous page"),
+    current_user=auth_helper.require_auth(),
+    playlist_service=Depends(get_playlist_service)
+):
+    """
+    Get one of the current user's playlists with one keyset page of its tracks, in playlist order.
+    :param playlist_id: The ID of the playlist.
+    :param limit: Maximum number of tracks to return.
+    :param after: Return the tracks following this cursor. Respacing positions (after many inserts at one
+        spot) invalidates cursors issued before it: restart from the first page to be sure of every track.
+    :return: The playlist, the page of tracks and the cursor of the next page, raises HTTPException otherwise.
+    """
+    try:
+        return await playlist_service.get_playlist_page(int(current_user["sub"]), playlist_id, limit, after)
+    except PlaylistNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PermissionDeniedError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+@router.delete("/playlists/{playlist_id}")
+async def delete_playlist(playlist_id: int, current_user=auth_helper.require_auth(), playlist_service=Depends(get_playlist_service)):
+    """
+    Delete one of the current user's playlists.
+    :param playlist_id: The ID of the playlist to delete.
+    :return: A success message if deletion is successful, raises HTTPException otherwise.
+    """
+    try:
+        await playlist_service.delete_playlist(int(current_user["sub"]), playlist_id)
+        return {"detail": "Playlist deleted successfully"}
+    except PlaylistNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PermissionDeniedError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+@router.post("/playlists/{playlist_id}/tracks", response_model=List[PlaylistTrack])
+async def add_tracks(
+    playlist_id: int,
+    tracks_input: PlaylistTracksInput,
+    current_user=auth_helper.require_auth(),
+    playlist_service=Depends(get_playlist_service)
+):
+    """
+    Add songs to one of the current user's playlists, in front of an entry or at the end.
+    :param playlist_id: The ID of the playlist.
+    :param tracks_input: The song IDs, in order, and the entry to insert them in front of.
+    :return: The new entries, raises HTTPException if the playlist, the entry or a song does not exist.
+    """
+    try:
+        return await playlist_service.add_tracks(int(current_user["sub"]), playlist_id, tracks_input.song_ids, tracks_input.before)
+    except (PlaylistNotFoundError, SongNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PermissionDeniedError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+@router.put("/playlists/{playlist_id}/tracks/{entry_id}/position")
+async def move_track(
+    playlist_id: int,
+    entry_id: int,
+    move_input: PlaylistMoveInput,
+    current_user=auth_helper.require_auth(),
+    playlist_service=Depends(get_playlist_service)
+):
+    """
+    Move an entry of one of the current user's playlists in front of another entry, or to the end.
+    Only the moved entry is rewritten; the rest of the playlist keeps its positions.
+    :param playlist_id: The ID of the playlist.
+    :param entry_id: The entry to move.
+    :param move_input: The entry to move it in front of.
+    :return: A success message if the move is successful, raises HTTPException otherwise.
+    """
+    try:
+        await playlist_service.move_track(int(current_user["sub"]), playlist_id, entry_id, move_input.before)
+        return {"detail": "Track moved successfully"}
+    except PlaylistNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PermissionDeniedError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+@router.delete("/playlists/{playlist_id}/tracks/{entry_id}")
+async def remove_track(playlist_id: int, entry_id: int, current_user=auth_helper.require_auth(), playlist_service=Depends(get_playlist_service)):
+    """
+    Remove an entry from one of the current user's playlists.
+    :param playlist_id: The ID of the playlist.
+    :param entry_id: The entry to remove.
+    :return: A success message if removal is successful, raises HTTPException otherwise.
+    """
+    try:
+        await playlist_service.remove_track(int(current_user["sub"]), playlist_id, entry_id)
+        return {"detail": "Track removed successfully"}
+    except PlaylistNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PermissionDeniedError as e:
+        raise HTTPException(status_code=403, detail=str(e))
@@ -1,36 +1,254 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, Query, Body
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Union
+from datetime import datetime
 from backend.song_service.models.song import Song
+from backend.song_service.models.song_page import SongPage
+from backend.song_service.models.song_batch import SongBatch
+from backend.song_service.models.song_search_page import SongSearchPage
+from backend.song_service.models.song_filter import SongFilter
+from backend.song_service.models.suggestion import Suggestion
+from backend.song_service.models.like_status import LikeStatus
+from backend.song_service.models.popular_song import PopularSong
+from backend.song_service.models.song_bulk_update_input import SongBulkUpdateInput
+from backend.song_service.models.bulk_delete_result import BulkDeleteResult
 from backend.song_service.models.song_input import SongInput
 from backend.song_service.models.song_update_input import SongUpdateInput
-from backend.song_service.repos.song_alchemy_repo import SongAlchemyRepository
-from backend.song_service.services.song_alchemy_service import SongAlchemyService
-from backend.song_service.utils.auth_helper import auth_helper
+from backend.song_service.repos.async_song_alchemy_repo import AsyncSongAlchemyRepository
+from backend.song_service.services.async_song_alchemy_service import AsyncSongAlchemyService
+from backend.song_service.utils.model_to_model_mapper import ModelToModelMapper
+from backend.common.auth.auth_helper import auth_helper
+from backend.song_service.errors_exceptions.exceptions import SongNotFoundError, LikeBufferFullError
+from backend.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from backend.database.export import NDJSON_MEDIA_TYPE
+from backend.database.batch import parse_id_list, validate_items, MAX_BULK_ITEMS
+from backend.common.web.conditional import (
+    conditional_response, entity_validators, collection_validators, ITEM_CACHE_CONTROL, LIST_CACHE_CONTROL
+)
 
 
 router = APIRouter()
-def get_song_service():
-    return SongAlchemyService(song_repository=SongAlchemyRepository())
+def get_song_service(request: Request):
+    db_connector = getattr(request.app.state, "db_connector", None)
+    return AsyncSongAlchemyService(
+        song_repository=AsyncSongAlchemyRepository(db_connector=db_connector),
+        cache=getattr(request.app.state, "cache", None),
+        search_index=getattr(request.app.state, "search_index", None),
+        suggest_index=getattr(request.app.state, "suggest_index", None),
+        like_buffer=getattr(request.app.state, "like_buffer", None)
+    )
 
-@router.get("/songs", response_model=List[Song])
-async def get_all_songs(current_user=auth_helper.require_auth(), song_service=Depends(get_song_service)):
+@router.get("/songs", response_model=Union[SongBatch, SongPage])
+async def get_all_songs(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[int] = Query(None, ge=0, description="next_cursor from the previous page"),
+    ids: Optional[str] = Query(None, description="Comma-separated song IDs to fetch in one request"),
+    artist: Optional[str] = Query(None, min_length=1),
+    genre: Optional[str] = Query(None, min_length=1),
+    released_after: Optional[datetime] = Query(None),
+    released_before: Optional[datetime] = Query(None),
+    min_duration: Optional[int] = Query(None, ge=0),
+    max_duration: Optional[int] = Query(None, ge=0),
+    current_user=auth_helper.require_auth(),
+    song_service=Depends(get_song_service)
+):
     """
-    Get all songs.
-    :return: A list of all song objects.
+    Get songs one keyset page at a time, ordered by ID, or a batch of songs by ID.
+    :param limit: Maximum number of songs to return.
+    :param after: Return songs with an ID greater than this cursor.
+    :param ids: Comma-separated song IDs; when given, limit, after and the filters are ignored.
+    :param artist: Only songs by exactly this artist.
+    :param genre: Only songs of exactly this genre.
+    :param released_after: Only songs released at or after this date.
+    :param released_before: Only songs released at or before this date.
+    :param min_duration: Only songs lasting at least this many seconds.
+    :param max_duration: Only songs lasting at most this many seconds.
+    :return: The page of songs and the cursor of the next page, or the requested
+        songs in request order and the IDs that were not found. A 304 with no body
+        when the client's If-None-Match still matches.
     """
-    return song_service.get_all_songs()
+    if ids is not None:
+        try:
+            song_ids = parse_id_list(ids)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        batch = await song_service.get_songs_by_ids(song_ids)
+        validators = collection_validators(batch.items, batch.missing)
+        return conditional_response(request, response, *validators, LIST_CACHE_CONTROL) or batch
+    filters = SongFilter(
+        artist=artist,
+        genre=genre,
+        released_after=released_after,
+        released_before=released_before,
+        min_duration=min_duration,
+        max_duration=max_duration
+    )
+    page = await song_service.get_songs_page(limit, after, filters)
+    validators = collection_validators(page.items, page.next_cursor)
+    return conditional_response(request, response, *validators, LIST_CACHE_CONTROL) or page
+
+@router.get("/songs/export")
+async def export_songs(current_user=auth_helper.require_auth(), song_service=Depends(get_song_service)):
+    """
+    Stream every song as newline-delimited JSON, ordered by ID.
+    Declared before /songs/{song_id} so "export" is not parsed as an ID.
+    :return: A streaming NDJSON response with one song per line.
+    """
+    return StreamingResponse(song_service.export_songs(), media_type=NDJSON_MEDIA_TYPE)
+
+@router.get("/songs/search", response_model=SongSearchPage)
+async def search_songs(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, description="Words to find in the title, artist or genre"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    current_user=auth_helper.require_auth(),
+    song_service=Depends(get_song_service)
+):
+    """
+    Full-text search over songs, best matches first.
+    Case and accents are ignored and the last word also matches words it begins, so "beyo" finds "Beyoncé".
+    Declared before /songs/{song_id} so "search" is not parsed as an ID.
+    :param q: The query; every word must match.
+    :param limit: Maximum number of songs to return.
+    :param offset: Number of ranked results to skip.
+    :return: One page of ranked songs, the number of matches and the offset of the next page.
+    """
+    if song_service.search_index is None:
+        raise HTTPException(status_code=503, detail="Search index is not available")
+    page = await song_service.search_songs(q, limit, offset)
+    validators = collection_validators(page.items, page.total, page.next_offset)
+    return conditional_response(request, response, *validators, LIST_CACHE_CONTROL) or page
+
+@router.get("/songs/suggest", response_model=List[Suggestion])
+async def suggest_songs(
+    prefix: str = Query(..., min_length=1, description="What the user has typed so far"),
+    limit: int = Query(10, ge=1, le=50),
+    current_user=auth_helper.require_auth(),
+    song_service=Depends(get_song_service)
+):
+    """
+    Autocomplete song titles and artists as the user types, most popular first.
+    Prefixes of three or more characters that match too little also match with a typo.
+    Declared before /songs/{song_id} so "suggest" is not parsed as an ID.
+    :param prefix: The start of a title or artist name.
+    :param limit: Maximum number of suggestions to return.
+    :return: The suggested texts with their kind and score.
+    """
+    if song_service.suggest_index is None:
+        raise HTTPException(status_code=503, detail="Suggest index is not available")
+    return await song_service.suggest(prefix, limit)
+
+@router.get("/songs/liked", response_model=SongPage)
+async def get_liked_songs(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[int] = Query(None, ge=0, description="next_cursor from the previous page"),
+    current_user=auth_helper.require_auth(),
+    song_service=Depends(get_song_service)
+):
+    """
+    Get the songs the current user likes, one keyset page at a time, ordered by ID.
+    Declared before /songs/{song_id} so "liked" is not parsed as an ID.
+    :param limit: Maximum number of songs to return.
+    :param after: Return songs with an ID greater than this cursor.
+    :return: The page of liked songs and the cursor of the next page.
+    """
+    page = await song_service.get_liked_songs_page(int(current_user["sub"]), limit, after)
+    validators = collection_validators(page.items, page.next_cursor)
+    return conditional_response(request, response, *validators, LIST_CACHE_CONTROL) or page
+
+@router.get("/songs/most-liked", response_model=List[PopularSong])
+async def get_most_liked_songs(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user=auth_helper.require_auth(),
+    song_service=Depends(get_song_service)
+):
+    """
+    Get the most liked songs, most likes first.
+    Declared before /songs/{song_id} so "most-liked" is not parsed as an ID.
+    :param limit: Maximum number of songs to return.
+    :return: The songs with their like counts.
+    """
+    songs = await song_service.get_most_liked_songs(limit)
+    # Likes do not change a song's version, so the counts are part of the ETag
+    validators = collection_validators(songs, *[song.like_count for song in songs])
+    return conditional_response(request, response, *validators, LIST_CACHE_CONTROL) or songs
+
+@router.post("/songs:batch", response_model=List[Song])
+async def create_songs(items: List[dict] = Body(...), current_user=auth_helper.require_role("admin"), song_service=Depends(get_song_service)):
+    """
+    Create many songs in one transaction.
+    :param items: The song input objects to create.
+    :return: The created songs in input order. If any item is invalid nothing is
+        written and the errors are reported per item index.
+    """
+    song_inputs, errors = validate_items(items, SongInput, check=ModelToModelMapper.song_input_to_row)
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    try:
+        return await song_service.create_songs(song_inputs)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.patch("/songs:batch", response_model=SongBatch)
+async def update_songs(items: List[dict] = Body(...), current_user=auth_helper.require_role("admin"), song_service=Depends(get_song_service)):
+    """
+    Partially update many songs in one transaction.
+    :param items: Objects holding a song id and the fields to change.
+    :return: The updated songs in input order and the IDs that were not found.
+    """
+    song_inputs, errors = validate_items(items, SongBulkUpdateInput, unique_key="id")
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    try:
+        return await song_service.update_songs(song_inputs)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/songs:batch", response_model=BulkDeleteResult)
+async def delete_songs(
+    ids: str = Query(..., description="Comma-separated song IDs to delete"),
+    current_user=auth_helper.require_role("admin"),
+    song_service=Depends(get_song_service)
+):
+    """
+    Delete many songs in one transaction.
+    :param ids: Comma-separated song IDs.
+    :return: The deleted IDs and the IDs that were not found.
+    """
+    try:
+        song_ids = parse_id_list(ids, MAX_BULK_ITEMS)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return await song_service.delete_songs(song_ids)
 
 @router.get("/songs/{song_id}", response_model=Song)
-async def get_song_by_id(song_id: int, current_user=auth_helper.require_auth(), song_service=Depends(get_song_service)):
+async def get_song_by_id(
+    song_id: int,
+    request: Request,
+    response: Response,
+    current_user=auth_helper.require_auth(),
+    song_service=Depends(get_song_service)
+):
     """
     Get an song by its ID.
     :param song_id: The ID of the song to retrieve.
-    :return: The song object if found, raises HTTPException otherwise.
+    :return: The song object if found, a 304 with no body when the client's
+        If-None-Match or If-Modified-Since shows its copy is current,
+        raises HTTPException otherwise.
     """
     try:
-        return song_service.get_song_by_id(song_id)
+        song = await song_service.get_song_by_id(song_id)
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
+    return conditional_response(request, response, *entity_validators(song), ITEM_CACHE_CONTROL) or song
     
 @router.post("/songs", response_model=Song)
 async def create_song(song_input: SongInput, current_user=auth_helper.require_role("admin"), song_service=Depends(get_song_service)):
@@ -40,7 +258,7 @@ async def create_song(song_input: SongInput, current_user=auth_helper.require_ro
     :return: The created song object.
     """
     try:
-        return song_service.create_new_song(song_input)
+        return await song_service.create_new_song(song_input)
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
@@ -55,9 +273,11 @@ async def update_song(song_id: int, song_input: SongUpdateInput, current_user=au
     :return: The updated song object if successful, raises HTTPException otherwise.
     """
     try:
-        return song_service.update_song(song_id, song_input)
+        return await song_service.update_song(song_id, song_input)
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
+    except SongNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
     
@@ -69,7 +289,48 @@ async def delete_song(song_id: int, current_user=auth_helper.require_role("admin
     :return: A success message if deletion is successful, raises HTTPException otherwise.
     """
     try:
-        song_service.delete_song(song_id)
+        await song_service.delete_song(song_id)
         return {"detail": "Song deleted successfully"}
     except Exception as e:
-        raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/songs/{song_id}/like", response_model=LikeStatus)
+async def get_like_status(song_id: int, current_user=auth_helper.require_auth(), song_service=Depends(get_song_service)):
+    """
+    Get whether the current user likes a song.
+    :param song_id: The ID of the song.
+    :return: Whether the song is liked and its like count, raises HTTPException if the song does not exist.
+    """
+    try:
+        return await song_service.get_like_status(int(current_user["sub"]), song_id)
+    except SongNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.put("/songs/{song_id}/like", response_model=LikeStatus)
+async def like_song(song_id: int, current_user=auth_helper.require_auth(), song_service=Depends(get_song_service)):
+    """
+    Like a song as the current user. Liking a song twice counts once.
+    With the like buffer enabled the like is written by its next flush and like_count is null.
+    :param song_id: The ID of the song to like.
+    :return: The song's like status, raises HTTPException if the song does not exist.
+    """
+    try:
+        return await song_service.like_song(int(current_user["sub"]), song_id)
+    except SongNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except LikeBufferFullError:
+        raise HTTPException(status_code=503, detail="Too many likes waiting to be written, retry shortly", headers={"Retry-After": "1"})
+
+@router.delete("/songs/{song_id}/like", response_model=LikeStatus)
+async def unlike_song(song_id: int, current_user=auth_helper.require_auth(), song_service=Depends(get_song_service)):
+    """
+    Remove the current user's like of a song.
+    :param song_id: The ID of the song to unlike.
+    :return: The song's like status, raises HTTPException if the song does not exist.
+    """
+    try:
+        return await song_service.unlike_song(int(current_user["sub"]), song_id)
+    except SongNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except LikeBufferFullError:
+        raise HTTPException(status_code=503, detail="Too many likes waiting to be written, retry shortly", headers={"Retry-After": "1"})
@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from backend.song_service.models.playlist import Playlist
+from backend.song_service.models.playlist_page import PlaylistPage
+from backend.song_service.models.playlist_track import PlaylistTrack
+from backend.song_service.models.playlist_input import PlaylistInput
+from backend.song_service.repos.abstract_async_alchemy_playlist_repo import AbstractAsyncAlchemyPlaylistRepo
+
+class AbstractAsyncPlaylistService(ABC):
+    def __init__(self, playlist_repository: AbstractAsyncAlchemyPlaylistRepo):
+        self.playlist_repository = playlist_repository
+
+    @abstractmethod
+    async def create_playlist(self, user_id: int, input: PlaylistInput) -> Playlist:
+        """Create an empty playlist owned by a user."""
+        pass
+
+    @abstractmethod
+    async def get_playlist_page(self, user_id: int, playlist_id: int, limit: int, after: Optional[str] = None) -> PlaylistPage:
+        """Retrieve a user's playlist with one keyset page of its tracks, in playlist order."""
+        pass
+
+    @abstractmethod
+    async def delete_playlist(self, user_id: int, playlist_id: int) -> bool:
+        """Delete a user's playlist."""
+        pass
+
+    @abstractmethod
+    async def add_tracks(self, user_id: int, playlist_id: int, song_ids: List[int], before: Optional[int] = None) -> List[PlaylistTrack]:
+        """Insert songs in front of an entry of a user's playlist, or append them."""
+        pass
+
+    @abstractmethod
+    async def move_track(self, user_id: int, playlist_id: int, entry_id: int, before: Optional[int] = None) -> bool:
+        """Move an entry of a user's playlist in front of another, or to the end."""
+        pass
+
+    @abstractmethod
+    async def remove_track(self, user_id: int, playlist_id: int, entry_id: int) -> bool:
+        """Remove an entry from a user's playlist."""
+        pass
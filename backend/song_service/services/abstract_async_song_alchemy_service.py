@@ -0,0 +1,104 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, List, Optional
+from backend.song_service.models.song import Song
+from backend.song_service.models.song_page import SongPage
+from backend.song_service.models.song_batch import SongBatch
+from backend.song_service.models.song_search_page import SongSearchPage
+from backend.song_service.models.song_filter import SongFilter
+from backend.song_service.models.suggestion import Suggestion
+from backend.song_service.models.like_status import LikeStatus
+from backend.song_service.models.popular_song import PopularSong
+from backend.song_service.models.song_bulk_update_input import SongBulkUpdateInput
+from backend.song_service.models.bulk_delete_result import BulkDeleteResult
+from backend.song_service.models.song_input import SongInput
+from backend.song_service.models.song_update_input import SongUpdateInput
+from backend.song_service.repos.abstract_async_alchemy_song_repo import AbstractAsyncAlchemySongRepo
+
+class AbstractAsyncSongAlchemyService(ABC):
+    def __init__(self, song_repository: AbstractAsyncAlchemySongRepo):
+        self.song_repository = song_repository
+
+    @abstractmethod
+    async def get_songs_page(self, limit: int, after: Optional[int] = None, filters: Optional[SongFilter] = None) -> SongPage:
+        """Retrieve one keyset page of the songs matching filters, ordered by ID."""
+        pass
+
+    @abstractmethod
+    def export_songs(self) -> AsyncIterator[str]:
+        """Export every song as NDJSON chunks."""
+        pass
+
+    @abstractmethod
+    async def get_song_by_id(self, id: int) -> Optional[Song]:
+        """Retrieve a song by its ID."""
+        pass
+
+    @abstractmethod
+    async def search_songs(self, query: str, limit: int, offset: int = 0) -> SongSearchPage:
+        """Rank songs matching a full-text query."""
+        pass
+
+    @abstractmethod
+    async def suggest(self, prefix: str, limit: int) -> List[Suggestion]:
+        """Complete a prefix to song titles and artists."""
+        pass
+
+    @abstractmethod
+    async def like_song(self, user_id: int, song_id: int) -> LikeStatus:
+        """Like a song for a user."""
+        pass
+
+    @abstractmethod
+    async def unlike_song(self, user_id: int, song_id: int) -> LikeStatus:
+        """Remove a user's like of a song."""
+        pass
+
+    @abstractmethod
+    async def get_like_status(self, user_id: int, song_id: int) -> LikeStatus:
+        """Whether a user likes a song, and how many users do."""
+        pass
+
+    @abstractmethod
+    async def get_liked_songs_page(self, user_id: int, limit: int, after: Optional[int] = None) -> SongPage:
+        """Retrieve one keyset page of the songs a user likes."""
+        pass
+
+    @abstractmethod
+    async def get_most_liked_songs(self, limit: int) -> List[PopularSong]:
+        """Retrieve the most liked songs with their like counts."""
+        pass
+
+    @abstractmethod
+    async def get_songs_by_ids(self, ids: List[int]) -> SongBatch:
+        """Retrieve several songs in request order, reporting IDs that were not found."""
+        pass
+
+    @abstractmethod
+    async def create_new_song(self, input: SongInput) -> Optional[Song]:
+        """Create a new song."""
+        pass
+
+    @abstractmethod
+    async def create_songs(self, inputs: List[SongInput]) -> List[Song]:
+        """Create many songs in one transaction."""
+        pass
+
+    @abstractmethod
+    async def update_songs(self, inputs: List[SongBulkUpdateInput]) -> SongBatch:
+        """Update many songs in one transaction, reporting IDs that were not found."""
+        pass
+
+    @abstractmethod
+    async def delete_songs(self, ids: List[int]) -> BulkDeleteResult:
+        """Delete many songs in one transaction, reporting IDs that were not found."""
+        pass
+
+    @abstractmethod
+    async def update_song(self, id: int, song_input: SongUpdateInput) -> Optional[Song]:
+        """Update an existing song."""
+        pass
+
+    @abstractmethod
+    async def delete_song(self, id: int) -> bool:
+        """Delete a song by its ID."""
+        pass
@@ -0,0 +1,88 @@
+from backend.song_service.models.playlist import Playlist
+from backend.song_service.models.playlist_page import PlaylistPage
+from backend.song_service.models.playlist_track import PlaylistTrack
+from backend.song_service.models.playlist_input import PlaylistInput
+from backend.song_service.errors_exceptions.exceptions import PlaylistNotFoundError, PermissionDeniedError, SongNotFoundError
+from backend.song_service.repos.abstract_async_alchemy_playlist_repo import AbstractAsyncAlchemyPlaylistRepo
+from backend.song_service.services.abstract_async_playlist_service import AbstractAsyncPlaylistService
+from backend.song_service.utils.model_to_model_mapper import ModelToModelMapper
+from backend.database.models.playlist_model import Playlist as PlaylistModel
+from backend.database.pagination import split_page, encode_cursor, decode_cursor
+from typing import List, Optional
+from datetime import datetime
+
+class AsyncPlaylistService(AbstractAsyncPlaylistService):
+    def __init__(self, playlist_repository: AbstractAsyncAlchemyPlaylistRepo):
+        super().__init__(playlist_repository)
+        self.model_mapper = ModelToModelMapper()
+
+    async def _owned(self, user_id: int, playlist_id: int) -> PlaylistModel:
+        """The playlist, if it exists and belongs to user_id."""
+        playlist = await self.playlist_repository.get_playlist(playlist_id)
+        if not playlist:
+            raise PlaylistNotFoundError(f"Playlist with id {playlist_id} not found.")
+        if playlist.owner_id != user_id:
+            raise PermissionDeniedError(f"Playlist with id {playlist_id} belongs to another user.")
+        return playlist
+
+    def _track(self, row) -> PlaylistTrack:
+        entry_id, _, song = row
+        return PlaylistTrack(entry_id=entry_id, song=self.model_mapper.db_song_to_model(song))
+
+    async def create_playlist(self, user_id: int, input: PlaylistInput) -> Playlist:
+        """Create an empty playlist owned by a user."""
+        playlist = await self.playlist_repository.create_playlist(PlaylistModel(
+            owner_id=user_id,
+            name=input.name,
+            description=input.description,
+            track_count=0,
+            created_at=datetime.utcnow()
+        ))
+        return self.model_mapper.db_playlist_to_model(playlist)
+
+    async def get_playlist_page(self, user_id: int, playlist_id: int, limit: int, after: Optional[str] = None) -> PlaylistPage:
+        """Retrieve a user's playlist with one keyset page of its tracks, in playlist order."""
+        playlist = await self._owned(user_id, playlist_id)
+        rows, next_cursor = split_page(
+            await self.playlist_repository.list_tracks(playlist_id, limit, decode_cursor(after)), limit,
+            key=lambda row: encode_cursor((row.position, row.id))
+        )
+        return PlaylistPage(
+            playlist=self.model_mapper.db_playlist_to_model(playlist),
+            tracks=[self._track(row) for row in rows],
+            next_cursor=next_cursor
+        )
+
+    async def delete_playlist(self, user_id: int, playlist_id: int) -> bool:
+        """Delete a user's playlist."""
+        await self._owned(user_id, playlist_id)
+        if not await self.playlist_repository.delete_playlist(playlist_id):
+            raise PlaylistNotFoundError(f"Playlist with id {playlist_id} not found.")
+        return True
+
+    async def add_tracks(self, user_id: int, playlist_id: int, song_ids: List[int], before: Optional[int] = None) -> List[PlaylistTrack]:
+        """Insert songs in front of an entry of a user's playlist, or append them."""
+        await self._owned(user_id, playlist_id)
+        existing = set(await self.playlist_repository.get_existing_song_ids(song_ids))
+        missing = [song_id for song_id in dict.fromkeys(song_ids) if song_id not in existing]
+        if missing:
+            raise SongNotFoundError(f"Songs with ids {missing} not found.")
+        rows = await self.playlist_repository.add_tracks(playlist_id, song_ids, before)
+        if rows is None:
+            raise PlaylistNotFoundError(f"Entry {before} not found in playlist {playlist_id}.")
+        return [self._track(row) for row in rows]
+
+    async def move_track(self, user_id: int, playlist_id: int, entry_id: int, before: Optional[int] = None) -> bool:
+        """Move an entry of a user's playlist in front of another, or to the end."""
+        await self._owned(user_id, playlist_id)
+        if not await self.playlist_repository.move_track(playlist_id, entry_id, before):
+            entries = f"Entry {entry_id}" if before is None else f"Entry {entry_id} or {before}"
+            raise PlaylistNotFoundError(f"{entries} not found in playlist {playlist_id}.")
+        return True
+
+    async def remove_track(self, user_id: int, playlist_id: int, entry_id: int) -> bool:
+        """Remove an entry from a user's playlist."""
+        await self._owned(user_id, playlist_id)
+        if not await self.playlist_repository.remove_track(playlist_id, entry_id):
+            raise PlaylistNotFoundError(f"Entry {entry_id} not found in playlist {playlist_id}.")
+        return True
@@ -0,0 +1,230 @@
+from backend.song_service.models.song import Song
+from backend.song_service.models.song_page import SongPage
+from backend.song_service.models.song_batch import SongBatch
+from backend.song_service.models.song_search_page import SongSearchPage
+from backend.song_service.models.song_filter import SongFilter
+from backend.song_service.models.suggestion import Suggestion
+from backend.song_service.models.like_status import LikeStatus
+from backend.song_service.models.popular_song import PopularSong
+from backend.song_service.models.song_bulk_update_input import SongBulkUpdateInput
+from backend.song_service.models.bulk_delete_result import BulkDeleteResult
+from backend.song_service.models.song_input import SongInput
+from backend.song_service.models.song_update_input import SongUpdateInput
+from backend.song_service.errors_exceptions.exceptions import SongNotFoundError
+from backend.song_service.repos.abstract_async_alchemy_song_repo import AbstractAsyncAlchemySongRepo
+from backend.song_service.services.abstract_async_song_alchemy_service import AbstractAsyncSongAlchemyService
+from backend.song_service.utils.model_to_model_mapper import ModelToModelMapper
+from backend.database.pagination import split_page
+from backend.database.export import ndjson_chunks
+from backend.database.batch import order_by_request
+from backend.common.cache.cache_backend import CacheBackend
+from backend.common.cache.read_through import cached
+from backend.common.cache.keys import song_key, album_tracklist_keys
+from backend.common.search.inverted_index import InvertedIndex
+from backend.common.search.suggest import SuggestIndex
+from backend.song_service.services.like_buffer import LikeBuffer
+from pydantic import TypeAdapter
+from typing import List, Optional
+
+SONG_ADAPTER = TypeAdapter(Song)
+# Indexed fields and how much a word found in each counts towards a song's rank
+SONG_SEARCH_FIELDS = {"title": 3.0, "artist": 2.0, "genre": 1.0}
+
+def song_suggestions(song) -> list:
+    """Autocomplete entries of a song, weighted by its likes; an artist's weight adds up over their songs."""
+    weight = 1.0 + (getattr(song, "like_count", None) or 0)
+    return [("song", song.title, weight), ("artist", song.artist, weight)]
+
+class AsyncSongAlchemyService(AbstractAsyncSongAlchemyService):
+    def __init__(
+        self,
+        song_repository: AbstractAsyncAlchemySongRepo,
+        cache: Optional[CacheBackend] = None,
+        search_index: Optional[InvertedIndex] = None,
+        suggest_index: Optional[SuggestIndex] = None,
+        like_buffer: Optional[LikeBuffer] = None
+    ):
+        super().__init__(song_repository)
+        self.model_mapper = ModelToModelMapper()
+        self.cache = cache
+        self.search_index = search_index
+        self.suggest_index = suggest_index
+        self.like_buffer = like_buffer
+
+    def _index(self, songs) -> None:
+        if self.search_index is not None:
+            for song in songs:
+                self.search_index.add(song.id, song)
+        if self.suggest_index is not None:
+            for song in songs:
+                self.suggest_index.index(song.id, song_suggestions(song))
+
+    def _unindex(self, song_ids: List[int]) -> None:
+        if self.search_index is not None:
+            for song_id in song_ids:
+                self.search_index.remove(song_id)
+        if self.suggest_index is not None:
+            for song_id in song_ids:
+                self.suggest_index.remove(song_id)
+
+    async def _albums_of(self, song_ids: List[int]) -> List[int]:
+        """Albums whose cached tracklists embed the given songs; only looked up when caching."""
+        if self.cache is None or not song_ids:
+            return []
+        return await self.song_repository.get_album_ids_for_songs(song_ids)
+
+    async def _invalidate(self, song_ids: List[int], album_ids: List[int]) -> None:
+        """Drop cached songs and the album tracklists containing them."""
+        if self.cache is not None and song_ids:
+            await self.cache.delete(*[song_key(song_id) for song_id in song_ids], *album_tracklist_keys(album_ids))
+
+    async def get_songs_page(self, limit: int, after: Optional[int] = None, filters: Optional[SongFilter] = None) -> SongPage:
+        """Retrieve one keyset page of the songs matching filters, ordered by ID."""
+        songs, next_cursor = split_page(await self.song_repository.list_songs(limit, after, filters), limit)
+        return SongPage(
+            items=[self.model_mapper.db_song_to_model(song) for song in songs],
+            next_cursor=next_cursor
+        )
+
+    def export_songs(self):
+        """Export every song as NDJSON chunks."""
+        return ndjson_chunks(self.song_repository.stream_songs(), self.model_mapper.db_song_to_model)
+
+    async def get_song_by_id(self, id: int) -> Song:
+        """Retrieve a song by its ID."""
+        async def load():
+            song = await self.song_repository.get_song_by_id(id)
+            return self.model_mapper.db_song_to_model(song) if song else None
+
+        song = await cached(self.cache, song_key(id), SONG_ADAPTER, load)
+        if not song:
+            raise SongNotFoundError(f"Song with id {id} not found.")
+        return song
+
+    async def search_songs(self, query: str, limit: int, offset: int = 0) -> SongSearchPage:
+        """Rank songs by title, artist and genre against query using the search index."""
+        ids, total = self.search_index.search(query, limit, offset)
+        # Rows deleted by another replica are still indexed here; they are dropped on load
+        songs, _ = order_by_request(await self.song_repository.get_songs_by_ids(ids), ids) if ids else ([], [])
+        return SongSearchPage(
+            items=[self.model_mapper.db_song_to_model(song) for song in songs],
+            total=total,
+            next_offset=offset + limit if offset + limit < total else None,
+            truncated=self.search_index.prefix_truncated(query)
+        )
+
+    async def suggest(self, prefix: str, limit: int) -> List[Suggestion]:
+        """Complete prefix to song titles and artists, tolerating typos."""
+        return [Suggestion(**suggestion) for suggestion in self.suggest_index.suggest(prefix, limit)]
+
+    def reweigh_suggestions(self, songs) -> None:
+        """Likes make a song and its artist rank higher in suggestions."""
+        if self.suggest_index is not None:
+            for song in songs:
+                self.suggest_index.index(song.id, song_suggestions(song))
+
+    def _like_status(self, song_id: int, song, liked: bool) -> LikeStatus:
+        if not song:
+            raise SongNotFoundError(f"Song with id {song_id} not found.")
+        self.reweigh_suggestions([song])
+        return LikeStatus(song_id=song.id, liked=liked, like_count=song.like_count)
+
+    async def like_song(self, user_id: int, song_id: int) -> LikeStatus:
+        """Like a song for a user; liking it again changes nothing."""
+        if self.like_buffer is not None:
+            # Checked (through the cache) before buffering, so unknown songs get a 404 like they do unbuffered;
+            # a song deleted before the flush has its like dropped there
+            await self.get_song_by_id(song_id)
+            await self.like_buffer.submit(user_id, song_id, True)
+            return LikeStatus(song_id=song_id, liked=True, like_count=None)
+        return self._like_status(song_id, await self.song_repository.like_song(user_id, song_id), True)
+
+    async def unlike_song(self, user_id: int, song_id: int) -> LikeStatus:
+        """Remove a user's like of a song; unliking a song that is not liked changes nothing."""
+        if self.like_buffer is not None:
+            await self.get_song_by_id(song_id)
+            await self.like_buffer.submit(user_id, song_id, False)
+            return LikeStatus(song_id=song_id, liked=False, like_count=None)
+        return self._like_status(song_id, await self.song_repository.unlike_song(user_id, song_id), False)
+
+    async def get_like_status(self, user_id: int, song_id: int) -> LikeStatus:
+        """Whether a user likes a song, and how many users do."""
+        song = await self.song_repository.get_song_by_id(song_id)
+        if not song:
+            raise SongNotFoundError(f"Song with id {song_id} not found.")
+        liked = self.like_buffer.pending(user_id, song_id) if self.like_buffer is not None else None
+        if liked is None:
+            liked = await self.song_repository.is_liked(user_id, song_id)
+        return LikeStatus(song_id=song.id, liked=liked, like_count=song.like_count)
+
+    async def get_liked_songs_page(self, user_id: int, limit: int, after: Optional[int] = None) -> SongPage:
+        """Retrieve one keyset page of the songs a user likes, ordered by ID."""
+        songs, next_cursor = split_page(await self.song_repository.list_liked_songs(user_id, limit, after), limit)
+        return SongPage(
+            items=[self.model_mapper.db_song_to_model(song) for song in songs],
+            next_cursor=next_cursor
+        )
+
+    async def get_most_liked_songs(self, limit: int) -> List[PopularSong]:
+        """Retrieve the most liked songs with their like counts."""
+        songs = await self.song_repository.list_most_liked(limit)
+        return [
+            PopularSong(**self.model_mapper.db_song_to_model(song).model_dump(), like_count=song.like_count)
+            for song in songs
+        ]
+
+    async def get_songs_by_ids(self, ids: List[int]) -> SongBatch:
+        """Retrieve several songs in request order, reporting IDs that were not found."""
+        songs, missing = order_by_request(await self.song_repository.get_songs_by_ids(ids), ids)
+        return SongBatch(items=[self.model_mapper.db_song_to_model(song) for song in songs], missing=missing)
+
+    async def create_new_song(self, input: SongInput) -> Song:
+        """Create a new song."""
+        created_song = await self.song_repository.create_song(self.model_mapper.song_input_to_db_model(input))
+        if created_song:
+            self._index([created_song])
+        return self.model_mapper.db_song_to_model(created_song) if created_song else None
+
+    async def create_songs(self, inputs: List[SongInput]) -> List[Song]:
+        """Create many songs in one transaction."""
+        created = await self.song_repository.create_songs([self.model_mapper.song_input_to_row(i) for i in inputs])
+        self._index(created)
+        return [self.model_mapper.db_song_to_model(song) for song in created]
+
+    async def update_songs(self, inputs: List[SongBulkUpdateInput]) -> SongBatch:
+        """Update many songs in one transaction, reporting IDs that were not found."""
+        rows = [{**i.model_dump(exclude_unset=True), "id": i.id} for i in inputs]
+        songs, missing = order_by_request(await self.song_repository.update_songs(rows), [i.id for i in inputs])
+        await self._invalidate([song.id for song in songs], await self._albums_of([song.id for song in songs]))
+        self._index(songs)
+        return SongBatch(items=[self.model_mapper.db_song_to_model(song) for song in songs], missing=missing)
+
+    async def delete_songs(self, ids: List[int]) -> BulkDeleteResult:
+        """Delete many songs in one transaction, reporting IDs that were not found."""
+        album_ids = await self._albums_of(ids)
+        deleted = set(await self.song_repository.delete_songs(ids))
+        await self._invalidate(list(deleted), album_ids)
+        self._unindex(list(deleted))
+        return BulkDeleteResult(
+            deleted=[i for i in ids if i in deleted],
+            missing=[i for i in ids if i not in deleted]
+        )
+
+    async def update_song(self, id: int, song_input: SongUpdateInput) -> Song:
+        """Update an existing song."""
+        updated_song = await self.song_repository.update_song(id, song_input)
+        await self._invalidate([id], await self._albums_of([id]))
+        if not updated_song:
+            raise SongNotFoundError(f"Song with id {id} not found.")
+        self._index([updated_song])
+        return self.model_mapper.db_song_to_model(updated_song)
+
+    async def delete_song(self, id: int) -> bool:
+        """Delete a song by its ID."""
+        album_ids = await self._albums_of([id])
+        deleted = await self.song_repository.delete_song(id)
+        await self._invalidate([id], album_ids)
+        if not deleted:
+            raise SongNotFoundError(f"Song with id {id} not found.")
+        self._unindex([id])
+        return True
@@ -0,0 +1,226 @@
+import asyncio
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from backend.song_service.errors_exceptions.exceptions import LikeBufferFullError
+load_dotenv()
+
+class LikeBuffer:
+    """
+    Write-behind buffer for like and unlike toggles.
+
+    Only the latest wanted state of each (user_id, song_id) pair is kept, so a
+    user tapping a heart ten times costs at most one row change. Pending pairs
+    are written every flush_interval seconds, or as soon as max_pending are
+    waiting, in transactions of at most batch_size pairs: one multi-row INSERT,
+    one DELETE and one executemany UPDATE of the like counts each.
+
+    When a batch fails, each of its pairs is retried in a transaction of its
+    own, so one bad pair cannot hold back the rest. A pair that fails is put
+    back (behind any newer toggle of the same pair) for the next flush, and
+    dropped, with a log line, once it has failed max_attempts times. Flushes
+    back off while writes fail.
+
+    At most capacity pairs wait at once: submitting a new pair to a full
+    buffer wakes the flush and waits for it, for up to max_wait seconds, then
+    raises LikeBufferFullError. close() writes everything still pending and
+    logs the pairs it could not write, so a clean shutdown loses nothing that
+    can be written; a crash loses at most one interval. Toggles of a user deleted
+    before they are written are dropped by the write.
+    """
+    def __init__(
+        self,
+        repository,
+        flush_interval: float = 0.5,
+        max_pending: int = 1000,
+        batch_size: int = 1000,
+        capacity: int = 10000,
+        max_wait: float = 5.0,
+        max_attempts: int = 5,
+        max_backoff: float = 30.0,
+        on_applied: Optional[Callable[[list], None]] = None
+    ):
+        self.repository = repository
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.capacity = max(capacity, max_pending)
+        self.max_wait = max_wait
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+        # Called with the songs whose like_count a flush changed
+        self.on_applied = on_applied
+        self._pending: Dict[Tuple[int, int], bool] = {}
+        self._flushing: Dict[Tuple[int, int], bool] = {}
+        # Failed writes of each pair still pending
+        self._attempts: Dict[Tuple[int, int], int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._space = asyncio.Event()
+        self._failed_flushes = 0
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+        self.submitted = 0
+        self.written = 0
+        self.flushes = 0
+        self.failures = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    def _full(self, pair: Tuple[int, int]) -> bool:
+        # Replacing a pair's state takes no room
+        return pair not in self._pending and len(self._pending) >= self.capacity
+
+    async def _wait_for_space(self, pair: Tuple[int, int]) -> None:
+        while self._full(pair):
+            self._space.clear()
+            self._wake.set()
+            await self._space.wait()
+
+    async def submit(self, user_id: int, song_id: int, liked: bool) -> None:
+        """
+        Buffer that user_id does (liked) or does not like song_id.
+        Waits for a flush while the buffer is full; raises LikeBufferFullError if none makes room in max_wait seconds.
+        """
+        pair = (user_id, song_id)
+        if self._full(pair):
+            try:
+                await asyncio.wait_for(self._wait_for_space(pair), self.max_wait)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise LikeBufferFullError(f"{len(self._pending)} likes are waiting to be written")
+        self._pending[pair] = liked
+        self.submitted += 1
+        if len(self._pending) >= self.max_pending:
+            self._wake.set()
+
+    def pending(self, user_id: int, song_id: int) -> Optional[bool]:
+        """The buffered state of a pair, or None when nothing is waiting to be written for it."""
+        liked = self._pending.get((user_id, song_id))
+        return self._flushing.get((user_id, song_id)) if liked is None else liked
+
+    async def flush(self) -> int:
+        """
+        Write every pending pair now.
+        :return: The number of pairs taken from the buffer.
+        """
+        async with self._flush_lock:
+            batch, self._pending = self._pending, {}
+            self._space.set()
+            if not batch:
+                return 0
+            self._flushing = batch
+            failures = self.failures
+            try:
+                # A fixed order makes concurrent flushes from several replicas lock rows in the same order
+                items = sorted(batch.items())
+                for start in range(0, len(items), self.batch_size):
+                    await self._write(items[start:start + self.batch_size])
+            finally:
+                self._flushing = {}
+            self.flushes += 1
+            self._failed_flushes = self._failed_flushes + 1 if self.failures > failures else 0
+            return len(batch)
+
+    async def _apply(self, items: List[Tuple[Tuple[int, int], bool]]) -> None:
+        """Write items in one transaction; raises when it fails."""
+        likes = [pair for pair, liked in items if liked]
+        unlikes = [pair for pair, liked in items if not liked]
+        songs = await self.repository.apply_likes(likes, unlikes)
+        self.written += len(items)
+        for pair, _ in items:
+            self._attempts.pop(pair, None)
+        if self.on_applied is not None and songs:
+            self.on_applied(songs)
+
+    def _failed(self, pair: Tuple[int, int], liked: bool, error: Exception) -> None:
+        """Put a pair whose write failed back for the next flush, or drop it after max_attempts."""
+        attempts = self._attempts.get(pair, 0) + 1
+        if attempts >= self.max_attempts:
+            self._attempts.pop(pair, None)
+            self.dropped += 1
+            print(f"Dropping buffered {'like' if liked else 'unlike'} of song {pair[1]} by user {pair[0]} after {attempts} failed writes: {error}")
+            return
+        self._attempts[pair] = attempts
+        self._pending.setdefault(pair, liked)
+
+    async def _write(self, items: List[Tuple[Tuple[int, int], bool]]) -> None:
+        try:
+            await self._apply(items)
+            return
+        except Exception as e:
+            self.failures += 1
+            if len(items) == 1:
+                self._failed(*items[0], e)
+                return
+            print(f"Error writing {len(items)} buffered likes, retrying them one by one: {e}")
+        for pair, liked in items:
+            try:
+                await self._apply([(pair, liked)])
+            except Exception as e:
+                self._failed(pair, liked, e)
+
+    async def _run(self) -> None:
+        while not self._closing:
+            # While writes keep failing, wait longer between flushes, up to max_backoff
+            interval = min(self.flush_interval * 2 ** self._failed_flushes, self.max_backoff)
+            try:
+                await asyncio.wait_for(self._wake.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+        await self.flush()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> List[Tuple[int, int, bool]]:
+        """
+        Stop the periodic flush and write what is still pending.
+        :return: The (user_id, song_id, liked) toggles the last flush could not write, which are also logged.
+        """
+        self._closing = True
+        if self._task is not None:
+            # Not cancelled: a batch cut off mid-write would be neither committed nor put back
+            self._wake.set()
+            await self._task
+            self._task = None
+        else:
+            await self.flush()
+        lost = [(user_id, song_id, liked) for (user_id, song_id), liked in sorted(self._pending.items())]
+        if lost:
+            print(f"Like buffer closed with {len(lost)} unwritten toggles (user_id, song_id, liked): {lost}")
+        return lost
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "submitted": self.submitted,
+            "written": self.written,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+        }
+
+def like_buffer_from_env(repository, on_applied: Optional[Callable[[list], None]] = None) -> Optional[LikeBuffer]:
+    """
+    Only with LIKE_BUFFER_ENABLED=true, since buffered likes are answered with like_count null.
+    Otherwise each like is written in its own transaction; returns None then.
+    """
+    if os.getenv("LIKE_BUFFER_ENABLED", "false").lower() not in ("true", "1", "yes"):
+        return None
+    return LikeBuffer(
+        repository,
+        flush_interval=float(os.getenv("LIKE_FLUSH_INTERVAL_SECONDS", "0.5")),
+        max_pending=int(os.getenv("LIKE_FLUSH_MAX_PENDING", "1000")),
+        batch_size=int(os.getenv("LIKE_FLUSH_BATCH_SIZE", "1000")),
+        capacity=int(os.getenv("LIKE_BUFFER_CAPACITY", "10000")),
+        max_wait=float(os.getenv("LIKE_BUFFER_MAX_WAIT_SECONDS", "5")),
+        max_attempts=int(os.getenv("LIKE_WRITE_MAX_ATTEMPTS", "5")),
+        max_backoff=float(os.getenv("LIKE_FLUSH_MAX_BACKOFF_SECONDS", "30")),
+        on_applied=on_applied,
+    )
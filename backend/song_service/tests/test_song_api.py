@@ -2,19 +2,27 @@
 Simple Song API Test with In-Memory Database
 """
 
+import asyncio
 import pytest
 import time
+import json
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from datetime import datetime
+from sqlalchemy import create_engine, insert
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 
 # Import FastAPI app and dependencies
 from backend.song_service.app import app
 from backend.song_service.routers.song_router import get_song_service
+from backend.song_service.routers.playlist_router import get_playlist_service
 
 # Import your existing classes
-from backend.song_service.services.song_alchemy_service import SongAlchemyService
-from backend.song_service.repos.song_alchemy_repo import SongAlchemyRepository
+from backend.song_service.services.async_song_alchemy_service import AsyncSongAlchemyService
+from backend.song_service.repos.async_song_alchemy_repo import AsyncSongAlchemyRepository
+from backend.song_service.services.async_playlist_service import AsyncPlaylistService
+from backend.song_service.repos.async_playlist_alchemy_repo import AsyncPlaylistAlchemyRepository
 
 # Import database models
 from backend.database.models.base import Base
@@ -22,7 +30,17 @@ from backend.database.models.album_model import Album as AlbumModel
 from backend.database.models.song_model import Song as SongModel
 from backend.database.models.album_songs_model import album_songs
 from backend.database.models.user_likes import user_likes
+from backend.database.models.user_model import User as UserModel
+from backend.database.models.playlist_tracks_model import playlist_tracks
 from backend.database.connector.test_connector import TestConnector
+from backend.database import export
+from backend.common.cache.memory_cache import InMemoryCache
+from backend.common.auth.auth_helper import auth_helper
+from backend.common.search.inverted_index import InvertedIndex, index_partitions
+from backend.common.search.suggest import SuggestIndex, suggest_partitions
+from backend.song_service.services.async_song_alchemy_service import SONG_SEARCH_FIELDS, song_suggestions
+from backend.song_service.services.like_buffer import LikeBuffer
+from backend.song_service.errors_exceptions.exceptions import LikeBufferFullError
 
 # Import mock data
 from backend.song_service.tests.mock_test_data import *
@@ -71,14 +89,25 @@ def test_client():
     session.add_all(MOCK_SONGS)
     session.commit()
     
+    # The app talks to the same in-memory database through an async engine.
+    # NullPool because each TestClient request runs on its own event loop.
+    async_engine = create_async_engine(
+        "sqlite+aiosqlite:///file:memdb1?mode=memory&cache=shared&uri=true",
+        poolclass=NullPool,
+        echo=False
+    )
+    AsyncTestSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
     # Create test components
-    test_connector = TestConnector(session_factory=TestSessionLocal)
+    test_connector = TestConnector(session_factory=AsyncTestSessionLocal)
 
-    test_repository = SongAlchemyRepository(db_connector=test_connector)
-    test_service = SongAlchemyService(song_repository=test_repository)
+    test_repository = AsyncSongAlchemyRepository(db_connector=test_connector)
+    test_service = AsyncSongAlchemyService(song_repository=test_repository)
     
     # Override FastAPI dependency
     app.dependency_overrides[get_song_service] = lambda: test_service
+    test_playlist_service = AsyncPlaylistService(AsyncPlaylistAlchemyRepository(db_connector=test_connector))
+    app.dependency_overrides[get_playlist_service] = lambda: test_playlist_service
     
     # Create test client
     client = TestClient(app)
@@ -95,10 +124,412 @@ def test_get_all_songs(test_client):
     """
     response = test_client.get("/songs", headers=get_auth_headers())
     assert response.status_code == 200
-    songs = response.json()
+    songs = response.json()["items"]
     assert isinstance(songs, list)
     assert len(songs) > 0
 
+def test_get_songs_pages_by_cursor(test_client):
+    """
+    Test GET /songs follows next_cursor through every song exactly once.
+    """
+    all_ids = [song["id"] for song in test_client.get("/songs", headers=get_auth_headers()).json()["items"]]
+    paged_ids, after = [], None
+    while True:
+        params = {"limit": 3} if after is None else {"limit": 3, "after": after}
+        page = test_client.get("/songs", params=params, headers=get_auth_headers()).json()
+        assert len(page["items"]) <= 3
+        paged_ids.extend(song["id"] for song in page["items"])
+        after = page["next_cursor"]
+        if after is None:
+            break
+    assert paged_ids == sorted(paged_ids)
+    assert paged_ids == all_ids
+
+def test_filter_songs(test_client):
+    """
+    Test GET /songs filters by artist, genre, release date and duration, and pages filtered results by cursor.
+    """
+    headers = get_auth_headers()
+
+    def artists(params):
+        response = test_client.get("/songs", params=params, headers=headers)
+        assert response.status_code == 200
+        return [song["artist"] for song in response.json()["items"]]
+
+    assert artists({"artist": "Drake"}) == ["Drake"]
+    assert artists({"genre": "Jazz", "max_duration": 200}) == ["Frank Sinatra"]
+    assert artists({"released_after": "2017-01-01", "released_before": "2017-12-31"}) == ["Ed Sheeran", "Kendrick Lamar"]
+    assert artists({"genre": "Electronic", "min_duration": 600}) == ["Deadmau5"]
+    assert artists({"artist": "Nobody"}) == []
+
+    first = test_client.get("/songs", params={"genre": "Electronic", "limit": 1}, headers=headers).json()
+    second = test_client.get("/songs", params={"genre": "Electronic", "limit": 1, "after": first["next_cursor"]}, headers=headers).json()
+    assert [song["artist"] for song in first["items"] + second["items"]] == ["Daft Punk", "Deadmau5"]
+    assert second["next_cursor"] is None
+
+def test_get_songs_by_ids(test_client):
+    """
+    Test GET /songs?ids= returns songs in request order and reports missing IDs.
+    """
+    response = test_client.get("/songs", params={"ids": "3,1,999,3"}, headers=get_auth_headers())
+    assert response.status_code == 200
+    batch = response.json()
+    assert [song["id"] for song in batch["items"]] == [3, 1]
+    assert batch["missing"] == [999]
+    assert test_client.get("/songs", params={"ids": "1,abc"}, headers=get_auth_headers()).status_code == 422
+
+def test_bulk_create_update_delete_songs(test_client):
+    """
+    Test POST, PATCH and DELETE /songs:batch apply whole batches and report per item.
+    """
+    admin = get_auth_headers(role="admin")
+    new_songs = [
+        {"title": f"Bulk Song {i}", "artist": "Bulk Artist", "genre": "Test", "file_url": f"/songs/bulk_{i}.mp3"}
+        for i in range(3)
+    ]
+    response = test_client.post("/songs:batch", json=new_songs, headers=admin)
+    assert response.status_code == 200
+    created = response.json()
+    assert [song["title"] for song in created] == [song["title"] for song in new_songs]
+    ids = [song["id"] for song in created]
+
+    invalid = test_client.post("/songs:batch", json=[new_songs[0], {"title": "No artist"}], headers=admin)
+    assert invalid.status_code == 422
+    assert [error["index"] for error in invalid.json()["detail"]] == [1]
+    nulls = test_client.patch("/songs:batch", json=[{"id": ids[0], "duration": 7}, {"id": ids[1], "artist": None}], headers=admin)
+    assert nulls.status_code == 422
+    assert [error["index"] for error in nulls.json()["detail"]] == [1]
+    assert test_client.get(f"/songs/{ids[0]}", headers=admin).json()["duration"] is None
+
+    response = test_client.patch(
+        "/songs:batch",
+        json=[{"id": ids[1], "title": "Renamed"}, {"id": 999999, "title": "Ghost"}, {"id": ids[0], "duration": 42}],
+        headers=admin
+    )
+    assert response.status_code == 200
+    batch = response.json()
+    assert [song["id"] for song in batch["items"]] == [ids[1], ids[0]]
+    assert batch["items"][0]["title"] == "Renamed"
+    assert batch["items"][1]["duration"] == 42
+    assert batch["missing"] == [999999]
+
+    response = test_client.delete("/songs:batch", params={"ids": f"{ids[0]},{ids[1]},999999"}, headers=admin)
+    assert response.status_code == 200
+    assert response.json() == {"deleted": [ids[0], ids[1]], "missing": [999999]}
+    assert test_client.get(f"/songs/{ids[0]}", headers=get_auth_headers()).status_code == 404
+    assert test_client.post("/songs:batch", json=new_songs, headers=get_auth_headers()).status_code == 403
+
+def test_song_reads_are_cached_until_deleted(test_client):
+    """
+    Test song lookups are served from the cache and invalidated by deletes.
+    """
+    service = app.dependency_overrides[get_song_service]()
+    service.cache = InMemoryCache()
+    headers = get_auth_headers()
+
+    assert test_client.get("/songs/5", headers=headers).status_code == 200
+    assert test_client.get("/songs/5", headers=headers).status_code == 200
+    assert (service.cache.stats()["hits"], service.cache.stats()["misses"]) == (1, 1)
+
+    assert test_client.delete("/songs/5", headers=get_auth_headers(role="admin")).status_code == 200
+    assert test_client.get("/songs/5", headers=headers).status_code == 404
+
+def test_verified_tokens_are_cached(test_client):
+    """
+    Test repeat requests with the same bearer token skip JWT verification.
+    """
+    token_cache = auth_helper.verifier.cache
+    token_cache.clear()
+    headers = get_auth_headers()
+    hits = token_cache.stats()["hits"]
+    assert test_client.get("/songs/2", headers=headers).status_code == 200
+    assert test_client.get("/songs/3", headers=headers).status_code == 200
+    assert token_cache.stats()["hits"] == hits + 1
+    assert test_client.get("/health").json()["token_cache"]["entries"] == 1
+
+def test_export_songs_streams_ndjson(test_client, monkeypatch):
+    """
+    Test GET /songs/export streams every song as one JSON object per line.
+    """
+    # Force several partitions so batching is exercised with the small mock table
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+    listed = test_client.get("/songs", params={"limit": 500}, headers=get_auth_headers()).json()["items"]
+    response = test_client.get("/songs/export", headers=get_auth_headers())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert exported == listed
+
+def test_search_songs(test_client):
+    """
+    Test GET /songs/search ranks indexed songs and follows creates and deletes.
+    """
+    headers = get_auth_headers()
+    admin = get_auth_headers(role="admin")
+    service = app.dependency_overrides[get_song_service]()
+    assert test_client.get("/songs/search", params={"q": "queen"}, headers=headers).status_code == 503
+
+    service.search_index = asyncio.run(index_partitions(InvertedIndex(SONG_SEARCH_FIELDS), service.song_repository.stream_songs()))
+    response = test_client.get("/songs/search", params={"q": "BOHEMIAN queen"}, headers=headers)
+    assert response.status_code == 200
+    assert [song["title"] for song in response.json()["items"]] == ["Bohemian Rhapsody"]
+
+    new_song = {**get_song_for_create_test(), "title": "Déjà Vu", "artist": "Searchable Artist"}
+    created = test_client.post("/songs", json=new_song, headers=admin).json()
+    response = test_client.get("/songs/search", params={"q": "deja searcha"}, headers=headers)
+    assert response.json()["total"] == 1
+    assert response.json()["items"][0]["id"] == created["id"]
+
+    assert test_client.delete(f"/songs/{created['id']}", headers=admin).status_code == 200
+    assert test_client.get("/songs/search", params={"q": "deja"}, headers=headers).json() == {
+        "items": [], "total": 0, "next_offset": None, "truncated": False
+    }
+
+def test_suggest_songs(test_client):
+    """
+    Test GET /songs/suggest completes titles and artists, ranks by popularity and tolerates typos.
+    """
+    headers = get_auth_headers()
+    admin = get_auth_headers(role="admin")
+    service = app.dependency_overrides[get_song_service]()
+    assert test_client.get("/songs/suggest", params={"prefix": "qu"}, headers=headers).status_code == 503
+
+    service.suggest_index = asyncio.run(suggest_partitions(SuggestIndex(), service.song_repository.stream_songs(), song_suggestions))
+    response = test_client.get("/songs/suggest", params={"prefix": "bohemain"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()[0]["text"] == "Bohemian Rhapsody"
+    assert response.json()[0]["kind"] == "song"
+
+    created = test_client.post("/songs", json={**get_song_for_create_test(), "title": "Queens Anthem", "artist": "Queen"}, headers=admin).json()
+    suggestions = test_client.get("/songs/suggest", params={"prefix": "QUE"}, headers=headers).json()
+    assert suggestions[:2] == [
+        {"text": "Queen", "kind": "artist", "score": 2.0},
+        {"text": "Queens Anthem", "kind": "song", "score": 1.0}
+    ]
+
+    assert test_client.delete(f"/songs/{created['id']}", headers=admin).status_code == 200
+    suggestions = test_client.get("/songs/suggest", params={"prefix": "que", "limit": 1}, headers=headers).json()
+    assert suggestions == [{"text": "Queen", "kind": "artist", "score": 1.0}]
+
+def test_like_and_unlike_songs(test_client):
+    """
+    Test liking is idempotent per user, keeps like_count in step and feeds the liked, most-liked and suggest views.
+    """
+    first_user = get_auth_headers()
+    second_user = {"Authorization": f"Bearer {create_test_token(user_id='2')}"}
+    service = app.dependency_overrides[get_song_service]()
+    service.suggest_index = asyncio.run(suggest_partitions(SuggestIndex(), service.song_repository.stream_songs(), song_suggestions))
+
+    assert test_client.put("/songs/7/like", headers=first_user).json() == {"song_id": 7, "liked": True, "like_count": 1}
+    assert test_client.put("/songs/7/like", headers=first_user).json()["like_count"] == 1
+    assert test_client.put("/songs/7/like", headers=second_user).json()["like_count"] == 2
+    assert test_client.put("/songs/8/like", headers=first_user).json()["like_count"] == 1
+    assert test_client.get("/songs/7/like", headers=second_user).json() == {"song_id": 7, "liked": True, "like_count": 2}
+    assert test_client.put("/songs/999999/like", headers=first_user).status_code == 404
+
+    most_liked = test_client.get("/songs/most-liked", params={"limit": 2}, headers=first_user).json()
+    assert [(song["id"], song["like_count"]) for song in most_liked] == [(7, 2), (8, 1)]
+    page = test_client.get("/songs/liked", params={"limit": 1}, headers=first_user).json()
+    assert [song["id"] for song in page["items"]] == [7]
+    page = test_client.get("/songs/liked", params={"limit": 1, "after": page["next_cursor"]}, headers=first_user).json()
+    assert [song["id"] for song in page["items"]] == [8] and page["next_cursor"] is None
+    assert test_client.get("/songs/suggest", params={"prefix": "one more"}, headers=first_user).json()[0]["score"] == 3.0
+
+    assert test_client.delete("/songs/7/like", headers=first_user).json() == {"song_id": 7, "liked": False, "like_count": 1}
+    assert test_client.delete("/songs/7/like", headers=first_user).json()["like_count"] == 1
+    assert test_client.get("/songs/7/like", headers=first_user).json()["liked"] is False
+    assert test_client.delete("/songs/7/like", headers=second_user).json()["like_count"] == 0
+    assert test_client.delete("/songs/8/like", headers=first_user).json()["like_count"] == 0
+
+def test_buffered_likes_are_coalesced_and_flushed(test_client):
+    """
+    Test buffered toggles are written by a flush as their latest state, in one batch, and drained on close.
+    """
+    first_user = get_auth_headers()
+    second_user = {"Authorization": f"Bearer {create_test_token(user_id='2')}"}
+    service = app.dependency_overrides[get_song_service]()
+    applied = []
+    service.like_buffer = LikeBuffer(service.song_repository, flush_interval=3600, on_applied=applied.extend)
+    engine = create_engine("sqlite:///file:memdb1?mode=memory&cache=shared&uri=true", connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(insert(UserModel).prefix_with("OR IGNORE"), [
+            {"id": user_id, "username": f"liker{user_id}", "email": f"liker{user_id}@example.com",
+             "password_hash": "hash", "first_name": "Liker", "created_at": datetime.now()}
+            for user_id in (1, 2)
+        ])
+    # User 3 is deleted before the flush: their toggle is dropped
+    third_user = {"Authorization": f"Bearer {create_test_token(user_id='3')}"}
+
+    for _ in range(3):
+        assert test_client.put("/songs/9/like", headers=first_user).json() == {"song_id": 9, "liked": True, "like_count": None}
+        test_client.delete("/songs/9/like", headers=first_user)
+    test_client.put("/songs/9/like", headers=first_user)
+    test_client.put("/songs/9/like", headers=second_user)
+    test_client.put("/songs/9/like", headers=third_user)
+    # Unknown songs are refused before they reach the buffer
+    assert test_client.put("/songs/999999/like", headers=second_user).status_code == 404
+    assert test_client.delete("/songs/999999/like", headers=second_user).status_code == 404
+    # Read-your-writes before the flush; nothing is counted yet
+    assert test_client.get("/songs/9/like", headers=first_user).json() == {"song_id": 9, "liked": True, "like_count": 0}
+
+    assert asyncio.run(service.like_buffer.flush()) == 3
+    assert [song.id for song in applied] == [9]
+    assert test_client.get("/songs/9/like", headers=second_user).json() == {"song_id": 9, "liked": True, "like_count": 2}
+    assert service.like_buffer.stats()["written"] == 3 and service.like_buffer.stats()["pending"] == 0
+    assert test_client.get("/songs/9/like", headers=third_user).json()["liked"] is False
+
+    test_client.delete("/songs/9/like", headers=first_user)
+    test_client.delete("/songs/9/like", headers=second_user)
+    asyncio.run(service.like_buffer.close())
+    assert test_client.get("/songs/9/like", headers=first_user).json() == {"song_id": 9, "liked": False, "like_count": 0}
+
+def test_like_buffer_isolates_failing_pairs_and_bounds_pending():
+    """
+    Test a failing batch is retried pair by pair, a pair failing max_attempts times is dropped,
+    a full buffer makes submit wait for a flush (or give up), and close reports what it could not write.
+    """
+    class FlakyRepository:
+        def __init__(self):
+            self.written = []
+
+        async def apply_likes(self, likes, unlikes):
+            if any(song_id == 13 for _, song_id in likes + unlikes):
+                raise RuntimeError("constraint violation")
+            self.written += likes + unlikes
+            return []
+
+    repository = FlakyRepository()
+    buffer = LikeBuffer(repository, flush_interval=3600, max_pending=2, capacity=2, max_wait=0.05, max_attempts=2)
+
+    async def scenario():
+        await buffer.submit(1, 1, True)
+        await buffer.submit(1, 13, True)
+        # Full: a new pair waits for a flush and gives up without one, replacing a pair's state still fits
+        with pytest.raises(LikeBufferFullError):
+            await buffer.submit(1, 2, True)
+        await buffer.submit(1, 1, False)
+        await asyncio.gather(buffer.submit(1, 2, True), buffer.flush())
+        assert repository.written == [(1, 1)] and buffer.pending(1, 13) is True
+
+        await buffer.flush()
+        assert repository.written == [(1, 1), (1, 2)]
+        # The second failure of (1, 13) dropped it
+        assert buffer.pending(1, 13) is None and buffer.stats()["dropped"] == 1
+
+        await buffer.submit(2, 13, False)
+        return await buffer.close()
+
+    assert asyncio.run(scenario()) == [(2, 13, False)]
+    assert buffer.stats()["rejected"] == 1
+
+def playlist_song_ids(client, playlist_id: int, headers: dict, limit: int = 500) -> list:
+    """Every song of a playlist in order, following next_cursor."""
+    song_ids, after = [], None
+    while True:
+        params = {"limit": limit} if after is None else {"limit": limit, "after": after}
+        page = client.get(f"/playlists/{playlist_id}", params=params, headers=headers).json()
+        song_ids.extend(track["song"]["id"] for track in page["tracks"])
+        after = page["next_cursor"]
+        if after is None:
+            return song_ids
+
+def test_playlist_tracks_are_added_moved_and_removed(test_client):
+    """
+    Test a playlist's tracks keep their order through appends, inserts, moves and removals, and are private to its owner.
+    """
+    owner = get_auth_headers()
+    other_user = {"Authorization": f"Bearer {create_test_token(user_id='2')}"}
+    playlist = test_client.post("/playlists", json={"name": "Road Trip"}, headers=owner).json()
+    assert playlist["owner_id"] == 1 and playlist["track_count"] == 0
+    url = f"/playlists/{playlist['id']}"
+
+    appended = test_client.post(f"{url}/tracks", json={"song_ids": [1, 2, 3]}, headers=owner).json()
+    assert [track["song"]["id"] for track in appended] == [1, 2, 3]
+    entries = [track["entry_id"] for track in appended]
+    # A song can be added twice; each copy is its own entry
+    inserted = test_client.post(f"{url}/tracks", json={"song_ids": [4, 1], "before": entries[1]}, headers=owner).json()
+    assert playlist_song_ids(test_client, playlist["id"], owner) == [1, 4, 1, 2, 3]
+
+    assert test_client.put(f"{url}/tracks/{entries[2]}/position", json={"before": entries[0]}, headers=owner).status_code == 200
+    assert test_client.put(f"{url}/tracks/{entries[0]}/position", json={"before": None}, headers=owner).status_code == 200
+    assert test_client.delete(f"{url}/tracks/{inserted[1]['entry_id']}", headers=owner).status_code == 200
+    assert playlist_song_ids(test_client, playlist["id"], owner) == [3, 4, 2, 1]
+    assert playlist_song_ids(test_client, playlist["id"], owner, limit=3) == [3, 4, 2, 1]
+
+    page = test_client.get(url, headers=owner).json()
+    assert page["playlist"]["track_count"] == 4 and page["playlist"]["updated_at"] is not None
+    # The cursor is the last track's (position, entry id)
+    first = test_client.get(url, params={"limit": 1}, headers=owner).json()
+    position, entry_id = first["next_cursor"].split(":")
+    assert int(entry_id) == page["tracks"][0]["entry_id"] and position.lstrip("-").isdigit()
+    assert test_client.get(url, params={"after": "12"}, headers=owner).status_code == 422
+    assert test_client.get(url, headers=other_user).status_code == 403
+    assert test_client.post(f"{url}/tracks", json={"song_ids": [6]}, headers=other_user).status_code == 403
+    assert test_client.post(f"{url}/tracks", json={"song_ids": [999999]}, headers=owner).status_code == 404
+    assert test_client.post(f"{url}/tracks", json={"song_ids": [6], "before": 999999}, headers=owner).status_code == 404
+    assert test_client.delete(f"{url}/tracks/{inserted[1]['entry_id']}", headers=owner).status_code == 404
+    assert test_client.get("/playlists/999999", headers=owner).status_code == 404
+
+    assert test_client.delete(url, headers=other_user).status_code == 403
+    assert test_client.delete(url, headers=owner).status_code == 200
+    assert test_client.get(url, headers=owner).status_code == 404
+
+def test_playlist_inserts_at_one_spot_respace_only_their_neighbours(test_client):
+    """
+    Test repeated inserts into one gap keep the order, and respacing it rewrites the entries around it rather than the playlist.
+    """
+    owner = get_auth_headers()
+    playlist_id = test_client.post("/playlists", json={"name": "Long"}, headers=owner).json()["id"]
+    url = f"/playlists/{playlist_id}"
+    entries = [track["entry_id"] for track in test_client.post(
+        f"{url}/tracks", json={"song_ids": [1 + i % 4 for i in range(1000)]}, headers=owner
+    ).json()]
+    expected = [1 + i % 4 for i in range(1000)]
+
+    def positions():
+        engine = create_engine("sqlite:///file:memdb1?mode=memory&cache=shared&uri=true")
+        with engine.connect() as connection:
+            rows = connection.execute(
+                playlist_tracks.select().where(playlist_tracks.c.playlist_id == playlist_id)
+            ).all()
+        return {row.id: row.position for row in rows}
+
+    before = positions()
+    # Every insert halves the same gap, so it fills up and has to be respaced
+    for _ in range(40):
+        test_client.post(f"{url}/tracks", json={"song_ids": [12], "before": entries[500]}, headers=owner)
+    after = positions()
+    assert playlist_song_ids(test_client, playlist_id, owner) == expected[:500] + [12] * 40 + expected[500:]
+    moved = [entry for entry in entries if before[entry] != after[entry]]
+    assert 0 < len(moved) < 100
+    assert len(set(after.values())) == len(after)
+
+    # Moving an entry writes that row alone
+    test_client.put(f"{url}/tracks/{entries[10]}/position", json={"before": entries[900]}, headers=owner)
+    assert {entry for entry, position in positions().items() if after[entry] != position} == {entries[10]}
+
+    # Entries moved from just below a gap into it until it is respaced around them keep positions unique
+    for entry in entries[480:500]:
+        assert test_client.put(f"{url}/tracks/{entry}/position", json={"before": entries[950]}, headers=owner).status_code == 200
+    for _ in range(25):
+        assert test_client.put(f"{url}/tracks/{entries[949]}/position", json={"before": entries[950]}, headers=owner).status_code == 200
+        assert test_client.put(f"{url}/tracks/{entries[499]}/position", json={"before": entries[949]}, headers=owner).status_code == 200
+    assert len(set(positions().values())) == len(positions())
+    song_ids = playlist_song_ids(test_client, playlist_id, owner)
+    tail = expected[500:]
+    moved_songs = expected[480:500]
+    assert song_ids == expected[:10] + expected[11:480] + [12] * 40 + tail[:400] + [expected[10]] + tail[400:449] \
+        + moved_songs[:-1] + [moved_songs[-1], expected[949]] + tail[450:]
+
+    # Deleting a song drops it from the playlist and from the count
+    song_id = test_client.post("/songs", json=get_song_for_create_test(), headers=get_auth_headers(role="admin")).json()["id"]
+    test_client.post(f"{url}/tracks", json={"song_ids": [song_id, song_id]}, headers=owner)
+    assert test_client.get(url, headers=owner).json()["playlist"]["track_count"] == 1042
+    test_client.delete(f"/songs/{song_id}", headers=get_auth_headers(role="admin"))
+    page = test_client.get(url, params={"limit": 1}, headers=owner).json()
+    assert page["playlist"]["track_count"] == 1040
+    assert len(playlist_song_ids(test_client, playlist_id, owner)) == 1040
+
 def test_get_song_by_id(test_client):
     """
     Test GET /songs/{song_id} endpoint returns a specific song.
@@ -108,6 +539,38 @@ def test_get_song_by_id(test_client):
     song = response.json()
     assert song["id"] == 1
 
+def test_get_song_conditional_requests(test_client):
+    """
+    Test GET /songs/{song_id} answers If-None-Match / If-Modified-Since with 304 until the song changes.
+    """
+    headers = get_auth_headers()
+    first = test_client.get("/songs/2", headers=headers)
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+    assert first.headers["cache-control"].startswith("private")
+
+    not_modified = test_client.get("/songs/2", headers={**headers, "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert test_client.get("/songs/2", headers={**headers, "If-Modified-Since": last_modified}).status_code == 304
+
+    assert test_client.put("/songs/2", json={"title": "Retitled"}, headers=get_auth_headers(role="admin")).status_code == 200
+    changed = test_client.get("/songs/2", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["title"] == "Retitled"
+
+def test_list_songs_conditional_requests(test_client):
+    """
+    Test GET /songs returns 304 for an unchanged page and a new ETag once a song is added.
+    """
+    headers = get_auth_headers()
+    etag = test_client.get("/songs", params={"limit": 500}, headers=headers).headers["etag"]
+    assert test_client.get("/songs", params={"limit": 500}, headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    assert test_client.post("/songs", json=get_song_for_create_test(), headers=get_auth_headers(role="admin")).status_code == 200
+    assert test_client.get("/songs", params={"limit": 500}, headers={**headers, "If-None-Match": etag}).status_code == 200
+
 def test_create_song(test_client):
     """
     Test POST /songs endpoint creates a new song.
@@ -139,6 +602,14 @@ def test_delete_song(test_client):
     response = test_client.get("/songs/1", headers=get_auth_headers())
     assert response.status_code == 404
 
+def test_update_and_delete_missing_song(test_client):
+    """
+    Test PUT and DELETE /songs/{song_id} report 404 for an unknown song.
+    """
+    admin = get_auth_headers(role="admin")
+    assert test_client.put("/songs/999999", json={"title": "Ghost"}, headers=admin).status_code == 404
+    assert test_client.delete("/songs/999999", headers=admin).status_code == 404
+
 def test_not_authorized_access(test_client):
     """
     Test unauthorized access to song endpoint.
@@ -148,4 +619,5 @@ def test_not_authorized_access(test_client):
     except Exception as e:
         assert str(e) == "Unauthorized"
     else:
-        assert response.status_code == 401
\ No newline at end of file
+        assert response.status_code == 401
+    assert test_client.get("/songs/1", headers={"Authorization": "Bearer not-a-token"}).status_code == 401
\ No newline at end of file
@@ -1,27 +1,33 @@
 from backend.song_service.models.song import Song
 from backend.song_service.models.song_input import SongInput
 from backend.song_service.models.song_update_input import SongUpdateInput
+from backend.song_service.models.playlist import Playlist
 from backend.database.models.song_model import Song as SongModel
+from backend.database.models.playlist_model import Playlist as PlaylistModel
 
 class ModelToModelMapper():
     @staticmethod
     def song_input_to_db_model(song_input: SongInput) -> SongModel:
         """Convert SongInput to SongModel."""
+        return SongModel(**ModelToModelMapper.song_input_to_row(song_input))
+
+    @staticmethod
+    def song_input_to_row(song_input: SongInput) -> dict:
+        """Convert SongInput to a SONGS row; single and bulk inserts both go through here."""
         if not all([song_input.title, song_input.artist, song_input.genre, song_input.file_url]):
             raise ValueError("Missing required song fields")
-        
-        return SongModel(
-            title=song_input.title,
-            artist=song_input.artist,
-            genre=song_input.genre,
-            file_url=song_input.file_url,
-            duration=song_input.duration,
-            description=song_input.description,
-            cover_image_url=song_input.cover_image_url,
-            created_at=song_input.created_at,
-            release_date=song_input.release_date
-        )
-    
+
+        return {
+            "title": song_input.title,
+            "artist": song_input.artist,
+            "genre": song_input.genre,
+            "file_url": song_input.file_url,
+            "duration": song_input.duration,
+            "description": song_input.description,
+            "cover_image_url": song_input.cover_image_url,
+            "created_at": song_input.created_at,
+            "release_date": song_input.release_date
+        }
 
     @staticmethod
     def db_song_to_model(song: SongModel) -> Song:
@@ -38,4 +44,17 @@ class ModelToModelMapper():
             release_date=song.release_date,
             created_at=song.created_at,
             updated_at=song.updated_at
+        )
+
+    @staticmethod
+    def db_playlist_to_model(playlist: PlaylistModel) -> Playlist:
+        """Convert PlaylistModel to Playlist."""
+        return Playlist(
+            id=playlist.id,
+            owner_id=playlist.owner_id,
+            name=playlist.name,
+            description=playlist.description,
+            track_count=playlist.track_count,
+            created_at=playlist.created_at,
+            updated_at=playlist.updated_at
         )
\ No newline at end of file
@@ -1,14 +1,37 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from backend.database.connector.async_connector import AsyncDatabaseConnector
+from backend.database.connector.engine_registry import engine_registry
+from backend.common.cache.factory import cache_from_env
 from backend.user_service.routers.user_router import router as user_router
+from backend.common.auth.auth_helper import auth_helper
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the shared database connector, token key set and cache once per process and close them on shutdown.
+    The cache is only written to: credential changes drop the logins auth-service cached.
+    """
+    app.state.db_connector = AsyncDatabaseConnector()
+    app.state.cache = cache_from_env()
+    if app.state.cache is not None:
+        await app.state.cache.start()
+    await auth_helper.verifier.start()
+    yield
+    await auth_helper.verifier.close()
+    if app.state.cache is not None:
+        await app.state.cache.close()
+    await engine_registry.dispose_all_async()
 
 app = FastAPI(
     title="User Service",
     description="Service for managing user accounts",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.include_router(user_router)
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "token_cache": auth_helper.verifier.cache.stats()}
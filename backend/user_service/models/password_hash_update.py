@@ -0,0 +1,4 @@
+from pydantic import BaseModel, Field
+
+class PasswordHashUpdate(BaseModel):
+    password_hash: str = Field(..., min_length=1, max_length=255)
@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from backend.user_service.models.user_model import UserModel
+
+class UserPage(BaseModel):
+    items: List[UserModel]
+    next_cursor: Optional[int] = Field(None, description="Pass as `after` to fetch the next page; null on the last page")
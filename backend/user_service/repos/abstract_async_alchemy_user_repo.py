@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from backend.database.models.user_model import User
+
+class AbstractAsyncAlchemyUserRepo(ABC):
+
+    @abstractmethod
+    async def get_user(self, user_id: int) -> Optional[User]:
+        pass
+
+    @abstractmethod
+    async def create_user(self, user: User) -> Optional[User]:
+        pass
+
+    @abstractmethod
+    async def update_user(self, user_id: int, values: dict) -> Optional[User]:
+        """Update the given USERS columns of a user."""
+        pass
+
+    @abstractmethod
+    async def delete_user(self, user_id: int) -> bool:
+        pass
+
+    @abstractmethod
+    async def list_users(self, limit: int, after: Optional[int] = None) -> List[User]:
+        """List up to limit + 1 users with an ID greater than after, ordered by ID."""
+        pass
+
+    @abstractmethod
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        """Retrieve a user by email."""
+        pass
+
+    @abstractmethod
+    async def get_credentials_by_email(self, email: str):
+        """Retrieve only the id and password hash of the user with this email."""
+        pass
@@ -0,0 +1,106 @@
+from backend.user_service.repos.abstract_async_alchemy_user_repo import AbstractAsyncAlchemyUserRepo
+from backend.database.models.user_model import User
+from backend.database.connector.async_connector import AsyncDatabaseConnector
+from backend.database.pagination import keyset_window
+from backend.database.statements import update_returning, delete_by_key
+from backend.database.models.user_likes import user_likes
+from backend.database.models.song_model import Song
+from backend.database.models.playlist_model import Playlist
+from backend.database.models.playlist_tracks_model import playlist_tracks
+from sqlalchemy import select, delete, update
+from typing import List, Optional
+from contextlib import asynccontextmanager
+
+class AsyncUserAlchemyRepo(AbstractAsyncAlchemyUserRepo):
+    def __init__(self, db_connector = None):
+        super().__init__()
+        self.db_connector = db_connector or AsyncDatabaseConnector()
+
+    @asynccontextmanager
+    async def get_session(self):
+        """Async context manager to handle database sessions."""
+        db = self.db_connector.get_session()
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    async def get_user(self, user_id: int) -> Optional[User]:
+        """Retrieve a user by ID."""
+        try:
+            async with self.get_session() as db:
+                return await db.get(User, user_id)
+        except Exception as e:
+            print(f"Error retrieving user {user_id}: {e}")
+            return None
+
+    async def create_user(self, user: User) -> Optional[User]:
+        """Create a new user."""
+        try:
+            async with self.get_session() as db:
+                db.add(user)
+                await db.commit()
+                await db.refresh(user)
+            return user
+        except Exception as e:
+            print(f"Error creating user: {e}")
+            return None
+
+    async def update_user(self, user_id: int, values: dict) -> Optional[User]:
+        """Update the given USERS columns of a user."""
+        try:
+            async with self.get_session() as db:
+                user = await update_returning(db, User, user_id, values)
+                await db.commit()
+            return user
+        except Exception as e:
+            print(f"Error updating user {user_id}: {e}")
+            return None
+
+    async def delete_user(self, user_id: int) -> bool:
+        """Delete a user by ID."""
+        try:
+            async with self.get_session() as db:
+                liked = select(user_likes.c.song_id).where(user_likes.c.user_id == user_id)
+                await db.execute(update(Song).where(Song.id.in_(liked)).values(like_count=Song.like_count - 1))
+                await db.execute(delete(user_likes).where(user_likes.c.user_id == user_id))
+                owned = select(Playlist.id).where(Playlist.owner_id == user_id)
+                await db.execute(delete(playlist_tracks).where(playlist_tracks.c.playlist_id.in_(owned)))
+                await db.execute(delete(Playlist).where(Playlist.owner_id == user_id))
+                deleted = await delete_by_key(db, User, user_id)
+                await db.commit()
+            return deleted
+        except Exception as e:
+            print(f"Error deleting user {user_id}: {e}")
+            return False
+
+    async def list_users(self, limit: int, after: Optional[int] = None) -> List[User]:
+        """List up to limit + 1 users with an ID greater than after, ordered by ID."""
+        try:
+            async with self.get_session() as db:
+                result = await db.execute(keyset_window(select(User), User.id, limit, after))
+                return list(result.scalars().all())
+        except Exception as e:
+            print(f"Error listing users: {e}")
+            return []
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        """Retrieve a user by email."""
+        try:
+            async with self.get_session() as db:
+                result = await db.execute(select(User).where(User.email == email))
+                return result.scalars().first()
+        except Exception as e:
+            print(f"Error retrieving user by email {email}: {e}")
+            return None
+
+    async def get_credentials_by_email(self, email: str):
+        """Retrieve only the id and password hash of the user with this email."""
+        try:
+            async with self.get_session() as db:
+                # Two columns through the unique index on email; no ORM object is built
+                result = await db.execute(select(User.id, User.password_hash).where(User.email == email))
+                return result.first()
+        except Exception as e:
+            print(f"Error retrieving credentials by email {email}: {e}")
+            return None
@@ -1,52 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from typing import List, Optional
 from backend.user_service.models.user_model import UserModel
+from backend.user_service.models.user_page import UserPage
 from backend.user_service.models.user_input_model import UserInputModel
 from backend.user_service.models.user_update_model import UserUpdateModel
 from backend.user_service.models.auth_info_model import AuthInfoModel
-from backend.user_service.services.user_alchemy_service import UserAlchemyService
-from backend.user_service.repos.user_alchemy_repo import UserAlchemyRepo
+from backend.user_service.models.password_hash_update import PasswordHashUpdate
+from backend.user_service.services.async_user_alchemy_service import AsyncUserAlchemyService
+from backend.user_service.repos.async_user_alchemy_repo import AsyncUserAlchemyRepo
 from backend.user_service.errors_exceptions.exceptions import UserNotFoundError
-from backend.user_service.utils.auth_helper import auth_helper
+from backend.common.auth.auth_helper import auth_helper
+from backend.common.auth.internal import require_internal_token
+from backend.common.auth.exceptions import PasswordPoolBusyError
+from backend.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter()
 
-def get_user_service() -> UserAlchemyService:
-    return UserAlchemyService(repo=UserAlchemyRepo())
+def get_user_service(request: Request) -> AsyncUserAlchemyService:
+    db_connector = getattr(request.app.state, "db_connector", None)
+    return AsyncUserAlchemyService(
+        repo=AsyncUserAlchemyRepo(db_connector=db_connector),
+        cache=getattr(request.app.state, "cache", None)
+    )
 
-@router.get("/users", response_model=List[UserModel])
-def get_all_users(current_user=auth_helper.require_auth(), user_service=Depends(get_user_service)):
-    return user_service.get_all_users()
+@router.get("/users", response_model=UserPage)
+async def get_all_users(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[int] = Query(None, ge=0, description="next_cursor from the previous page"),
+    current_user=auth_helper.require_auth(),
+    user_service=Depends(get_user_service)
+):
+    return await user_service.get_users_page(limit, after)
 
 @router.get("/users/{user_id}", response_model=UserModel)
-def get_user_by_id(user_id: int, current_user=auth_helper.require_auth(), user_service=Depends(get_user_service)):
+async def get_user_by_id(user_id: int, current_user=auth_helper.require_auth(), user_service=Depends(get_user_service)):
     try:
-        return user_service.get_user_by_id(user_id)
+        return await user_service.get_user_by_id(user_id)
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
     
 @router.get("/users/email/{email}", response_model=AuthInfoModel)
-def get_user_by_email(email: str, user_service=Depends(get_user_service)):
+async def get_user_by_email(email: str, user_service=Depends(get_user_service)):
     try:
-        return user_service.get_user_by_email(email)
+        return await user_service.get_user_by_email(email)
     except UserNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/users", response_model=UserModel)
-def create_user(user_input: UserInputModel, user_service=Depends(get_user_service)):
+async def create_user(user_input: UserInputModel, user_service=Depends(get_user_service)):
     try:
-        return user_service.create_new_user(user_input)
+        return await user_service.create_new_user(user_input)
+    except PasswordPoolBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.put("/users/{user_id}", response_model=UserModel)
-def update_user(user_id: int, user_input: UserUpdateModel, current_user=auth_helper.require_role("admin"), user_service=Depends(get_user_service)):
+async def update_user(user_id: int, user_input: UserUpdateModel, current_user=auth_helper.require_role("admin"), user_service=Depends(get_user_service)):
     try:
-        return user_service.update_user(user_id, user_input)
+        return await user_service.update_user(user_id, user_input)
+    except PasswordPoolBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
     except UserNotFoundError as e:
@@ -55,9 +73,61 @@ def update_user(user_id: int, user_input: UserUpdateModel, current_user=auth_hel
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/users/{user_id}")
-def delete_user(user_id: int, current_user=auth_helper.require_role("admin"), user_service=Depends(get_user_service)):
+async def delete_user(user_id: int, current_user=auth_helper.require_role("admin"), user_service=Depends(get_user_service)):
     try:
-        user_service.remove_user(user_id)
+        await user_service.remove_user(user_id)
         return {"detail": "User deleted"}
     except Exception as e:
-        raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/internal/users/credentials", response_model=AuthInfoModel)
+async def get_credentials(
+    email: str = Query(..., min_length=1),
+    internal=require_internal_token(),
+    user_service=Depends(get_user_service)
+):
+    """
+    Get what the auth service needs to check a login: the user's id, password hash and role.
+    Reads two columns through the unique email index instead of loading the whole user.
+    Only callable with the X-Internal-Token header.
+    :param email: The email the user logs in with.
+    """
+    try:
+        return await user_service.get_credentials(email)
+    except UserNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/internal/users/{user_id}/credentials", response_model=AuthInfoModel)
+async def get_credentials_by_id(
+    user_id: int,
+    internal=require_internal_token(),
+    user_service=Depends(get_user_service)
+):
+    """
+    Get the user's id, password hash and role by id. The auth service calls this on
+    every token refresh, so a deleted user cannot refresh and a changed role is picked up.
+    Only callable with the X-Internal-Token header.
+    :param user_id: The subject of the refresh token.
+    """
+    try:
+        return await user_service.get_credentials_by_id(user_id)
+    except UserNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.put("/internal/users/{user_id}/password-hash")
+async def update_password_hash(
+    user_id: int,
+    update: PasswordHashUpdate,
+    internal=require_internal_token(),
+    user_service=Depends(get_user_service)
+):
+    """
+    Store a password hash computed by the auth service, which re-hashes passwords
+    whose bcrypt cost differs from BCRYPT_ROUNDS when their owner logs in.
+    Only callable with the X-Internal-Token header.
+    """
+    try:
+        await user_service.update_password_hash(user_id, update.password_hash)
+        return {"detail": "Password hash updated"}
+    except UserNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from backend.user_service.models.user_update_model import UserUpdateModel
+from backend.user_service.models.user_input_model import UserInputModel
+from backend.user_service.models.user_model import UserModel
+from backend.user_service.models.user_page import UserPage
+from backend.user_service.models.auth_info_model import AuthInfoModel
+from backend.user_service.repos.abstract_async_alchemy_user_repo import AbstractAsyncAlchemyUserRepo
+
+class AbstractAsyncAlchemyUserService(ABC):
+    def __init__(self, repo: AbstractAsyncAlchemyUserRepo):
+        self.repo = repo
+
+    @abstractmethod
+    async def get_user_by_id(self, user_id: int) -> UserModel:
+        pass
+
+    @abstractmethod
+    async def get_users_page(self, limit: int, after: Optional[int] = None) -> UserPage:
+        pass
+
+    @abstractmethod
+    async def create_new_user(self, user_input: UserInputModel) -> Optional[UserModel]:
+        pass
+
+    @abstractmethod
+    async def update_user(self, user_id: int, user_data: UserUpdateModel) -> UserModel:
+        pass
+
+    @abstractmethod
+    async def update_password_hash(self, user_id: int, password_hash: str) -> None:
+        """Replace a user's stored password hash, e.g. after a bcrypt cost change."""
+        pass
+
+    @abstractmethod
+    async def remove_user(self, user_id: int) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_user_by_email(self, email: str) -> Optional[AuthInfoModel]:
+        """Retrieve a user by email."""
+        pass
+
+    @abstractmethod
+    async def get_credentials(self, email: str) -> AuthInfoModel:
+        """Retrieve the fields needed to check a login."""
+        pass
+
+    @abstractmethod
+    async def get_credentials_by_id(self, user_id: int) -> AuthInfoModel:
+        """Retrieve the fields needed to issue tokens to an existing user."""
+        pass
@@ -0,0 +1,102 @@
+from backend.user_service.models.user_update_model import UserUpdateModel
+from backend.user_service.models.user_input_model import UserInputModel
+from backend.user_service.models.auth_info_model import AuthInfoModel
+from backend.user_service.repos.abstract_async_alchemy_user_repo import AbstractAsyncAlchemyUserRepo
+from backend.user_service.services.abstract_async_alchemy_user_service import AbstractAsyncAlchemyUserService
+from backend.user_service.models.user_model import UserModel
+from backend.user_service.models.user_page import UserPage
+from backend.database.pagination import split_page
+from backend.user_service.utils.model_to_model_mapper import ModelToModelMapper
+from backend.user_service.utils.security import password_manager, password_pool
+from backend.user_service.errors_exceptions.exceptions import UserNotFoundError
+from backend.common.cache.cache_backend import CacheBackend
+from backend.common.cache.keys import credentials_key
+from typing import List, Optional
+
+# Columns whose change makes the credentials auth-service cached for a user stale
+CREDENTIAL_COLUMNS = {"email", "password_hash"}
+
+class AsyncUserAlchemyService(AbstractAsyncAlchemyUserService):
+    def __init__(self, repo: AbstractAsyncAlchemyUserRepo, cache: Optional[CacheBackend] = None):
+        super().__init__(repo)
+        self.mapper = ModelToModelMapper()
+        self.cache = cache
+
+    async def _emails_of(self, user_id: int) -> List[str]:
+        """The user's current email, read before a write that may change or remove it."""
+        if self.cache is None:
+            return []
+        user = await self.repo.get_user(user_id)
+        return [user.email] if user else []
+
+    async def _invalidate_credentials(self, *emails: str) -> None:
+        if self.cache is not None and emails:
+            await self.cache.delete(*{credentials_key(email) for email in emails})
+
+    async def get_user_by_id(self, user_id: int) -> UserModel:
+        user = await self.repo.get_user(user_id)
+        if not user:
+            raise UserNotFoundError(f"User with id {user_id} not found")
+        return self.mapper.db_model_to_user_output(user)
+
+    async def get_users_page(self, limit: int, after: Optional[int] = None) -> UserPage:
+        users, next_cursor = split_page(await self.repo.list_users(limit, after), limit)
+        return UserPage(
+            items=[self.mapper.db_model_to_user_output(user) for user in users if user],
+            next_cursor=next_cursor
+        )
+
+    async def _hash(self, password: Optional[str]) -> Optional[str]:
+        """bcrypt a password on the password pool, off the event loop."""
+        if not password:
+            return None
+        return await password_pool.run(password_manager.hash_password, password)
+
+    async def create_new_user(self, user_input: UserInputModel) -> Optional[UserModel]:
+        user_db = self.mapper.user_input_to_db_model(user_input, await self._hash(user_input.password))
+        created_user = await self.repo.create_user(user_db)
+        if created_user:
+            return self.mapper.db_model_to_user_output(created_user)
+        return None
+
+    async def update_user(self, user_id: int, user_data: UserUpdateModel) -> UserModel:
+        values = self.mapper.user_update_to_values(user_data, await self._hash(user_data.password))
+        old_emails = await self._emails_of(user_id) if CREDENTIAL_COLUMNS & values.keys() else []
+        updated_user = await self.repo.update_user(user_id, values)
+        if not updated_user:
+            raise UserNotFoundError(f"User with id {user_id} not found")
+        if old_emails:
+            await self._invalidate_credentials(*old_emails, updated_user.email)
+        return self.mapper.db_model_to_user_output(updated_user)
+
+    async def update_password_hash(self, user_id: int, password_hash: str) -> None:
+        updated_user = await self.repo.update_user(user_id, {"password_hash": password_hash})
+        if not updated_user:
+            raise UserNotFoundError(f"User with id {user_id} not found")
+        await self._invalidate_credentials(updated_user.email)
+
+    async def remove_user(self, user_id: int) -> bool:
+        emails = await self._emails_of(user_id)
+        if not await self.repo.delete_user(user_id):
+            raise UserNotFoundError(f"User with id {user_id} not found")
+        await self._invalidate_credentials(*emails)
+        return True
+
+    async def get_user_by_email(self, email: str) -> Optional[AuthInfoModel]:
+        user = await self.repo.get_user_by_email(email)
+        if not user:
+            raise UserNotFoundError(f"User with email {email} not found")
+        return self.mapper.db_model_to_auth_info(user)
+
+    async def get_credentials(self, email: str) -> AuthInfoModel:
+        credentials = await self.repo.get_credentials_by_email(email)
+        if not credentials:
+            raise UserNotFoundError(f"User with email {email} not found")
+        # USERS has no role column yet, so every user logs in with the default role
+        return AuthInfoModel(user_id=credentials.id, password_hash=credentials.password_hash)
+
+    async def get_credentials_by_id(self, user_id: int) -> AuthInfoModel:
+        user = await self.repo.get_user(user_id)
+        if not user:
+            raise UserNotFoundError(f"User with id {user_id} not found")
+        return self.mapper.db_model_to_auth_info(user)
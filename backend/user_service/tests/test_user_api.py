@@ -5,16 +5,19 @@ Simple User API Test with In-Memory Database
 import pytest
 import time
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from datetime import datetime
+from sqlalchemy import create_engine, func, insert, select
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 
 # Import FastAPI app and dependencies
 from backend.user_service.app import app
 from backend.user_service.routers.user_router import get_user_service
 
 # Import your existing classes
-from backend.user_service.services.user_alchemy_service import UserAlchemyService
-from backend.user_service.repos.user_alchemy_repo import UserAlchemyRepo
+from backend.user_service.services.async_user_alchemy_service import AsyncUserAlchemyService
+from backend.user_service.repos.async_user_alchemy_repo import AsyncUserAlchemyRepo
 
 # Import database models
 from backend.database.models.base import Base
@@ -32,6 +35,7 @@ from backend.auth_service.model.jwt_payload import JWTPayload
 from backend.auth_service.jwt_utils import create_access_token
 
 from backend.user_service.errors_exceptions.exceptions import UserNotFoundError
+from backend.user_service.utils.security import password_manager
 
 def create_test_token(user_id: str = "1", role: str = "user") -> str:
     """Create a simple test JWT token."""
@@ -71,11 +75,20 @@ def test_client():
     session.add_all(MOCK_USERS)
     session.commit()
     
+    # The app talks to the same in-memory database through an async engine.
+    # NullPool because each TestClient request runs on its own event loop.
+    async_engine = create_async_engine(
+        "sqlite+aiosqlite:///file:memdb1?mode=memory&cache=shared&uri=true",
+        poolclass=NullPool,
+        echo=False
+    )
+    AsyncTestSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
     # Create test components
-    test_connector = TestConnector(session_factory=TestSessionLocal)
+    test_connector = TestConnector(session_factory=AsyncTestSessionLocal)
 
-    test_repository = UserAlchemyRepo(db_connector=test_connector)
-    test_service = UserAlchemyService(repo=test_repository)
+    test_repository = AsyncUserAlchemyRepo(db_connector=test_connector)
+    test_service = AsyncUserAlchemyService(repo=test_repository)
     
     # Override FastAPI dependency
     app.dependency_overrides[get_user_service] = lambda: test_service
@@ -95,7 +108,21 @@ def test_get_all_users(test_client):
     '''
     response = test_client.get("/users", headers=get_auth_headers())
     assert response.status_code == 200
-    assert len(response.json()) == len(MOCK_USERS)
+    assert len(response.json()["items"]) == len(MOCK_USERS)
+
+def test_get_users_pages_by_cursor(test_client):
+    '''
+    Test paging through users with limit and next_cursor.
+    '''
+    first = test_client.get("/users", params={"limit": 2}, headers=get_auth_headers()).json()
+    assert len(first["items"]) == 2
+    assert first["next_cursor"] == first["items"][-1]["id"]
+    rest = test_client.get(
+        "/users", params={"limit": 500, "after": first["next_cursor"]}, headers=get_auth_headers()
+    ).json()
+    assert rest["next_cursor"] is None
+    ids = [user["id"] for user in first["items"] + rest["items"]]
+    assert ids == sorted(ids) and len(ids) == len(MOCK_USERS)
 
 def test_get_user_by_id(test_client):
     '''
@@ -127,6 +154,61 @@ def test_update_user(test_client):
     assert updated_user["id"] == 1
     assert updated_user["username"] == user_data["username"]
 
+def test_update_user_password_is_hashed(test_client):
+    '''
+    Test that a password change is stored as a new hash.
+    '''
+    before = test_client.get("/users/2", headers=get_auth_headers()).json()
+    response = test_client.put("/users/2", json={"password": "n3w-Passw0rd"}, headers=get_auth_headers(role="admin"))
+    assert response.status_code == 200
+    assert response.json()["password_hash"] != before["password_hash"]
+    assert password_manager.verify_password("n3w-Passw0rd", response.json()["password_hash"])
+
+def test_internal_password_hash_update_requires_token(test_client, monkeypatch):
+    """
+    Test PUT /internal/users/{user_id}/password-hash only accepts the internal service token.
+    """
+    body = {"password_hash": password_manager.hash_password("rehashed")}
+    assert test_client.put("/internal/users/3/password-hash", json=body).status_code == 403
+
+    monkeypatch.setenv("INTERNAL_SERVICE_TOKEN", "internal-test-token")
+    internal = {"X-Internal-Token": "internal-test-token"}
+    assert test_client.put("/internal/users/3/password-hash", json=body, headers={"X-Internal-Token": "wrong"}).status_code == 403
+    assert test_client.put("/internal/users/3/password-hash", json=body, headers=internal).status_code == 200
+    stored = test_client.get("/users/3", headers=get_auth_headers()).json()["password_hash"]
+    assert stored == body["password_hash"]
+    assert test_client.put("/internal/users/999999/password-hash", json=body, headers=internal).status_code == 404
+
+def test_internal_credentials_lookup(test_client, monkeypatch):
+    """
+    Test GET /internal/users/credentials returns only the auth fields, and only to internal callers.
+    """
+    params = {"email": "jane.smith@example.com"}
+    assert test_client.get("/internal/users/credentials", params=params).status_code == 403
+
+    monkeypatch.setenv("INTERNAL_SERVICE_TOKEN", "internal-test-token")
+    internal = {"X-Internal-Token": "internal-test-token"}
+    response = test_client.get("/internal/users/credentials", params=params, headers=internal)
+    assert response.status_code == 200
+    assert set(response.json()) == {"user_id", "password_hash", "role"}
+    assert response.json()["user_id"] == 2
+    missing = {"email": "nobody@example.com"}
+    assert test_client.get("/internal/users/credentials", params=missing, headers=internal).status_code == 404
+
+    assert test_client.get("/internal/users/2/credentials").status_code == 403
+    response = test_client.get("/internal/users/2/credentials", headers=internal)
+    assert response.status_code == 200
+    assert response.json()["user_id"] == 2 and response.json()["role"] == "user"
+    assert test_client.get("/internal/users/999999/credentials", headers=internal).status_code == 404
+
+def test_update_and_delete_missing_user(test_client):
+    '''
+    Test that updating or deleting an unknown user returns 404.
+    '''
+    admin = get_auth_headers(role="admin")
+    assert test_client.put("/users/999999", json={"first_name": "Ghost"}, headers=admin).status_code == 404
+    assert test_client.delete("/users/999999", headers=admin).status_code == 404
+
 def test_delete_user(test_client):
     '''
     Test deleting a user.
@@ -135,6 +217,29 @@ def test_delete_user(test_client):
     assert response.status_code == 200
     assert response.json() == {"detail": "User deleted"}
 
+def test_delete_user_updates_like_counts(test_client):
+    """
+    Test deleting a user takes their likes off the songs' like_count.
+    """
+    engine = create_engine("sqlite:///file:memdb1?mode=memory&cache=shared&uri=true", connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        song_ids = [
+            conn.execute(insert(SongModel).values(
+                title=f"Liked {n}", artist="Artist", genre="Rock", file_url=f"/liked{n}.mp3", created_at=datetime.now(), like_count=2
+            )).inserted_primary_key[0]
+            for n in range(2)
+        ]
+        conn.execute(insert(user_likes), [{"user_id": user_id, "song_id": song_id} for user_id in (2, 3) for song_id in song_ids])
+
+    response = test_client.delete("/users/2", headers=get_auth_headers(role="admin"))
+    assert response.status_code == 200
+
+    with engine.connect() as conn:
+        for song_id in song_ids:
+            like_count = conn.execute(select(SongModel.like_count).where(SongModel.id == song_id)).scalar_one()
+            likes = conn.execute(select(func.count()).select_from(user_likes).where(user_likes.c.song_id == song_id)).scalar_one()
+            assert like_count == likes == 1
+
 def test_not_authorized_access(test_client):
     """
     Test unauthorized access to user endpoint.
@@ -1,26 +1,36 @@
+from typing import Optional
 from backend.user_service.models.user_update_model import UserUpdateModel
 from backend.user_service.models.user_input_model import UserInputModel
 from backend.user_service.models.auth_info_model import AuthInfoModel
 from backend.user_service.models.user_model import UserModel
 from backend.database.models.user_model import User
-from backend.user_service.utils.security import password_manager
+from backend.database.statements import column_values
 
 class ModelToModelMapper:
     @staticmethod
-    def user_input_to_db_model(user_input: UserInputModel) -> User:
-        """Convert UserInputModel to User database model."""
+    def user_input_to_db_model(user_input: UserInputModel, password_hash: str) -> User:
+        """Convert UserInputModel and the hash of its password to User database model."""
         if not all([user_input.username, user_input.email, user_input.password, user_input.first_name]):
             raise ValueError("Required fields are missing in UserInputModel")
         
         return User(
             username=user_input.username,
             email=user_input.email,
-            password_hash=password_manager.hash_password(user_input.password),
+            password_hash=password_hash,
             first_name=user_input.first_name,
             last_name=user_input.last_name,
             created_at=user_input.created_at
         )
 
+    @staticmethod
+    def user_update_to_values(user_data: UserUpdateModel, password_hash: Optional[str] = None) -> dict:
+        """Convert UserUpdateModel to the USERS columns to update, storing the hash of a new password."""
+        values = user_data.model_dump(exclude_unset=True)
+        values.pop("password", None)
+        if password_hash:
+            values["password_hash"] = password_hash
+        return column_values(User, values)
+
     @staticmethod
     def db_model_to_user_output(db_model: User) -> UserModel:
         """Convert User database model to UserModel."""
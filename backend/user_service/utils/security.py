@@ -1,9 +1,9 @@
 # utils/security.py
-from passlib.context import CryptContext
+from backend.common.auth.passwords import bcrypt_context, password_pool_from_env
 
 class PasswordManager:
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.pwd_context = bcrypt_context()
 
     def hash_password(self, password: str) -> str:
         """Hash a plain text password."""
@@ -16,6 +16,9 @@ class PasswordManager:
 # Create a singleton instance for convenience
 password_manager = PasswordManager()
 
+# bcrypt calls from async code run here so they never block the event loop
+password_pool = password_pool_from_env()
+
 # Legacy function wrappers for backward compatibility
 def hash_password(password: str) -> str:
     return password_manager.hash_password(password)